@@ -5,4 +5,14 @@ from django.utils.translation import gettext_lazy as _
 class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "catalog"
-    verbose_name = _("Catálogo")
\ No newline at end of file
+    verbose_name = _("Catálogo")
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from . import cache
+        from .models import Part, Service
+
+        for model in (Service, Part):
+            post_save.connect(cache.on_catalog_changed, sender=model, dispatch_uid=f"catalog-cache-save-{model.__name__}")
+            post_delete.connect(cache.on_catalog_changed, sender=model, dispatch_uid=f"catalog-cache-delete-{model.__name__}")
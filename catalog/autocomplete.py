@@ -0,0 +1,90 @@
+# catalog/autocomplete.py
+"""
+Autocompletado de servicios/partes para el asesor mientras escribe.
+
+Índice en memoria de arreglos ordenados (bisect) construido sobre catalog.cache:
+  1) código / SKU compacto ("FILT-01" -> "filt01")
+  2) nombre completo normalizado ("filtro de aceite")
+  3) nombre desde cada palabra intermedia ("de aceite", "aceite")
+Se recorre por niveles en ese orden (código antes que nombre) y se corta al llegar a N,
+así una consulta es O(log n + N). Solo entran registros activos.
+
+El índice se reconstruye cuando catalog.cache recarga sus mapas (cambió la generación
+del catálogo), no en cada consulta.
+"""
+import threading
+from bisect import bisect_left
+
+from core.search import normalize
+
+from .cache import cache
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def _compact(text) -> str:
+    return "".join(c for c in normalize(text) if c.isalnum())
+
+
+def _words(text) -> list:
+    return "".join(c if c.isalnum() else " " for c in normalize(text)).split()
+
+
+class PrefixIndex:
+    def __init__(self, entries: dict):
+        codes, starts, inner = [], [], []
+        for pk, entry in entries.items():
+            if not entry.is_active:
+                continue
+            codes.append((_compact(entry.code), pk))
+            words = _words(entry.name)
+            starts.append((" ".join(words), pk))
+            for i in range(1, len(words)):
+                inner.append((" ".join(words[i:]), pk))
+        self.levels = [sorted(codes), sorted(starts), sorted(inner)]
+
+    def search(self, query, limit: int = DEFAULT_LIMIT) -> list:
+        """ids que empiezan por `query` (código o palabra del nombre), sin repetir."""
+        phrase = " ".join(_words(query))
+        keys = (_compact(query), phrase, phrase)
+        out, seen = [], set()
+        for level, key in zip(self.levels, keys):
+            if not key:
+                continue
+            i = bisect_left(level, (key,))
+            while i < len(level) and level[i][0].startswith(key):
+                pk = level[i][1]
+                i += 1
+                if pk not in seen:
+                    seen.add(pk)
+                    out.append(pk)
+                    if len(out) >= limit:
+                        return out
+        return out
+
+
+_lock = threading.Lock()
+_indexes = {}  # kind -> (mapa de la caché con que se armó, PrefixIndex)
+
+
+def index_for(kind: str, entries=None) -> PrefixIndex:
+    entries = cache.entries(kind) if entries is None else entries
+    built = _indexes.get(kind)
+    if built is None or built[0] is not entries:
+        with _lock:
+            built = _indexes.get(kind)
+            if built is None or built[0] is not entries:
+                built = (entries, PrefixIndex(entries))
+                _indexes[kind] = built
+    return built[1]
+
+
+def suggest(kind: str, query, limit: int = DEFAULT_LIMIT) -> list:
+    """[{"id", "code", "name", "price"}] para "service" o "part" (code = SKU en partes)."""
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    entries = cache.entries(kind)
+    return [
+        {"id": pk, "code": entries[pk].code, "name": entries[pk].name, "price": str(entries[pk].price)}
+        for pk in index_for(kind, entries).search(query, limit)
+    ]
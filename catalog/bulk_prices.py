@@ -0,0 +1,195 @@
+# catalog/bulk_prices.py
+"""
+Actualización masiva de precios del catálogo (Part / Service).
+
+Dos modos:
+  - ajuste:  precio × (1 + porcentaje/100) o precio + monto, sobre un filtro
+             (prefijo de SKU/código, unidad, activo). Un UPDATE por lote de ids.
+  - lista:   precios explícitos por SKU/código (CSV). Un UPDATE (CASE) por lote.
+
+Cada lote lee precio anterior y nuevo para devolver el resumen de diferencias.
+Al final se incrementa la generación del catálogo (catalog.cache), porque los
+UPDATE masivos no disparan señales.
+"""
+import csv
+import io
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Round
+from django.db.models.lookups import LessThan
+
+from . import cache
+from .importer import ImportFormatError, detect_encoding
+from .models import Part, Service
+
+KINDS = {"part": (Part, "sku"), "service": (Service, "code")}
+MAX_CHANGES_REPORTED = 50
+CENT = Decimal("0.01")
+
+
+class PriceListError(ValueError):
+    """CSV o parámetros inválidos (mensaje para el usuario)."""
+
+
+def _q2(value) -> Decimal:
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class _Summary:
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.matched = self.changed = 0
+        self.total_before = self.total_after = Decimal("0.00")
+        self.changes = []
+        self.not_found = []
+
+    def add(self, pk, code, old, new):
+        old, new = _q2(old), _q2(new)
+        self.matched += 1
+        self.total_before += old
+        self.total_after += new
+        if old != new:
+            self.changed += 1
+            if len(self.changes) < MAX_CHANGES_REPORTED:
+                self.changes.append({"id": pk, "code": code, "old": str(old), "new": str(new)})
+
+    def as_dict(self):
+        return {
+            "dry_run": self.dry_run,
+            "matched": self.matched,
+            "changed": self.changed,
+            "unchanged": self.matched - self.changed,
+            "not_found": self.not_found,
+            "total_before": str(self.total_before),
+            "total_after": str(self.total_after),
+            "changes": self.changes,
+        }
+
+
+def _new_price_expr(percent, amount):
+    money = DecimalField(max_digits=10, decimal_places=2)
+    if percent is not None:
+        expr = ExpressionWrapper(F("price") * Value(Decimal(100) + percent) / Value(Decimal(100)), output_field=money)
+    else:
+        expr = ExpressionWrapper(F("price") + Value(amount), output_field=money)
+    rounded = Round(expr, 2, output_field=money)
+    # sin GREATEST (no existe en SQL Server < 2022)
+    return Case(When(LessThan(rounded, Decimal("0")), then=Value(Decimal("0.00"))), default=rounded, output_field=money)
+
+
+def _python_price(price, percent, amount):
+    new = price * (Decimal(100) + percent) / Decimal(100) if percent is not None else price + amount
+    return max(_q2(new), Decimal("0.00"))
+
+
+def adjust_prices(kind, *, percent=None, amount=None, code_prefix=None, unit=None, is_active=None,
+                  dry_run=False, chunk_size=1000) -> dict:
+    """Ajuste porcentual o por monto sobre los registros que pasan el filtro."""
+    if (percent is None) == (amount is None):
+        raise PriceListError("Indique porcentaje o monto (uno de los dos).")
+    try:
+        percent = None if percent is None else Decimal(str(percent).strip())
+        amount = None if amount is None else Decimal(str(amount).strip())
+    except InvalidOperation:
+        raise PriceListError("Porcentaje/monto inválido.")
+    if any(v is not None and not v.is_finite() for v in (percent, amount)):
+        raise PriceListError("Porcentaje/monto inválido.")
+    if percent is not None and percent < -100:
+        raise PriceListError("El porcentaje no puede ser menor a -100.")
+
+    model, code_field = KINDS[kind]
+    qs = model.objects.all()
+    if code_prefix:
+        qs = qs.filter(**{f"{code_field}__startswith": code_prefix})
+    if unit is not None:
+        if kind != "part":
+            raise PriceListError("El filtro por unidad solo aplica a partes.")
+        qs = qs.filter(unit=unit)
+    if is_active is not None:
+        qs = qs.filter(is_active=is_active)
+
+    summary = _Summary(dry_run)
+    new_price = _new_price_expr(percent, amount)
+    last_pk = 0
+    while True:
+        rows = list(qs.filter(pk__gt=last_pk).order_by("pk").values_list("pk", code_field, "price")[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        if dry_run:
+            for pk, code, price in rows:
+                summary.add(pk, code, price, _python_price(price, percent, amount))
+            continue
+        pks = [r[0] for r in rows]
+        with transaction.atomic():
+            model.objects.filter(pk__in=pks).update(price=new_price)
+            after = dict(model.objects.filter(pk__in=pks).values_list("pk", "price"))
+        for pk, code, price in rows:
+            summary.add(pk, code, price, after[pk])
+
+    if summary.changed and not dry_run:
+        cache.bump()
+    return summary.as_dict()
+
+
+def parse_price_csv(content) -> list:
+    """
+    [(código, Decimal)] desde CSV "codigo,precio" (encabezado opcional; acepta ; como separador).
+    Bytes en UTF-8 o cp1252 (Excel en español), igual que catalog.importer.
+    """
+    if isinstance(content, bytes):
+        try:
+            content = content.decode(detect_encoding(io.BytesIO(content)))
+        except ImportFormatError as exc:
+            raise PriceListError(f"Archivo ilegible: {exc}.")
+    sample = content[:2048]
+    # Excel en español exporta con ";"; csv.Sniffer no es confiable con columnas numéricas
+    delimiter = ";" if sample.count(";") > sample.count(",") else ","
+    reader = csv.reader(io.StringIO(content), delimiter=delimiter)
+    out = []
+    for lineno, row in enumerate(reader, start=1):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        if len(row) < 2:
+            raise PriceListError(f"Línea {lineno}: se esperan 2 columnas (código, precio).")
+        code, raw_price = row[0].strip(), row[1].strip().replace(" ", "")
+        if delimiter == ";":
+            raw_price = raw_price.replace(",", ".")  # 1234,50
+        try:
+            price = Decimal(raw_price)
+        except InvalidOperation:
+            if lineno == 1:
+                continue  # encabezado
+            raise PriceListError(f"Línea {lineno}: precio inválido {raw_price!r}.")
+        if price < 0:
+            raise PriceListError(f"Línea {lineno}: el precio no puede ser negativo.")
+        out.append((code, _q2(price)))
+    return out
+
+
+def apply_price_list(kind, prices, *, dry_run=False, chunk_size=1000) -> dict:
+    """Precios explícitos [(código, precio)]; los códigos inexistentes se reportan en not_found."""
+    model, code_field = KINDS[kind]
+    wanted = dict(prices)  # el último gana si hay repetidos
+    codes = list(wanted)
+    summary = _Summary(dry_run)
+
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        found = list(model.objects.filter(**{f"{code_field}__in": chunk}).values_list("pk", code_field, "price"))
+        seen = {code for _, code, _ in found}
+        summary.not_found += [c for c in chunk if c not in seen]
+        to_update = []
+        for pk, code, price in found:
+            summary.add(pk, code, price, wanted[code])
+            if _q2(price) != wanted[code]:
+                to_update.append(model(pk=pk, price=wanted[code]))
+        if to_update and not dry_run:
+            # CASE con 2 parámetros por fila: lotes chicos para el límite de 2100 de SQL Server
+            model.objects.bulk_update(to_update, ["price"], batch_size=min(chunk_size, 500))
+
+    if summary.changed and not dry_run:
+        cache.bump()
+    return summary.as_dict()
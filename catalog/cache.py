@@ -0,0 +1,105 @@
+# catalog/cache.py
+"""
+Caché en memoria del catálogo (Service / Part) por proceso.
+
+Guarda mapas compactos id -> CatalogEntry(code, name, price, is_active) y los recarga
+completos cuando cambia la generación "catalog" en BD (core.generations), que se
+incrementa en cada save/delete de Service o Part (ver catalog.apps) y en las
+actualizaciones masivas. La generación se consulta a lo sumo cada
+CATALOG_CACHE_CHECK_INTERVAL segundos; los cambios hechos en este mismo proceso
+se ven de inmediato.
+"""
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+
+from core import generations
+
+GENERATION = "catalog"
+
+
+class CatalogEntry(NamedTuple):
+    code: str
+    name: str
+    price: object  # Decimal
+    is_active: bool
+
+
+def _models():
+    from .models import Part, Service
+    return {"service": (Service, "code"), "part": (Part, "sku")}
+
+
+class CatalogCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._maps = None
+        self._generation = None
+        self._checked_at = 0.0
+
+    @property
+    def check_interval(self) -> float:
+        return getattr(settings, "CATALOG_CACHE_CHECK_INTERVAL", 2.0)
+
+    def _load(self, generation):
+        maps = {}
+        for kind, (model, code_field) in _models().items():
+            rows = model.objects.order_by().values_list("pk", code_field, "name", "price", "is_active")
+            maps[kind] = {pk: CatalogEntry(code, name, price, active) for pk, code, name, price, active in rows}
+        self._maps, self._generation = maps, generation
+
+    def _fresh_maps(self, force_check=False):
+        now = time.monotonic()
+        with self._lock:
+            if self._maps is not None and not force_check and now - self._checked_at < self.check_interval:
+                return self._maps
+            generation = generations.current(GENERATION)
+            self._checked_at = now
+            if self._maps is None or generation != self._generation:
+                self._load(generation)
+            return self._maps
+
+    def entries(self, kind: str) -> dict:
+        """{id: CatalogEntry} de "service" o "part"."""
+        return self._fresh_maps()[kind]
+
+    def get(self, kind: str, pk, refresh_on_miss: bool = True):
+        """CatalogEntry o None. Si no está, revisa la generación una vez (alta en otro proceso)."""
+        entry = self.entries(kind).get(pk)
+        if entry is None and refresh_on_miss:
+            entry = self._fresh_maps(force_check=True)[kind].get(pk)
+        return entry
+
+    def instance(self, kind: str, pk):
+        """Instancia del modelo armada desde la caché (sin consulta), o None."""
+        entry = self.get(kind, pk)
+        if entry is None:
+            return None
+        model, code_field = _models()[kind]
+        obj = model(pk=pk, name=entry.name, price=entry.price, is_active=entry.is_active, **{code_field: entry.code})
+        obj._state.adding = False
+        obj._state.db = "default"
+        return obj
+
+    def invalidate(self):
+        """Olvida los mapas locales (se recargan en el próximo acceso)."""
+        with self._lock:
+            self._maps = None
+            self._generation = None
+
+
+cache = CatalogCache()
+
+
+def bump():
+    """Marca el catálogo como cambiado para todos los procesos (llamar tras escrituras masivas)."""
+    generations.bump(GENERATION)
+    cache.invalidate()
+
+
+def on_catalog_changed(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    bump()
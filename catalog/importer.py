@@ -0,0 +1,287 @@
+# catalog/importer.py
+"""
+Importación de catálogo de proveedor (partes) en streaming.
+
+Lee CSV o JSONL registro por registro (memoria constante: solo el lote actual),
+compara cada lote contra Part por SKU con 1 SELECT y escribe solo lo que cambió
+con bulk_create / bulk_update. Devuelve contadores y avisa el progreso por lote.
+
+Codificación: UTF-8 (con o sin BOM); si el archivo no es UTF-8 válido se lee como
+cp1252 (exportaciones de Excel en español). Un archivo ilegible a mitad de camino
+termina en ImportFormatError con la línea y lo ya aplicado (los lotes previos quedan).
+"""
+import codecs
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import transaction
+
+from . import cache
+from .models import Part
+
+# columnas que se aceptan (el resto se ignora); sku es obligatoria, name solo para altas
+FIELDS = ("name", "unit", "cost", "price", "stock", "is_active")
+DECIMAL_FIELDS = {"cost", "price", "stock"}
+MAX_ERRORS_REPORTED = 100
+_TRUE = {"1", "true", "t", "si", "sí", "s", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+ENCODINGS = ("utf-8-sig", "cp1252")
+_SCAN_CHUNK = 64 * 1024
+
+
+class ImportFormatError(ValueError):
+    """
+    Archivo con formato no soportado o ilegible. `line` es la línea donde falló la
+    lectura; `result` (de import_parts) lo que ya se había aplicado hasta ese punto.
+    """
+
+    def __init__(self, message, line=None):
+        super().__init__(f"línea {line}: {message}" if line else message)
+        self.line = line
+        self.result = None
+
+
+# ----------------- lectura -----------------
+
+def detect_encoding(raw) -> str:
+    """
+    Primera de ENCODINGS que decodifica todo el archivo. Recorre los bytes por bloques
+    (memoria constante) y deja el archivo donde estaba.
+    """
+    start = raw.tell()
+    bad_line = None
+    try:
+        for encoding in ENCODINGS:
+            raw.seek(start)
+            decoder = codecs.getincrementaldecoder(encoding)()
+            line = 1
+            try:
+                for chunk in iter(lambda: raw.read(_SCAN_CHUNK), b""):
+                    try:
+                        decoder.decode(chunk)
+                    except UnicodeDecodeError as exc:
+                        bad_line = line + chunk[:max(0, exc.start)].count(b"\n")
+                        raise
+                    line += chunk.count(b"\n")
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                continue
+            return encoding
+    finally:
+        raw.seek(start)
+    raise ImportFormatError(f"codificación no soportada (se acepta {' o '.join(ENCODINGS)})", line=bad_line)
+
+
+def _text_stream(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    encoding = detect_encoding(fileobj) if fileobj.seekable() else ENCODINGS[0]
+    return io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+
+
+def iter_records(fileobj, fmt: str):
+    """
+    (número de línea, dict) uno a uno, sin cargar el archivo completo. Un archivo
+    ilegible (codificación, CSV malformado) corta con ImportFormatError.
+    """
+    if fmt not in ("csv", "jsonl"):
+        raise ImportFormatError(f"Formato no soportado: {fmt!r} (use csv o jsonl).")
+    stream = _text_stream(fileobj)
+    if fmt == "csv":
+        reader = csv.DictReader(stream, delimiter=_sniff_delimiter(stream))
+        try:
+            for row in reader:
+                yield reader.line_num, {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        except csv.Error as exc:
+            # DictReader.line_num se actualiza tras leer bien; el del reader interno incluye la línea que falló
+            raise ImportFormatError(f"CSV inválido: {exc}", line=reader.reader.line_num)
+        except UnicodeDecodeError as exc:
+            raise ImportFormatError(f"codificación inválida: {exc.reason}", line=reader.line_num + 1)
+    else:
+        lineno = 0
+        try:
+            for lineno, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield lineno, exc
+                    continue
+                yield lineno, record if isinstance(record, dict) else ValueError("se esperaba un objeto JSON")
+        except UnicodeDecodeError as exc:
+            raise ImportFormatError(f"codificación inválida: {exc.reason}", line=lineno + 1)
+
+
+def _sniff_delimiter(stream) -> str:
+    """Mira solo el encabezado: ";" (Excel en español) o ","."""
+    if not stream.seekable():
+        return ","
+    pos = stream.tell()
+    header = stream.readline()
+    stream.seek(pos)
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def guess_format(filename: str) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith((".csv", ".txt")):
+        return "csv"
+    raise ImportFormatError(f"No se reconoce el formato de {filename!r} (use .csv o .jsonl).")
+
+
+# ----------------- normalización -----------------
+
+def _clean(record) -> dict:
+    sku = str(record.get("sku") or "").strip()
+    if not sku:
+        raise ValueError("falta sku")
+    _check_limits("sku", sku)
+    out = {"sku": sku}
+    for field in FIELDS:
+        if field not in record or record[field] in (None, ""):
+            continue
+        value = record[field]
+        if field in DECIMAL_FIELDS:
+            try:
+                value = Decimal(str(value).replace(",", ".")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            except InvalidOperation:
+                raise ValueError(f"{field} inválido: {record[field]!r}")
+            if not value.is_finite():
+                raise ValueError(f"{field} inválido: {record[field]!r}")
+            if value < 0:
+                raise ValueError(f"{field} no puede ser negativo")
+        elif field == "is_active":
+            if isinstance(value, bool):
+                pass
+            elif str(value).strip().lower() in _TRUE:
+                value = True
+            elif str(value).strip().lower() in _FALSE:
+                value = False
+            else:
+                raise ValueError(f"is_active inválido: {value!r}")
+        else:
+            value = str(value).strip()
+        _check_limits(field, value)
+        out[field] = value
+    return out
+
+
+def _check_limits(field, value):
+    """
+    max_length / max_digits del modelo, por fila: un valor que no cabe es error de esa
+    línea y no un DataError de la BD (SQL Server) a mitad de lote.
+    """
+    model_field = Part._meta.get_field(field)
+    max_length = getattr(model_field, "max_length", None)
+    if max_length and isinstance(value, str) and len(value) > max_length:
+        raise ValueError(f"{field} excede {max_length} caracteres")
+    if field in DECIMAL_FIELDS:
+        integer_digits = model_field.max_digits - model_field.decimal_places
+        if abs(value) >= Decimal(10) ** integer_digits:
+            raise ValueError(f"{field} fuera de rango (máx. {integer_digits} dígitos enteros)")
+
+
+# ----------------- diff y escritura -----------------
+
+class ImportStats:
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.read = self.created = self.updated = self.unchanged = 0
+        self.batches = 0
+        self.errors = []
+        self.error_count = 0
+
+    def error(self, lineno, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS_REPORTED:
+            self.errors.append({"line": lineno, "error": str(message)})
+
+    def as_dict(self):
+        return {
+            "dry_run": self.dry_run,
+            "read": self.read,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "batches": self.batches,
+            "errors": self.error_count,
+            "error_samples": self.errors,
+        }
+
+
+def _apply_batch(batch: dict, stats: ImportStats, dry_run: bool):
+    """batch = {sku: (línea, datos)}. 1 SELECT + a lo sumo 1 INSERT y 1 UPDATE masivos."""
+    existing = {p.sku: p for p in Part.objects.filter(sku__in=list(batch)).only("pk", "sku", *FIELDS)}
+    to_create, to_update, changed_fields = [], [], set()
+    for sku, (lineno, data) in batch.items():
+        part = existing.get(sku)
+        if part is None:
+            if not data.get("name"):
+                stats.error(lineno, f"{sku}: falta name para dar de alta")
+                continue
+            to_create.append(Part(**data))
+            continue
+        diff = {f: v for f, v in data.items() if f != "sku" and getattr(part, f) != v}
+        if not diff:
+            stats.unchanged += 1
+            continue
+        for f, v in diff.items():
+            setattr(part, f, v)
+        changed_fields.update(diff)
+        to_update.append(part)
+
+    stats.created += len(to_create)
+    stats.updated += len(to_update)
+    stats.batches += 1
+    if dry_run:
+        return
+    with transaction.atomic():
+        if to_create:
+            Part.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            # CASE por columna: lote acotado para el límite de parámetros de SQL Server
+            Part.objects.bulk_update(to_update, sorted(changed_fields), batch_size=max(1, 1000 // (len(changed_fields) * 2 + 1)))
+
+
+def import_parts(records, batch_size: int = 1000, dry_run: bool = False, progress=None) -> dict:
+    """
+    Aplica los registros de iter_records() por lotes. `progress(stats)` se llama tras cada lote.
+    Un SKU repetido dentro del mismo lote: gana la última línea.
+    Si la lectura falla a mitad (ImportFormatError), los lotes ya aplicados quedan y
+    el error lleva en `result` los contadores hasta ese punto (el lote en curso no se aplica).
+    """
+    stats = ImportStats(dry_run)
+    batch = {}
+    try:
+        for lineno, record in records:
+            stats.read += 1
+            if isinstance(record, Exception):
+                stats.error(lineno, record)
+                continue
+            try:
+                data = _clean(record)
+            except ValueError as exc:
+                stats.error(lineno, exc)
+                continue
+            batch[data["sku"]] = (lineno, data)
+            if len(batch) >= batch_size:
+                _apply_batch(batch, stats, dry_run)
+                batch = {}
+                if progress:
+                    progress(stats)
+        if batch:
+            _apply_batch(batch, stats, dry_run)
+            if progress:
+                progress(stats)
+    except ImportFormatError as exc:
+        exc.result = stats.as_dict()
+        raise
+    finally:
+        if (stats.created or stats.updated) and not dry_run:
+            cache.bump()
+    return stats.as_dict()
@@ -0,0 +1,57 @@
+# catalog/management/commands/import_catalog.py
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog import importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa un catálogo de partes de proveedor (CSV o JSONL) en streaming: compara por SKU "
+        "y escribe solo altas y cambios con bulk_create/bulk_update por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo .csv o .jsonl (columnas: sku, name, unit, cost, price, stock, is_active)")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default=None,
+                            help="Por defecto se deduce de la extensión.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Solo compara, no escribe.")
+
+    def handle(self, *args, **opts):
+        path = Path(opts["path"])
+        if not path.exists():
+            raise CommandError(f"No existe {path}")
+        try:
+            fmt = opts["format"] or importer.guess_format(path.name)
+        except importer.ImportFormatError as exc:
+            raise CommandError(str(exc))
+
+        started = time.monotonic()
+
+        def progress(stats):
+            rate = stats.read / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f"  {stats.read} leídas · {stats.created} altas · {stats.updated} cambios · "
+                f"{stats.error_count} errores ({rate:,.0f} líneas/s)"
+            )
+
+        with path.open("rb") as fh:
+            try:
+                result = importer.import_parts(
+                    importer.iter_records(fh, fmt), batch_size=opts["batch_size"],
+                    dry_run=opts["dry_run"], progress=progress,
+                )
+            except importer.ImportFormatError as exc:
+                applied = exc.result["batches"] if exc.result else 0
+                raise CommandError(f"{exc} ({applied} lotes ya aplicados)")
+
+        for err in result["error_samples"]:
+            self.stdout.write(self.style.WARNING(f"  línea {err['line']}: {err['error']}"))
+        prefix = "[dry-run] " if result["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {prefix}{result['read']} líneas: {result['created']} altas, {result['updated']} cambios, "
+            f"{result['unchanged']} sin cambios, {result['errors']} errores ({time.monotonic() - started:.2f}s)."
+        ))
@@ -0,0 +1,67 @@
+# catalog/management/commands/update_prices.py
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog import bulk_prices
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza precios del catálogo en bloque: ajuste porcentual/monto con filtros "
+        "o lista de precios CSV (código,precio). UPDATE por lotes; --dry-run solo calcula."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(bulk_prices.KINDS), help="part o service")
+        mode = parser.add_mutually_exclusive_group(required=True)
+        mode.add_argument("--percent", help="Ajuste porcentual, p.ej. 7.5 o -10")
+        mode.add_argument("--amount", help="Monto a sumar (negativo para restar)")
+        mode.add_argument("--csv", help="Archivo CSV con código,precio")
+        parser.add_argument("--prefix", dest="code_prefix", help="Solo SKU/código que empiecen así")
+        parser.add_argument("--unit", help="Solo partes con esta unidad (UNI, LT, ...)")
+        active = parser.add_mutually_exclusive_group()
+        active.add_argument("--active", dest="is_active", action="store_const", const=True, default=None)
+        active.add_argument("--inactive", dest="is_active", action="store_const", const=False)
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--json", action="store_true", help="Imprime el resumen completo en JSON")
+
+    def handle(self, *args, **opts):
+        started = time.monotonic()
+        try:
+            if opts["csv"]:
+                path = Path(opts["csv"])
+                if not path.exists():
+                    raise CommandError(f"No existe {path}")
+                prices = bulk_prices.parse_price_csv(path.read_bytes())
+                result = bulk_prices.apply_price_list(
+                    opts["kind"], prices, dry_run=opts["dry_run"], chunk_size=opts["chunk_size"]
+                )
+            else:
+                result = bulk_prices.adjust_prices(
+                    opts["kind"],
+                    percent=opts["percent"],
+                    amount=opts["amount"],
+                    code_prefix=opts["code_prefix"],
+                    unit=opts["unit"],
+                    is_active=opts["is_active"],
+                    dry_run=opts["dry_run"],
+                    chunk_size=opts["chunk_size"],
+                )
+        except bulk_prices.PriceListError as exc:
+            raise CommandError(str(exc))
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+        elapsed = time.monotonic() - started
+        prefix = "[dry-run] " if result["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {prefix}{result['changed']} de {result['matched']} precios cambiados "
+            f"(total {result['total_before']} → {result['total_after']}, {elapsed:.2f}s)."
+        ))
+        if result["not_found"]:
+            self.stdout.write(self.style.WARNING(f"Códigos no encontrados: {len(result['not_found'])}"))
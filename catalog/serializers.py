@@ -1,6 +1,33 @@
+from decimal import Decimal
+
 from rest_framework import serializers
+from .cache import cache as catalog_cache
 from .models import Service, Part
 
+
+class CatalogRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField para Service/Part resuelto desde catalog.cache:
+    validar N renglones no hace N consultas. Devuelve una instancia armada en memoria
+    (pk, código, nombre, precio), suficiente para asignar la FK.
+    """
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        kwargs.setdefault("queryset", {"service": Service, "part": Part}[kind].objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        obj = catalog_cache.instance(self.kind, pk)
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return obj
+
 class ServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
@@ -10,3 +37,31 @@ class PartSerializer(serializers.ModelSerializer):
     class Meta:
         model = Part
         fields = '__all__'
+
+
+class PriceRowSerializer(serializers.Serializer):
+    code = serializers.CharField(max_length=60, help_text="SKU (partes) o código (servicios)")
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal("0"))
+
+
+class BulkPriceUpdateSerializer(serializers.Serializer):
+    """
+    Ajuste por filtro ({"percent": "5"} o {"amount": "-10"} + filtros) o lista explícita
+    ({"prices": [...]} o archivo CSV "file" con código,precio). dry_run=true solo calcula.
+    """
+    percent = serializers.DecimalField(max_digits=7, decimal_places=3, required=False, min_value=Decimal("-100"))
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    code_prefix = serializers.CharField(max_length=60, required=False, allow_blank=False)
+    unit = serializers.CharField(max_length=10, required=False)
+    is_active = serializers.BooleanField(required=False, allow_null=True, default=None)
+    prices = PriceRowSerializer(many=True, required=False)
+    file = serializers.FileField(required=False)
+    dry_run = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, data):
+        modes = [m for m in ("percent", "amount", "prices", "file") if data.get(m) is not None]
+        if len(modes) != 1:
+            raise serializers.ValidationError("Indique exactamente uno: percent, amount, prices o file.")
+        if modes[0] in ("prices", "file") and any(data.get(f) not in (None, "") for f in ("code_prefix", "unit", "is_active")):
+            raise serializers.ValidationError("Los filtros solo aplican a percent/amount.")
+        return data
@@ -27,6 +27,6 @@ class PartViewSet(ModelViewSet):
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ["id", "name", "sku"]
-    search_fields = ["name", "sku", "description"]
+    search_fields = ["name", "sku"]
     ordering_fields = ["id", "name", "price", "stock"]
     ordering = ["id"]
@@ -37,3 +37,13 @@ def auth_api(api, user_factory):
         api.force_authenticate(user=u)
         return api, u
     return _login
+
+@pytest.fixture
+def query_budget(db):
+    """
+    Presupuesto de consultas (core.query_budget):
+        with query_budget(3, label="lista"): api.get(...)
+    Falla con las huellas SQL repetidas si se excede.
+    """
+    from core.query_budget import query_budget as _query_budget
+    return _query_budget
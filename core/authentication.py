@@ -0,0 +1,61 @@
+# core/authentication.py
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+from . import roles
+from .tokens import PERMS_CLAIM, ROLES_CLAIM, VERSION_CLAIM
+
+
+class RoleClaimsUser(TokenUser):
+    """
+    Usuario sin BD armado desde los claims de core.tokens. Responde grupos y
+    permisos (has_perm, core.roles) igual que un User cargado, sin consultas.
+    """
+
+    def __init__(self, token):
+        super().__init__(token)
+        # core.roles.resolve() toma esto como caché por request
+        setattr(self, roles.ATTR, roles.Roles(
+            frozenset(token.get(ROLES_CLAIM, ())), frozenset(token.get(PERMS_CLAIM, ())),
+        ))
+
+    def get_all_permissions(self, obj=None):
+        if obj is not None:
+            return set()
+        return set(roles.resolve(self).perms)
+
+    def has_perm(self, perm, obj=None):
+        return obj is None and roles.user_has_perm(self, perm)
+
+    def has_perms(self, perm_list, obj=None):
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+    def has_module_perms(self, module):
+        return self.is_superuser or any(p.startswith(f"{module}.") for p in roles.resolve(self).perms)
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que, en lecturas (GET/HEAD/OPTIONS), confía en los claims de
+    rol del token si su rbac_v coincide con la versión vigente: ni usuario ni
+    grupos se leen de la BD. Escrituras, tokens sin claims o con versión vieja
+    (revocados por un cambio de roles) siguen el camino normal con BD.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and self.claims_are_current(validated_token):
+            return RoleClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    @staticmethod
+    def claims_are_current(validated_token) -> bool:
+        stamp = validated_token.get(VERSION_CLAIM)
+        return stamp is not None and stamp == roles.version()
@@ -0,0 +1,18 @@
+# core/backends.py
+from django.contrib.auth.backends import ModelBackend
+
+from . import roles
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend cuyos permisos salen de core.roles (caché por request y por proceso).
+    user.has_perm / DjangoModelPermissions dejan de consultar la BD en cada request.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if user_obj.is_superuser:
+            return super().get_all_permissions(user_obj, obj)
+        return set(roles.resolve(user_obj).perms)
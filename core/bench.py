@@ -0,0 +1,503 @@
+# core/bench.py
+"""
+Benchmark de carga de la API (`manage.py bench`).
+
+1. Siembra (si falta) un dataset sintético marcado con el prefijo BENCH: clientes
+   con vehículo, catálogo y cotizaciones con renglones (un tercio aprobadas para
+   poder convertirlas a orden de trabajo).
+2. Levanta un servidor WSGI local con hilos (o usa --url) y lanza N clientes
+   concurrentes que repiten una mezcla ponderada de endpoints reales (MIX).
+3. Reporta por endpoint y en total: p50/p95/p99, RPS, errores y consultas SQL por
+   request (de las métricas de core.middleware, solo con el servidor en proceso),
+   y guarda el resultado en JSON para comparar corridas entre commits.
+
+Clientes y servidor comparten el GIL cuando el servidor es en proceso: los
+números sirven para comparar commits entre sí, no como capacidad absoluta. Para
+medir un despliegue real usa --url contra gunicorn/uwsgi.
+"""
+import http.client
+import json
+import logging
+import platform
+import random
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+PREFIX = "BENCH"
+BENCH_USER = "bench_asesor"
+BENCH_PASSWORD = "bench-asesor-123"
+PERCENTILES = (50, 95, 99)
+
+_WORDS = ("filtro", "balata", "bujía", "aceite", "banda", "amortiguador", "radiador", "sensor", "bomba", "clutch")
+_BRANDS = ("Toyota", "Nissan", "Mazda", "Kia", "Hyundai", "Ford", "Chevrolet", "Honda")
+
+
+# ─────────────────────────── dataset ───────────────────────────
+
+def dataset_counts() -> dict:
+    from catalog.models import Part, Service
+    from customers.models import Customer
+    from quotes.models import Quotation
+
+    return {
+        "customers": Customer.objects.filter(name__startswith=PREFIX).count(),
+        "services": Service.objects.filter(code__startswith=PREFIX).count(),
+        "parts": Part.objects.filter(sku__startswith=PREFIX).count(),
+        "quotations": Quotation.objects.filter(customer__name__startswith=PREFIX).count(),
+    }
+
+
+@transaction.atomic
+def seed_dataset(size: int, seed: int = 0) -> dict:
+    """
+    Completa el dataset BENCH hasta `size` clientes (uno con vehículo y una
+    cotización cada uno). Idempotente: si ya hay `size` o más, no hace nada.
+    """
+    from catalog.models import Part, Service
+    from customers.models import Customer
+    from quotes.models import Quotation, QuotationPart, QuotationService
+    from vehicles.models import Vehicle
+
+    rng = random.Random(seed)
+    have = Customer.objects.filter(name__startswith=PREFIX).count()
+    n_services, n_parts = max(20, size // 10), max(50, size // 5)
+    for i in range(Service.objects.filter(code__startswith=PREFIX).count(), n_services):
+        Service.objects.create(code=f"{PREFIX}-S{i:05d}", name=f"Servicio {i} {rng.choice(_WORDS)}",
+                               price=rng.randrange(100, 2000))
+    for i in range(Part.objects.filter(sku__startswith=PREFIX).count(), n_parts):
+        Part.objects.create(sku=f"{PREFIX}-P{i:05d}", name=f"{rng.choice(_WORDS).title()} {i}",
+                            price=rng.randrange(5, 500))
+    services = list(Service.objects.filter(code__startswith=PREFIX))
+    parts = list(Part.objects.filter(sku__startswith=PREFIX))
+
+    for i in range(have, size):
+        customer = Customer.objects.create(name=f"{PREFIX} Cliente {i:06d}")
+        vehicle = Vehicle.objects.create(owner=customer, plate=f"BN{i:06d}", brand=rng.choice(_BRANDS),
+                                         model="Modelo", year=rng.randrange(2005, 2025))
+        q = Quotation.objects.create(customer=customer, vehicle=vehicle)
+        svc = rng.choice(services)
+        QuotationService.objects.create(quotation=q, service=svc, quantity=1, unit_price=svc.price)
+        for part in rng.sample(parts, 2):
+            QuotationPart.objects.create(quotation=q, part=part, quantity=rng.randrange(1, 4), unit_price=part.price)
+        if i % 3 == 0:
+            q.status = Quotation.APPROVED
+            q.save(update_fields=["status"])
+    return dataset_counts()
+
+
+def top_up_approved(target: int) -> int:
+    """
+    Cada conversión a orden de trabajo consume una cotización aprobada: antes de
+    correr se aprueban borradores BENCH (incluidos los que crearon corridas previas)
+    hasta tener `target` sin convertir. Devuelve cuántas hay.
+    """
+    from quotes.models import Quotation
+
+    bench = Quotation.objects.filter(customer__name__startswith=PREFIX, workorder__isnull=True)
+    have = bench.filter(status=Quotation.APPROVED).count()
+    if have < target:
+        ids = list(bench.filter(status=Quotation.DRAFT).order_by("id").values_list("id", flat=True)[: target - have])
+        have += Quotation.objects.filter(id__in=ids).update(status=Quotation.APPROVED)
+    return have
+
+
+def ensure_bench_user() -> User:
+    user, created = User.objects.get_or_create(username=BENCH_USER)
+    if created or not user.check_password(BENCH_PASSWORD):
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+    user.groups.add(Group.objects.get(name="Asesor"))
+    return user
+
+
+# ─────────────────────────── mezcla de endpoints ───────────────────────────
+
+class Context:
+    """Ids del dataset que usan los endpoints (compartido entre clientes)."""
+
+    def __init__(self):
+        from catalog.models import Part, Service
+        from quotes.models import Quotation
+
+        bench = Quotation.objects.filter(customer__name__startswith=PREFIX)
+        self.quotations = list(bench.values_list("id", "customer_id", "vehicle_id"))
+        self.approved = deque(
+            bench.filter(status=Quotation.APPROVED, workorder__isnull=True).values_list("id", flat=True)
+        )
+        self.services = list(Service.objects.filter(code__startswith=PREFIX).values_list("id", "price"))
+        self.parts = list(Part.objects.filter(sku__startswith=PREFIX).values_list("id", "price"))
+        self.lock = threading.Lock()
+
+    def next_approved(self):
+        with self.lock:
+            return self.approved.popleft() if self.approved else None
+
+
+class Endpoint(NamedTuple):
+    name: str
+    weight: int
+    method: str
+    # (ctx, rng) -> (path, body) ; path None = sin datos, se elige otro endpoint
+    build: Callable
+    # (method, view_name) de core.middleware para atribuir consultas SQL
+    views: tuple
+    auth: bool = True
+
+
+def _quotation_list(ctx, rng):
+    return "/api/quotations/?pagination=cursor&page_size=20", None
+
+
+def _quotation_detail(ctx, rng):
+    return f"/api/quotations/{rng.choice(ctx.quotations)[0]}/", None
+
+
+def _quotation_create(ctx, rng):
+    _, customer, vehicle = rng.choice(ctx.quotations)
+    svc_id, svc_price = rng.choice(ctx.services)
+    return "/api/quotations/", {
+        "customer": customer,
+        "vehicle": vehicle,
+        "services": [{"service": svc_id, "quantity": 1, "unit_price": str(svc_price)}],
+        "parts": [{"part": pid, "quantity": rng.randrange(1, 4), "unit_price": str(price)}
+                  for pid, price in rng.sample(ctx.parts, 2)],
+    }
+
+
+def _to_workorder(ctx, rng):
+    qid = ctx.next_approved()
+    return (f"/api/quotations/{qid}/to-workorder/", {}) if qid else (None, None)
+
+
+def _catalog_search(ctx, rng):
+    kind = rng.choice(("parts", "services"))
+    return f"/api/{kind}/autocomplete/?q={rng.choice(_WORDS)[:3]}", None
+
+
+def _jwt_obtain(ctx, rng):
+    return "/api/auth/jwt/create/", {"username": BENCH_USER, "password": BENCH_PASSWORD}
+
+
+MIX = (
+    Endpoint("quotation_list", 30, "GET", _quotation_list, (("GET", "quotation-list"),)),
+    Endpoint("quotation_detail", 25, "GET", _quotation_detail, (("GET", "quotation-detail"),)),
+    Endpoint("catalog_search", 20, "GET", _catalog_search,
+             (("GET", "part-autocomplete"), ("GET", "service-autocomplete"))),
+    Endpoint("quotation_create", 12, "POST", _quotation_create, (("POST", "quotation-list"),)),
+    Endpoint("to_workorder", 8, "POST", _to_workorder, (("POST", "quotation-to-workorder"),)),
+    Endpoint("jwt_obtain", 5, "POST", _jwt_obtain, (("POST", "jwt-create"),), auth=False),
+)
+
+
+# ─────────────────────────── servidor y clientes ───────────────────────────
+
+class LocalServer:
+    """Servidor WSGI con hilos en 127.0.0.1:<puerto libre>, como LiveServerTestCase."""
+
+    def __init__(self):
+        from django.core.servers.basehttp import ThreadedWSGIServer, get_internal_wsgi_application
+        from django.test.testcases import QuietWSGIRequestHandler
+
+        self.httpd = ThreadedWSGIServer(("127.0.0.1", 0), QuietWSGIRequestHandler, allow_reuse_address=False)
+        self.httpd.set_app(get_internal_wsgi_application())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="bench-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join(5)
+
+
+class QueryCapture(logging.Handler):
+    """Junta db_queries de los registros de "workshop.requests" por (method, view)."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.by_view = defaultdict(list)
+        self.enabled = False
+
+    def start(self):
+        """Descarta lo capturado (login, warmup) y empieza a contar."""
+        self.by_view.clear()
+        self.enabled = True
+
+    def emit(self, record):
+        metrics = getattr(record, "metrics", None)
+        if self.enabled and metrics:
+            self.by_view[(metrics["method"], metrics["view"])].append(metrics["db_queries"])
+
+    def __enter__(self):
+        logger = logging.getLogger("workshop.requests")
+        self._level = logger.level
+        logger.addHandler(self)
+        if not logger.isEnabledFor(logging.INFO):
+            logger.setLevel(logging.INFO)
+        return self
+
+    def __exit__(self, *exc):
+        logger = logging.getLogger("workshop.requests")
+        logger.removeHandler(self)
+        logger.setLevel(self._level)
+
+
+class Client:
+    """Conexión keep-alive propia (http.client) con su token JWT."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.token = None
+        self.conn = None
+
+    def request(self, method, path, body=None, auth=True):
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if auth and self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                resp = self.conn.getresponse()
+                data = resp.read()
+                if resp.getheader("Connection", "").lower() == "close":
+                    self.close()
+                return resp.status, data
+            except (http.client.HTTPException, ConnectionError):
+                # el servidor cerró la conexión keep-alive: un reintento con conexión nueva
+                self.close()
+                if attempt == 2:
+                    raise
+
+    def login(self):
+        status, data = self.request("POST", "/api/auth/jwt/create/",
+                                    {"username": BENCH_USER, "password": BENCH_PASSWORD}, auth=False)
+        if status != 200:
+            raise RuntimeError(f"No se pudo obtener JWT para {BENCH_USER}: HTTP {status} {data[:200]!r}")
+        self.token = json.loads(data)["access"]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def _choose(rng, mix):
+    return rng.choices(mix, weights=[e.weight for e in mix])[0]
+
+
+def run_clients(base_url, ctx, *, clients=8, duration=None, requests=None, warmup=5, seed=0, mix=MIX,
+                on_start=None):
+    """
+    Corre `clients` hilos hasta `duration` segundos o `requests` requests en total.
+    Cada cliente hace login y `warmup` GETs antes; `on_start()` se llama cuando todos
+    terminaron el calentamiento, justo antes de medir.
+    Devuelve (samples, elapsed) con samples = [(endpoint, status, ms)].
+    """
+    samples = []
+    samples_lock = threading.Lock()
+    budget = {"left": requests}
+    errors = []
+    ready = threading.Barrier(clients + 1)
+    go = threading.Event()
+    stop_at = [None]
+
+    def take_ticket():
+        if requests is None:
+            return time.perf_counter() < stop_at[0]
+        with samples_lock:
+            if budget["left"] <= 0:
+                return False
+            budget["left"] -= 1
+            return True
+
+    def worker(i):
+        rng = random.Random(f"{seed}-{i}")
+        client = Client(base_url)
+        local = []
+        try:
+            client.login()
+            for _ in range(warmup):
+                ep = _choose(rng, [e for e in mix if e.method == "GET"] or mix)
+                path, body = ep.build(ctx, rng)
+                if path:
+                    client.request(ep.method, path, body, ep.auth)
+        except Exception as exc:  # sin login no hay corrida útil para este cliente
+            errors.append(exc)
+        finally:
+            ready.wait()
+        go.wait()
+        if errors:
+            return
+        try:
+            while take_ticket():
+                ep = _choose(rng, mix)
+                path, body = ep.build(ctx, rng)
+                if path is None:
+                    ep = mix[0]
+                    path, body = ep.build(ctx, rng)
+                start = time.perf_counter()
+                try:
+                    status, _ = client.request(ep.method, path, body, ep.auth)
+                except OSError:
+                    status = 0
+                local.append((ep.name, status, (time.perf_counter() - start) * 1000))
+        finally:
+            client.close()
+            with samples_lock:
+                samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"bench-client-{i}") for i in range(clients)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    if on_start and not errors:
+        on_start()
+    started = time.perf_counter()
+    if duration is not None:
+        stop_at[0] = started + duration
+    go.set()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return samples, time.perf_counter() - started
+
+
+# ─────────────────────────── estadística y reporte ───────────────────────────
+
+def percentile(sorted_values, pct) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))  # ceil
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+def summarize(latencies_ms, statuses, elapsed, queries=None) -> dict:
+    values = sorted(latencies_ms)
+    n = len(values)
+    out = {
+        "requests": n,
+        "errors": sum(1 for s in statuses if not 200 <= s < 400),
+        "rps": round(n / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {f"p{p}": round(percentile(values, p), 2) for p in PERCENTILES},
+        "status": dict(sorted(Counter(str(s) for s in statuses).items())),
+    }
+    out["latency_ms"]["mean"] = round(sum(values) / n, 2) if n else 0.0
+    out["latency_ms"]["max"] = round(values[-1], 2) if n else 0.0
+    out["db_queries_per_request"] = round(sum(queries) / len(queries), 2) if queries else None
+    return out
+
+
+def build_report(samples, elapsed, capture=None, mix=MIX) -> dict:
+    by_endpoint = defaultdict(list)
+    for name, status, ms in samples:
+        by_endpoint[name].append((status, ms))
+    endpoints = {}
+    all_queries = []
+    for ep in mix:
+        rows = by_endpoint.get(ep.name)
+        if not rows:
+            continue
+        queries = [q for key in ep.views for q in (capture.by_view.get(key, []) if capture else [])]
+        all_queries += queries
+        endpoints[ep.name] = summarize([ms for _, ms in rows], [s for s, _ in rows], elapsed, queries)
+    return {
+        "total": summarize([s[2] for s in samples], [s[1] for s in samples], elapsed, all_queries),
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=settings.BASE_DIR, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(*, size=500, clients=8, duration=30.0, requests=None, warmup=5, seed=0, url=None, seed_data=True) -> dict:
+    """Siembra, corre la mezcla y devuelve el reporte completo (ver módulo)."""
+    from core import rbac
+
+    rbac.sync_roles()
+    if seed_data:
+        seed_dataset(size, seed)
+    ensure_bench_user()
+    top_up_approved(max(10, size // 3))
+    ctx = Context()
+    if not ctx.quotations:
+        raise RuntimeError("No hay dataset BENCH: corre sin --no-seed al menos una vez.")
+
+    with QueryCapture() as capture, ExitStack() as stack:
+        if url is None:
+            # servidor en proceso: sin throttling (mediríamos 429s) y con métricas de BD
+            stack.enter_context(override_settings(THROTTLE_ENABLED=False))
+            url = stack.enter_context(LocalServer()).url
+        samples, elapsed = run_clients(
+            url, ctx, clients=clients, duration=duration, requests=requests, warmup=warmup, seed=seed,
+            on_start=capture.start,
+        )
+
+    report = build_report(samples, elapsed, capture)
+    report["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "url": url,
+        "clients": clients,
+        "duration_s": round(elapsed, 2),
+        "warmup_per_client": warmup,
+        "seed": seed,
+        "dataset": dataset_counts(),
+        "mix": {e.name: e.weight for e in MIX},
+    }
+    return report
+
+
+def compare(current: dict, baseline: dict) -> list:
+    """[(endpoint, métrica, antes, ahora, cambio %)] para p50/p95/p99, RPS y consultas."""
+    rows = []
+    names = ["total"] + [n for n in current.get("endpoints", {}) if n in baseline.get("endpoints", {})]
+    for name in names:
+        cur = current["total"] if name == "total" else current["endpoints"][name]
+        base = baseline["total"] if name == "total" else baseline["endpoints"][name]
+        metrics = [(f"p{p}", cur["latency_ms"][f"p{p}"], base["latency_ms"][f"p{p}"]) for p in PERCENTILES]
+        metrics += [("rps", cur["rps"], base["rps"]),
+                    ("db_queries", cur["db_queries_per_request"], base["db_queries_per_request"])]
+        for metric, now, before in metrics:
+            if now is None or before is None:
+                continue
+            change = round((now - before) / before * 100, 1) if before else None
+            rows.append((name, metric, before, now, change))
+    return rows
@@ -0,0 +1,430 @@
+# core/datagen.py
+"""
+Generador de datos sintéticos a escala de producción (`manage.py generate_data`).
+
+Crea clientes, vehículos, catálogo (servicios y partes), cotizaciones con renglones
+y órdenes de trabajo (una por cotización aprobada, con los renglones copiados),
+referencialmente consistentes y con totales correctos.
+
+- Ids explícitos a partir del MAX(pk) actual: cada lote sabe de antemano los ids
+  de clientes/vehículos/cotizaciones que referencia, sin leer la BD.
+- Los lotes (CHUNK filas) se generan en procesos aparte (multiprocessing) como
+  tuplas planas y se insertan con bulk_create por lotes. En SQL Server (y otros
+  motores con escritores concurrentes) cada worker inserta su propio lote; en SQLite,
+  que admite un solo escritor, los workers solo generan y escribe el proceso principal.
+- Determinista: cada lote usa su propio Random(seed, tipo, inicio), así la misma
+  semilla y los mismos tamaños producen los mismos datos con cualquier --workers.
+- bulk_create no llama save() ni dispara señales: aquí se llenan las placas/VIN
+  normalizados, los números Q-/OT- (core.sequences.allocate_numbers) y los totales;
+  cada lote reindexa la búsqueda de sus documentos y se invalida el catálogo.
+
+No correr con la API escribiendo al mismo tiempo: los ids se reservan desde MAX(pk).
+"""
+import multiprocessing
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+CHUNK = 5000  # clientes o cotizaciones por tarea
+TWOPL = Decimal("0.01")
+
+QUOTATION_STATUS_WEIGHTS = (("DRAFT", 40), ("SENT", 25), ("APPROVED", 20), ("REJECTED", 10), ("EXPIRED", 5))
+WORKORDER_STATUS_WEIGHTS = (("OPEN", 25), ("IN_PROGRESS", 25), ("DONE", 45), ("CANCELLED", 5))
+
+_FIRST = ("Juan", "María", "José", "Ana", "Luis", "Carmen", "Carlos", "Rosa", "Jorge", "Lucía", "Pedro",
+          "Sofía", "Miguel", "Elena", "Diego", "Paola", "Andrés", "Gabriela", "Fernando", "Valeria")
+_LAST = ("García", "López", "Pérez", "González", "Rodríguez", "Hernández", "Martínez", "Ramírez", "Flores",
+         "Morales", "Castillo", "Reyes", "Cruz", "Ortiz", "Mendoza", "Herrera", "Aguilar", "Juárez")
+_COMPANY = ("Transportes", "Distribuidora", "Comercial", "Logística", "Servicios")
+_STREETS = ("Av. Reforma", "Calle 5", "Blvd. Los Próceres", "Av. Las Américas", "Calzada Roosevelt", "Calle Real")
+_MODELS = {
+    "Toyota": ("Hilux", "Corolla", "Yaris", "RAV4", "Land Cruiser"),
+    "Nissan": ("Frontier", "Sentra", "Versa", "X-Trail"),
+    "Mazda": ("Mazda 3", "CX-5", "BT-50"),
+    "Kia": ("Rio", "Sportage", "Picanto", "Sorento"),
+    "Hyundai": ("Accent", "Tucson", "Elantra", "H-1"),
+    "Ford": ("Ranger", "Explorer", "Focus"),
+    "Chevrolet": ("Aveo", "Spark", "Colorado"),
+    "Honda": ("Civic", "CR-V", "Fit"),
+    "Mitsubishi": ("L200", "Montero", "Outlander"),
+}
+_BRANDS = tuple(_MODELS)
+_WMI = {"Toyota": "JTD", "Nissan": "3N1", "Mazda": "JM1", "Kia": "KNA", "Hyundai": "KMH", "Ford": "1FA",
+        "Chevrolet": "1G1", "Honda": "JHM", "Mitsubishi": "JA3"}
+_COLORS = ("Blanco", "Negro", "Gris", "Plata", "Rojo", "Azul", "Verde", "Beige")
+_SERVICES = ("Cambio de aceite", "Alineación", "Balanceo", "Afinado mayor", "Afinado menor", "Frenos delanteros",
+             "Frenos traseros", "Diagnóstico computarizado", "Cambio de clutch", "Suspensión", "Aire acondicionado",
+             "Sistema eléctrico", "Rotación de llantas", "Limpieza de inyectores", "Cambio de banda de tiempo")
+_PARTS = ("Filtro de aceite", "Filtro de aire", "Balata", "Disco de freno", "Bujía", "Amortiguador", "Banda",
+          "Radiador", "Sensor de oxígeno", "Bomba de agua", "Batería", "Kit de clutch", "Rótula", "Termostato")
+_PART_BRANDS = ("Bosch", "NGK", "Denso", "Monroe", "Gates", "ACDelco", "Valeo", "Mann")
+_COMPLAINTS = ("Ruido al frenar", "Vibración en el volante", "Se calienta el motor", "Mantenimiento de rutina",
+               "Luz de check engine", "Jalones al acelerar", "Fuga de aceite", "No enciende el aire")
+_DIAGNOSES = ("Pastillas gastadas", "Llantas desbalanceadas", "Termostato pegado", "Sensor defectuoso",
+              "Empaque dañado", "Servicio según kilometraje")
+_ASCII = str.maketrans("áéíóúñü", "aeiounu")
+
+
+def q2(x) -> Decimal:
+    return x.quantize(TWOPL, rounding=ROUND_HALF_UP)
+
+
+def _weighted(rng, table):
+    return rng.choices([v for v, _ in table], weights=[w for _, w in table])[0]
+
+
+def plate_for(vehicle_id: int) -> str:
+    """Placa única derivada del id: AAA-0000 (175 M combinaciones)."""
+    n, digits = divmod(vehicle_id, 10000)
+    letters = ""
+    for _ in range(3):
+        n, r = divmod(n, 26)
+        letters = chr(65 + r) + letters
+    return f"{letters}-{digits:04d}"
+
+
+# ─────────────────────────── generación ───────────────────────────
+# Funciones puras: solo tuplas y Decimal, sin ORM (se pueden ejecutar en cualquier proceso).
+
+# estado por proceso (lo fija _init_worker): catalog {"services"/"parts": [(id, precio)]},
+# now, batch_size, write (si el worker también inserta)
+_state = {}
+
+
+def _init_worker(state):
+    if state.get("write"):
+        import django
+        from django.apps import apps
+        from django.db import connections
+
+        if not apps.ready:  # spawn (Windows): proceso nuevo sin Django configurado
+            django.setup()
+        # fork: no reutilizar las conexiones heredadas del proceso principal
+        connections.close_all()
+    _state.clear()
+    _state.update(state)
+
+
+def gen_customers(task):
+    """Clientes [start, end) y sus `k` vehículos cada uno."""
+    seed, start, end, cust_base, veh_base, k = task
+    rng = random.Random(f"{seed}:customers:{start}")
+    customers, vehicles = [], []
+    for i in range(start, end):
+        cid = cust_base + i
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        if rng.random() < 0.1:
+            name = f"{rng.choice(_COMPANY)} {last} {rng.choice(('S.A.', 'Ltda.', 'e Hijos'))}"
+        else:
+            name = f"{first} {last} {rng.choice(_LAST)}"
+        email = f"{first.lower()}.{last.lower()}{cid}@example.com".translate(_ASCII)
+        phone = f"5{rng.randrange(1000000, 9999999)}"
+        address = f"{rng.choice(_STREETS)} {rng.randrange(1, 200)}-{rng.randrange(1, 99)}, Zona {rng.randrange(1, 25)}"
+        customers.append((cid, name, phone, email, address))
+        for j in range(k):
+            vid = veh_base + i * k + j
+            brand = rng.choice(_BRANDS)
+            vin = f"{_WMI[brand]}{rng.randrange(10**13, 10**14)}" if rng.random() < 0.8 else None
+            vehicles.append((
+                vid, cid, plate_for(vid), vin, brand, rng.choice(_MODELS[brand]),
+                rng.randrange(1995, 2026), rng.choice(_COLORS), rng.randrange(0, 300000, 50),
+            ))
+    return {"customers": customers, "vehicles": vehicles}
+
+
+def _lines(rng, items, n, qty_choices):
+    out = []
+    for item_id, price in rng.sample(items, min(n, len(items))):
+        qty = Decimal(rng.choice(qty_choices))
+        disc = q2(qty * price * Decimal(rng.choice((5, 10, 15))) / 100) if rng.random() < 0.1 else Decimal("0.00")
+        out.append((item_id, qty, price, disc))
+    return out
+
+
+def gen_quotations(task):
+    """
+    Cotizaciones [start, end) con renglones y totales; las aprobadas traen su orden de
+    trabajo. Tiempos como segundos hacia atrás desde "ahora" (el proceso principal los
+    convierte a fecha).
+    """
+    seed, start, end, q_base, cust_base, n_customers, veh_base, k, days = task
+    rng = random.Random(f"{seed}:quotations:{start}")
+    services, parts = _state["catalog"]["services"], _state["catalog"]["parts"]
+    span = max(1, days) * 86400
+    quotations, q_services, q_parts, workorders = [], [], [], []
+    for i in range(start, end):
+        qid = q_base + i
+        # clientes recurrentes: sesgo hacia los primeros índices
+        cidx = int(n_customers * rng.random() ** 2)
+        vehicle_id = veh_base + cidx * k + rng.randrange(k) if k else None
+        status = _weighted(rng, QUOTATION_STATUS_WEIGHTS)
+        age = rng.randrange(span)
+
+        svc = _lines(rng, services, rng.randint(1, 3), ("1", "1", "1", "2"))
+        prt = _lines(rng, parts, rng.randint(0, 5), ("1", "1", "2", "4", "0.5"))
+        sub_s = sum((q2(q * p - d) for _, q, p, d in svc), Decimal("0.00"))
+        sub_p = sum((q2(q * p - d) for _, q, p, d in prt), Decimal("0.00"))
+        notes = rng.choice(_COMPLAINTS) if rng.random() < 0.5 else ""
+        quotations.append((qid, cidx + cust_base, vehicle_id, status, notes, age, rng.choice((15, 30)),
+                           q2(sub_s), q2(sub_p), q2(sub_s + sub_p)))
+        q_services += [(qid, *line) for line in svc]
+        q_parts += [(qid, *line) for line in prt]
+
+        if status == "APPROVED" and vehicle_id is not None:
+            wo_status = _weighted(rng, WORKORDER_STATUS_WEIGHTS)
+            opened = max(0, age - rng.randrange(0, 5 * 86400))
+            closed = max(0, opened - rng.randrange(3600, 7 * 86400)) if wo_status in ("DONE", "CANCELLED") else None
+            workorders.append((qid, cidx + cust_base, vehicle_id, wo_status, notes or rng.choice(_COMPLAINTS),
+                               rng.choice(_DIAGNOSES) if wo_status != "OPEN" else None, opened, closed))
+    return {"quotations": quotations, "services": q_services, "parts": q_parts, "workorders": workorders}
+
+
+# ─────────────────────────── escritura ───────────────────────────
+
+def write_customers(chunk) -> dict:
+    from django.db import transaction
+
+    from customers.models import Customer
+    from vehicles.models import Vehicle, normalize_plate
+
+    batch_size = _state["batch_size"]
+    with transaction.atomic():
+        Customer.objects.bulk_create(
+            [Customer(id=c, name=n, phone=ph, email=e, address=a) for c, n, ph, e, a in chunk["customers"]],
+            batch_size=batch_size,
+        )
+        # bulk_create no pasa por Vehicle.save(): formas normalizadas aquí
+        Vehicle.objects.bulk_create(
+            [
+                Vehicle(id=v, owner_id=o, plate=pl, vin=vin, brand=b, model=m, year=y, color=col, mileage_km=km,
+                        plate_normalized=normalize_plate(pl), vin_normalized=normalize_plate(vin) or None)
+                for v, o, pl, vin, b, m, y, col, km in chunk["vehicles"]
+            ],
+            batch_size=batch_size,
+        )
+    return {"customers": len(chunk["customers"]), "vehicles": len(chunk["vehicles"])}
+
+
+def write_quotations(chunk) -> dict:
+    """Cotizaciones + renglones + órdenes (con renglones copiados) de un lote, y su índice de búsqueda."""
+    from django.db import transaction
+
+    from core import search
+    from core.sequences import allocate_numbers
+    from quotes.models import Quotation, QuotationPart, QuotationService
+    from workorders.models import WorkOrder, WorkOrderPart, WorkOrderService
+
+    batch_size, now = _state["batch_size"], _state["now"]
+    with transaction.atomic():
+        numbers = allocate_numbers(Quotation.NUMBER_PREFIX, len(chunk["quotations"]), width=4)
+        quotations = []
+        for (qid, cid, vid, st, notes, age, valid, sub_s, sub_p, total), number in zip(chunk["quotations"], numbers):
+            created = now - timedelta(seconds=age)
+            quotations.append(Quotation(
+                id=qid, number=number, status=st, customer_id=cid, vehicle_id=vid, notes=notes,
+                valid_until=(created + timedelta(days=valid)).date(),
+                subtotal_services=sub_s, subtotal_parts=sub_p, grand_total=total,
+                created_at=created, updated_at=created,
+            ))
+        q_stamps = [{"created_at": q.created_at, "updated_at": q.updated_at} for q in quotations]
+        Quotation.objects.bulk_create(quotations, batch_size=batch_size)
+        _backdate(Quotation, quotations, q_stamps, batch_size)
+        _bulk_lines(QuotationService, "quotation_id", "service_id", chunk["services"], batch_size)
+        _bulk_lines(QuotationPart, "quotation_id", "part_id", chunk["parts"], batch_size)
+
+        orders = []
+        if chunk["workorders"]:
+            wo_numbers = allocate_numbers(WorkOrder.NUMBER_PREFIX, len(chunk["workorders"]), width=6)
+            for (qid, cid, vid, st, complaint, diagnosis, opened, closed), number in zip(chunk["workorders"], wo_numbers):
+                orders.append(WorkOrder(
+                    number=number, quotation_id=qid, customer_id=cid, vehicle_id=vid, status=st,
+                    complaint=complaint, diagnosis=diagnosis, opened_at=now - timedelta(seconds=opened),
+                    closed_at=None if closed is None else now - timedelta(seconds=closed),
+                ))
+            wo_stamps = [{"opened_at": o.opened_at} for o in orders]
+            WorkOrder.objects.bulk_create(orders, batch_size=batch_size)
+            if any(o.pk is None for o in orders):
+                # backend sin RETURNING en INSERT masivo: ids por número (como quotes.conversion)
+                by_number = dict(WorkOrder.objects.filter(number__in=wo_numbers).values_list("number", "pk"))
+                for o in orders:
+                    o.pk = by_number[o.number]
+            _backdate(WorkOrder, orders, wo_stamps, batch_size)
+        # renglones de la orden = renglones de su cotización
+        wo_by_quotation = {o.quotation_id: o.pk for o in orders}
+        wo_services = [(wo_by_quotation[r[0]], *r[1:]) for r in chunk["services"] if r[0] in wo_by_quotation]
+        wo_parts = [(wo_by_quotation[r[0]], *r[1:]) for r in chunk["parts"] if r[0] in wo_by_quotation]
+        _bulk_lines(WorkOrderService, "workorder_id", "service_id", wo_services, batch_size)
+        _bulk_lines(WorkOrderPart, "workorder_id", "part_id", wo_parts, batch_size)
+
+    if _state.get("reindex", True):
+        # bulk_create no dispara las señales que mantienen el índice de búsqueda
+        search.reindex(search.QUOTATION, [q.id for q in quotations])
+        search.reindex(search.WORKORDER, [o.pk for o in orders])
+    return {
+        "quotations": len(quotations),
+        "quotation_lines": len(chunk["services"]) + len(chunk["parts"]),
+        "workorders": len(orders),
+        "workorder_lines": len(wo_services) + len(wo_parts),
+    }
+
+
+def _backdate(model, objs, stamps, batch_size):
+    """
+    bulk_create pasa por pre_save: auto_now/auto_now_add dejan "ahora" en la fila y en
+    el objeto. Las fechas históricas se reponen con un UPDATE masivo por id en la misma
+    transacción (bulk_update no llama pre_save), sin tocar los Field del modelo.
+    """
+    if not objs:
+        return
+    for obj, values in zip(objs, stamps):
+        for name, value in values.items():
+            setattr(obj, name, value)
+    model.objects.bulk_update(objs, list(stamps[0]), batch_size=batch_size)
+
+
+def _bulk_lines(model, parent_field, item_field, rows, batch_size):
+    model.objects.bulk_create(
+        [
+            model(**{parent_field: parent, item_field: item}, quantity=qty, unit_price=price, discount=disc)
+            for parent, item, qty, price, disc in rows
+        ],
+        batch_size=batch_size,
+    )
+
+
+def customers_task(task):
+    chunk = gen_customers(task)
+    return write_customers(chunk) if _state.get("write") else chunk
+
+
+def quotations_task(task):
+    chunk = gen_quotations(task)
+    return write_quotations(chunk) if _state.get("write") else chunk
+
+
+# ─────────────────────────── orquestación (proceso principal) ───────────────────────────
+
+def _next_id(model) -> int:
+    from django.db.models import Max
+
+    return (model.objects.aggregate(m=Max("pk"))["m"] or 0) + 1
+
+
+def _tasks(seed, total, extra):
+    return [(seed, start, min(start + CHUNK, total), *extra) for start in range(0, total, CHUNK)]
+
+
+@contextmanager
+def _mapper(workers, state):
+    """imap ordenado: en un Pool si workers > 1, en el mismo proceso si no."""
+    if workers <= 1:
+        _init_worker({**state, "write": False})
+        yield map
+        return
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(state,)) as pool:
+        yield lambda fn, tasks: pool.imap(fn, tasks)
+
+
+def parallel_writes_supported(connection) -> bool:
+    """SQLite admite un solo escritor: ahí los workers solo generan y escribe el principal."""
+    return connection.vendor != "sqlite" and not connection.in_atomic_block
+
+
+def _make_catalog(seed, n_services, n_parts, batch_size):
+    from catalog.models import Part, Service
+
+    rng = random.Random(f"{seed}:catalog")
+    s_base, p_base = _next_id(Service), _next_id(Part)
+    services = [
+        Service(
+            id=s_base + i, code=f"SRV-{s_base + i:06d}", name=f"{_SERVICES[i % len(_SERVICES)]} {i // len(_SERVICES) + 1}",
+            labor_minutes=rng.choice((30, 45, 60, 90, 120, 180)), price=Decimal(rng.randrange(150, 2500)),
+        )
+        for i in range(n_services)
+    ]
+    parts = []
+    for i in range(n_parts):
+        price = q2(Decimal(rng.randrange(1500, 250000)) / 100)
+        parts.append(Part(
+            id=p_base + i, sku=f"{_PART_BRANDS[i % len(_PART_BRANDS)][:3].upper()}-{p_base + i:07d}",
+            name=f"{rng.choice(_PARTS)} {rng.choice(_PART_BRANDS)}", stock=Decimal(rng.randrange(0, 200)),
+            cost=q2(price * Decimal("0.6")), price=price,
+        ))
+    Service.objects.bulk_create(services, batch_size=batch_size)
+    Part.objects.bulk_create(parts, batch_size=batch_size)
+    return {"services": [(s.id, s.price) for s in services], "parts": [(p.id, p.price) for p in parts]}
+
+
+def generate(*, customers, vehicles_per_customer=1, quotations=0, services=200, parts=2000, seed=42,
+             workers=None, batch_size=2000, days=730, reindex=True, progress=None) -> dict:
+    """
+    Carga el dataset completo y devuelve {"counts": {...}, "elapsed": s, "parallel_writes": bool}.
+    `progress(texto)` recibe avances (para la salida del comando).
+    """
+    from django.db import connection, connections, transaction
+    from django.utils import timezone
+
+    from catalog import cache as catalog_cache
+    from customers.models import Customer
+    from quotes.models import Quotation
+    from vehicles.models import Vehicle
+    from workorders.models import WorkOrder
+
+    say = progress or (lambda msg: None)
+    workers = workers or os.cpu_count() or 1
+    if quotations and not customers:
+        raise ValueError("Para generar cotizaciones hace falta al menos un cliente.")
+    if quotations and not (services or parts):
+        raise ValueError("Para generar cotizaciones hace falta catálogo (servicios o partes).")
+    started = time.monotonic()
+    counts = dict.fromkeys(("customers", "vehicles", "services", "parts", "quotations",
+                            "quotation_lines", "workorders", "workorder_lines"), 0)
+
+    with transaction.atomic():
+        catalog = _make_catalog(seed, services, parts, batch_size)
+    counts["services"], counts["parts"] = services, parts
+    catalog_cache.bump()
+    say(f"catálogo: {services} servicios, {parts} partes")
+
+    k = vehicles_per_customer
+    cust_base, veh_base, q_base = _next_id(Customer), _next_id(Vehicle), _next_id(Quotation)
+    parallel = workers > 1 and parallel_writes_supported(connection)
+    state = {"catalog": catalog, "now": timezone.now(), "batch_size": batch_size, "reindex": reindex,
+             "write": parallel}
+    if parallel:
+        connections.close_all()  # que los procesos hijos no hereden conexiones abiertas
+    _init_worker({**state, "write": False})
+
+    def absorb(result, phase):
+        done = result if parallel else (write_customers(result) if phase == "customers" else write_quotations(result))
+        for key, value in done.items():
+            counts[key] += value
+
+    with _mapper(workers, state) as imap:
+        for result in imap(customers_task, _tasks(seed, customers, (cust_base, veh_base, k))):
+            absorb(result, "customers")
+            say(f"clientes: {counts['customers']}/{customers}, vehículos: {counts['vehicles']}")
+        # las cotizaciones referencian clientes/vehículos: empiezan cuando todos están escritos
+        extra = (q_base, cust_base, customers, veh_base, k, days)
+        for result in imap(quotations_task, _tasks(seed, quotations, extra)):
+            absorb(result, "quotations")
+            say(f"cotizaciones: {counts['quotations']}/{quotations}, órdenes: {counts['workorders']}")
+
+    _reset_sequences(connection, [Customer, Vehicle, Quotation, WorkOrder])
+    return {"counts": counts, "elapsed": time.monotonic() - started, "parallel_writes": parallel}
+
+
+def _reset_sequences(connection, models):
+    """Con ids explícitos, los backends con secuencias (PostgreSQL/Oracle) deben reajustarlas."""
+    from django.core.management.color import no_style
+
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
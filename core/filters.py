@@ -0,0 +1,31 @@
+# core/filters.py
+from django.db.models import Case, IntegerField, Value, When
+from rest_framework import filters
+
+from . import search
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """
+    ?search= sobre el índice de core.search cuando la vista define `search_index`
+    (search.QUOTATION / search.WORKORDER); si no, SearchFilter normal con search_fields.
+    Resultados por relevancia, salvo que se pida ?ordering= explícito.
+    Ponerlo después de OrderingFilter en filter_backends para que el orden por
+    relevancia no se pierda con el ordering por defecto de la vista.
+    """
+    max_results = 200
+
+    def filter_queryset(self, request, queryset, view):
+        kind = getattr(view, "search_index", None)
+        terms = self.get_search_terms(request)
+        if kind is None or not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        ids = [pk for pk, _ in search.search(kind, " ".join(terms), limit=self.max_results)]
+        if not ids:
+            return queryset.none()
+        queryset = queryset.filter(pk__in=ids)
+        if request.query_params.get("ordering"):
+            return queryset
+        rank = Case(*[When(pk=pk, then=Value(i)) for i, pk in enumerate(ids)], output_field=IntegerField())
+        return queryset.annotate(search_rank=rank).order_by("search_rank")
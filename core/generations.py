@@ -0,0 +1,27 @@
+# core/generations.py
+"""
+Contadores de generación para invalidar cachés en memoria entre procesos.
+
+El que modifica datos llama bump("catalog") (1 UPDATE atómico, dentro de su transacción);
+los lectores llaman current("catalog") de vez en cuando y recargan si cambió.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import CacheGeneration
+
+
+def current(name: str) -> int:
+    value = CacheGeneration.objects.filter(name=name).values_list("value", flat=True).first()
+    return value or 0
+
+
+def bump(name: str) -> None:
+    if CacheGeneration.objects.filter(name=name).update(value=F("value") + 1):
+        return
+    try:
+        with transaction.atomic():
+            CacheGeneration.objects.create(name=name, value=1)
+    except IntegrityError:
+        # otro proceso la creó entre el UPDATE y el INSERT
+        CacheGeneration.objects.filter(name=name).update(value=F("value") + 1)
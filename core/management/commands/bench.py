@@ -0,0 +1,83 @@
+# core/management/commands/bench.py
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de carga: siembra un dataset sintético (prefijo BENCH), corre una mezcla "
+        "ponderada de endpoints reales con clientes concurrentes y reporta p50/p95/p99, RPS "
+        "y consultas por request. Ver core.bench."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=500, help="Clientes (con vehículo y cotización) del dataset.")
+        parser.add_argument("--clients", type=int, default=8, help="Clientes concurrentes.")
+        parser.add_argument("--duration", type=float, default=30.0, help="Segundos de medición.")
+        parser.add_argument("--requests", type=int, default=None,
+                            help="Total de requests a medir (en vez de --duration).")
+        parser.add_argument("--warmup", type=int, default=5, help="GETs por cliente antes de medir.")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla (dataset y mezcla reproducibles).")
+        parser.add_argument("--url", default=None,
+                            help="Servidor ya levantado (p. ej. http://127.0.0.1:8000); sin esto se usa uno en proceso.")
+        parser.add_argument("--no-seed", action="store_true", help="Usar el dataset BENCH existente tal cual.")
+        parser.add_argument("--output", "-o", default=None, help="Archivo JSON con el resultado.")
+        parser.add_argument("--compare", default=None, help="JSON de una corrida anterior para mostrar diferencias.")
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1:
+            raise CommandError("--clients debe ser al menos 1.")
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"No se pudo leer {options['compare']}: {exc}")
+
+        duration = None if options["requests"] else options["duration"]
+        self.stdout.write(
+            f"▶ {options['clients']} clientes, "
+            + (f"{options['requests']} requests" if options["requests"] else f"{duration:.0f}s")
+            + (f" contra {options['url']}" if options["url"] else " (servidor en proceso)")
+        )
+        try:
+            report = bench.run(
+                size=options["size"], clients=options["clients"], duration=duration,
+                requests=options["requests"], warmup=options["warmup"], seed=options["seed"],
+                url=options["url"], seed_data=not options["no_seed"],
+            )
+        except (RuntimeError, OSError) as exc:
+            raise CommandError(str(exc))
+
+        self._print_report(report)
+        if baseline:
+            self._print_comparison(bench.compare(report, baseline), baseline.get("meta", {}))
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"✔ Resultado guardado en {path}"))
+
+    def _print_report(self, report):
+        header = f"{'endpoint':<18}{'req':>7}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'sql/req':>9}"
+        self.stdout.write(header)
+        self.stdout.write("─" * len(header))
+        rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+        for name, r in rows:
+            lat = r["latency_ms"]
+            queries = "-" if r["db_queries_per_request"] is None else f"{r['db_queries_per_request']:.1f}"
+            self.stdout.write(
+                f"{name:<18}{r['requests']:>7}{r['errors']:>6}{r['rps']:>9.1f}"
+                f"{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}{queries:>9}"
+            )
+        self.stdout.write("(latencias en ms)")
+
+    def _print_comparison(self, rows, base_meta):
+        self.stdout.write(f"\nContra {base_meta.get('commit') or '?'} ({base_meta.get('timestamp') or '?'}):")
+        for name, metric, before, now, change in rows:
+            pct = "" if change is None else f" ({change:+.1f}%)"
+            self.stdout.write(f"  {name:<18}{metric:<11}{before:>10} → {now:<10}{pct}")
@@ -0,0 +1,61 @@
+# core/management/commands/generate_data.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core import datagen
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos realistas (clientes, vehículos, catálogo, cotizaciones con "
+        "renglones y órdenes de trabajo) con bulk_create por lotes, semilla fija y varios "
+        "procesos. Ver core.datagen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, required=True, help="Clientes a crear.")
+        parser.add_argument("--vehicles-per-customer", type=int, default=1, help="Vehículos por cliente.")
+        parser.add_argument("--quotations", type=int, default=0,
+                            help="Cotizaciones (las aprobadas generan su orden de trabajo).")
+        parser.add_argument("--services", type=int, default=200, help="Servicios de catálogo.")
+        parser.add_argument("--parts", type=int, default=2000, help="Partes de catálogo.")
+        parser.add_argument("--seed", type=int, default=42, help="Misma semilla y tamaños = mismos datos.")
+        parser.add_argument("--workers", type=int, default=None, help="Procesos generadores (por defecto, CPUs).")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Filas por INSERT masivo.")
+        parser.add_argument("--days", type=int, default=730, help="Antigüedad máxima de cotizaciones/órdenes.")
+        parser.add_argument("--skip-index", action="store_true",
+                            help="No reindexar la búsqueda (luego: manage.py rebuild_search_index).")
+
+    def handle(self, *args, **options):
+        for name in ("customers", "vehicles_per_customer", "quotations", "services", "parts"):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} no puede ser negativo.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size debe ser al menos 1.")
+
+        verbose = options["verbosity"] > 1
+        try:
+            result = datagen.generate(
+                customers=options["customers"],
+                vehicles_per_customer=options["vehicles_per_customer"],
+                quotations=options["quotations"],
+                services=options["services"],
+                parts=options["parts"],
+                seed=options["seed"],
+                workers=options["workers"],
+                batch_size=options["batch_size"],
+                days=options["days"],
+                reindex=not options["skip_index"],
+                progress=(lambda msg: self.stdout.write(f"  … {msg}")) if verbose else None,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        counts, elapsed = result["counts"], result["elapsed"]
+        rows = sum(counts.values())
+        mode = "workers escriben en paralelo" if result["parallel_writes"] else "un solo escritor"
+        self.stdout.write(f"Modo: {mode}")
+        for name, value in counts.items():
+            self.stdout.write(f"  {name:<16}{value:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {rows:,} filas en {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} filas/s)."
+        ))
@@ -0,0 +1,40 @@
+# core/management/commands/rebuild_search_index.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el índice de búsqueda (tabla search_token) de cotizaciones y órdenes "
+        "de trabajo. Correr una vez tras migrar y después de cargas masivas hechas fuera del ORM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(search.SOURCES), default=None,
+                            help="Solo este tipo de documento (Q = cotizaciones, WO = órdenes).")
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="Documentos por lote (1 SELECT + DELETE + INSERT masivo).")
+
+    def handle(self, *args, **options):
+        kinds = [options["kind"]] if options["kind"] else list(search.SOURCES)
+        for kind in kinds:
+            started = time.monotonic()
+            model = search.source_model(kind)
+            ids = model.objects.order_by("pk").values_list("pk", flat=True)
+            docs = tokens = 0
+            chunk = []
+            for pk in ids.iterator(chunk_size=options["chunk_size"]):
+                chunk.append(pk)
+                if len(chunk) >= options["chunk_size"]:
+                    tokens += search.reindex(kind, chunk, options["chunk_size"])
+                    docs, chunk = docs + len(chunk), []
+            if chunk:
+                tokens += search.reindex(kind, chunk, options["chunk_size"])
+                docs += len(chunk)
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ {model._meta.verbose_name_plural}: {docs} documentos, {tokens} palabras ({elapsed:.2f}s)."
+            ))
@@ -0,0 +1,110 @@
+# core/middleware.py
+"""
+Métricas por request hacia el log JSON (logger "workshop.requests" -> handler json_file).
+
+Cada request deja una línea con:
+  method, path, route (patrón de URL), view (nombre de la ruta), status,
+  duration_ms, db_queries, db_ms, render_ms, response_bytes
+
+- Consultas y tiempo de BD: connection.execute_wrapper (funciona sin DEBUG).
+- Tiempo de render: desde process_template_response hasta el callback post-render de
+  la respuesta (Response de DRF: renderer JSON/HTML). No se toca ninguna clase de DRF;
+  las respuestas que no se renderizan (HttpResponse, 404 de Django) dan None.
+- Requests más lentos que REQUEST_METRICS_SLOW_MS salen con nivel WARNING.
+
+Settings: REQUEST_METRICS_ENABLED (True), REQUEST_METRICS_SLOW_MS (1000),
+REQUEST_METRICS_SKIP_PREFIXES (("/static/", "/media/")).
+"""
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("workshop.requests")
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("db_queries", "db_time", "render_time", "_render_start")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.render_time = None
+        self._render_start = None
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.db_queries += 1
+
+    def rendered(self, response):
+        # callback post-render: devolver None deja la respuesta tal cual
+        self.render_time = time.perf_counter() - self._render_start
+
+
+def current_metrics():
+    """RequestMetrics del request en curso (o None fuera del middleware)."""
+    return _current.get()
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "REQUEST_METRICS_ENABLED", True)
+        self.slow_ms = getattr(settings, "REQUEST_METRICS_SLOW_MS", 1000)
+        self.skip_prefixes = tuple(getattr(settings, "REQUEST_METRICS_SKIP_PREFIXES", ("/static/", "/media/")))
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.skip_prefixes):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._log(request, response, metrics, duration_ms)
+        return response
+
+    def process_template_response(self, request, response):
+        """Último paso antes de response.render(): de aquí al callback es tiempo de render."""
+        metrics = _current.get()
+        if metrics is not None:
+            metrics._render_start = time.perf_counter()
+            response.add_post_render_callback(metrics.rendered)
+        return response
+
+    def _log(self, request, response, metrics, duration_ms):
+        match = getattr(request, "resolver_match", None)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            # los routers DRF usan regex: sin anclas ("api/parts/" en vez de "^api/parts/$")
+            "route": match.route.replace("^", "").replace("$", "") if match else None,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "db_queries": metrics.db_queries,
+            "db_ms": round(metrics.db_time * 1000, 2),
+            "render_ms": None if metrics.render_time is None else round(metrics.render_time * 1000, 2),
+            "response_bytes": None if response.streaming else len(response.content),
+        }
+        level = logging.WARNING if duration_ms >= self.slow_ms else logging.INFO
+        logger.log(
+            level, "%s %s %s %.1fms", request.method, fields["view"] or request.path,
+            response.status_code, duration_ms, extra={"metrics": fields},
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=10)),
+                ('year', models.PositiveIntegerField()),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'document_sequence',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='documentsequence',
+            constraint=models.UniqueConstraint(fields=('prefix', 'year'), name='docseq_prefix_year_uniq'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Siembra los contadores de DocumentSequence con los números ya emitidos,
+# para que la numeración nueva continúe donde quedó la anterior (sin choques).
+import re
+
+from django.db import migrations
+
+SERIES = [
+    # (app_label, model, prefijo)
+    ("quotes", "Quotation", "Q"),
+    ("workorders", "WorkOrder", "OT"),
+]
+
+
+def seed_sequences(apps, schema_editor):
+    DocumentSequence = apps.get_model("core", "DocumentSequence")
+    for app_label, model_name, prefix in SERIES:
+        Model = apps.get_model(app_label, model_name)
+        pattern = re.compile(rf"^{re.escape(prefix)}-(\d{{4}})-(\d+)$")
+        highest = {}
+        for number in Model.objects.filter(number__startswith=f"{prefix}-").values_list("number", flat=True).iterator():
+            m = pattern.match(number or "")
+            if m:
+                year, seq = int(m.group(1)), int(m.group(2))
+                highest[year] = max(highest.get(year, 0), seq)
+        for year, seq in highest.items():
+            row, _ = DocumentSequence.objects.get_or_create(prefix=prefix, year=year)
+            if row.last_value < seq:
+                row.last_value = seq
+                row.save(update_fields=["last_value"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('quotes', '0002_quotation_q_subtot_services_gte_0_and_more'),
+        ('workorders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_seed_document_sequences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=4)),
+                ('object_id', models.BigIntegerField()),
+                ('token', models.CharField(max_length=40)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                'db_table': 'search_token',
+                'indexes': [models.Index(fields=['kind', 'token', 'object_id'], name='searchtoken_lookup_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchtoken',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'token'), name='searchtoken_doc_token_uniq'),
+        ),
+    ]
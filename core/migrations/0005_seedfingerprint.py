@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeedFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'seed_fingerprint',
+            },
+        ),
+    ]
@@ -1,3 +1,80 @@
 # core/models.py
-# Intencionalmente vacío.
-# Los modelos viven en sus apps: customers, vehicles, catalog, workorders.
+# Los modelos de dominio viven en sus apps: customers, vehicles, catalog, workorders, quotes.
+# Aquí solo hay infraestructura compartida entre apps.
+from django.db import models
+
+
+class DocumentSequence(models.Model):
+    """
+    Contador por serie (prefijo + año) para numerar documentos (Q-2025-0001, OT-2025-000001...).
+    Se incrementa con UPDATE ... SET last_value = last_value + n (bloqueo de fila),
+    ver core.sequences.
+    """
+    prefix = models.CharField(max_length=10)
+    year = models.PositiveIntegerField()
+    last_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "document_sequence"
+        constraints = [
+            models.UniqueConstraint(fields=["prefix", "year"], name="docseq_prefix_year_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.last_value}"
+
+
+class SearchToken(models.Model):
+    """
+    Índice invertido de búsqueda: una fila por (tipo de documento, documento, palabra).
+    Lo mantiene core.search; no se edita a mano.
+    """
+    kind = models.CharField(max_length=4)          # "Q" cotización, "WO" orden de trabajo
+    object_id = models.BigIntegerField()
+    token = models.CharField(max_length=40)        # normalizado: minúsculas, sin acentos
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        db_table = "search_token"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", "token"], name="searchtoken_doc_token_uniq"),
+        ]
+        indexes = [
+            # búsqueda por prefijo: WHERE kind = ? AND token >= ? AND token < ?
+            models.Index(fields=["kind", "token", "object_id"], name="searchtoken_lookup_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.token}"
+
+
+class CacheGeneration(models.Model):
+    """
+    Número de generación por caché en memoria (p.ej. "catalog"): se incrementa cada vez
+    que cambian los datos de origen; cada proceso compara el suyo y recarga si quedó atrás.
+    Ver core.generations.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "cache_generation"
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class SeedFingerprint(models.Model):
+    """
+    Huella (sha256) del último estado sembrado por nombre (p.ej. "rbac"): si al migrar
+    la huella calculada coincide, la siembra se omite. Ver core.rbac.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "seed_fingerprint"
+
+    def __str__(self):
+        return f"{self.name}: {self.value[:12]}"
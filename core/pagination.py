@@ -1,7 +1,237 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class FlexiblePageNumberPagination(PageNumberPagination):
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 100
-    page_query_param = "page"
\ No newline at end of file
+    page_query_param = "page"
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre un orden compuesto, p.ej. (-created_at, -id):
+    cada página es `WHERE (orden) > (último visto) ... LIMIT n`, sin COUNT ni OFFSET,
+    así la página N cuesta lo mismo que la 1.
+
+    El orden sale de `view.keyset_ordering` o del Meta.ordering del modelo, y siempre
+    se le agrega el pk como desempate (cursor estable aunque haya fechas repetidas).
+    El cliente no puede cambiarlo: `?ordering=` (OrderingFilter) junto con cursor es 400.
+    `?with_count=1` agrega "count" (un COUNT(*) extra) para quien lo necesite.
+    """
+    page_size = api_settings.PAGE_SIZE or 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    invalid_cursor_message = "Cursor inválido."
+    ordering_not_supported_message = (
+        "No se puede combinar con paginación por cursor: el orden es fijo (el del endpoint)."
+    )
+
+    # ---------- orden ----------
+    def get_ordering(self, queryset, view):
+        model = queryset.model
+        ordering = list(getattr(view, "keyset_ordering", None) or model._meta.ordering or ["-pk"])
+        names = []
+        for term in ordering:
+            if not isinstance(term, str):
+                return ["-pk"]  # expresiones (F().desc()...) no sirven para keyset
+            name = term.lstrip("-")
+            if name in ("pk", model._meta.pk.name):
+                names.append("-pk" if term.startswith("-") else "pk")
+                break
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return ["-pk"]
+            if field.null:
+                return ["-pk"]  # con NULLs la comparación por tupla no es confiable
+            names.append(term)
+        if names[-1].lstrip("-") != "pk":
+            names.append("-pk" if names[0].startswith("-") else "pk")
+        return names
+
+    # ---------- cursor ----------
+    def encode_cursor(self, values, reverse):
+        raw = json.dumps({"v": [v.isoformat() if isinstance(v, (datetime.date, datetime.time)) else v
+                                for v in values], "r": int(reverse)}, default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, model, ordering):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            raw_values, reverse = data["v"], bool(data.get("r"))
+            if len(raw_values) != len(ordering):
+                raise ValueError
+            values = [self._field(model, term).to_python(v) for term, v in zip(ordering, raw_values)]
+        except (TypeError, ValueError, KeyError, ValidationError, json.JSONDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    @staticmethod
+    def _field(model, term):
+        name = term.lstrip("-")
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    @staticmethod
+    def _value(obj, term):
+        name = term.lstrip("-")
+        return obj.pk if name == "pk" else getattr(obj, obj._meta.get_field(name).attname)
+
+    @staticmethod
+    def _after(ordering, values):
+        """(a, b, c) posterior a (va, vb, vc) según la dirección de cada campo."""
+        cond = Q()
+        for i, term in enumerate(ordering):
+            name = term.lstrip("-")
+            lookup = f"{name}__lt" if term.startswith("-") else f"{name}__gt"
+            eq = {t.lstrip("-"): v for t, v in zip(ordering[:i], values[:i])}
+            cond |= Q(**eq, **{lookup: values[i]})
+        return cond
+
+    @staticmethod
+    def _flip(ordering):
+        return [t[1:] if t.startswith("-") else f"-{t}" for t in ordering]
+
+    # ---------- paginación ----------
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            # el keyset necesita su propio orden; ignorarlo devolvería otro orden sin avisar
+            raise DRFValidationError({api_settings.ORDERING_PARAM: self.ordering_not_supported_message})
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset, view)
+        self.page_size_value = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, queryset.model, self.ordering)
+
+        self.count = queryset.count() if request.query_params.get(self.count_query_param) in ("1", "true") else None
+
+        ordering = self._flip(self.ordering) if reverse else self.ordering
+        qs = queryset.order_by(*ordering)
+        if values is not None:
+            qs = qs.filter(self._after(ordering, values))
+        rows = list(qs[: self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+        self.page = rows
+        return rows
+
+    def _link(self, obj, reverse):
+        values = [self._value(obj, t) for t in self.ordering]
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(values, reverse))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["previous"] = self.get_previous_link()
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "description": f"Solo con ?{self.count_query_param}=1"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {"name": self.cursor_query_param, "required": False, "in": "query",
+             "description": f"Cursor de la página (viene en next/previous). Orden fijo: no admite "
+                            f"?{api_settings.ORDERING_PARAM}= (400).", "schema": {"type": "string"}},
+            {"name": self.page_size_query_param, "required": False, "in": "query",
+             "description": "Tamaño de página.", "schema": {"type": "integer"}},
+            {"name": self.count_query_param, "required": False, "in": "query",
+             "description": "1 = incluir el total (COUNT extra).", "schema": {"type": "integer"}},
+        ]
+
+
+class OptInKeysetPagination(KeysetPagination):
+    """
+    Paginación por cursor solo si el cliente la pide (`?pagination=cursor` o trae `?cursor=`);
+    si no, se comporta como `fallback_class` (None = lista completa, como hasta ahora).
+    """
+    mode_query_param = "pagination"
+    fallback_class = None
+
+    def _wants_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._fallback = None
+        if self._wants_keyset(request):
+            return super().paginate_queryset(queryset, request, view)
+        if self.fallback_class is None:
+            return None
+        self._fallback = self.fallback_class()
+        return self._fallback.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self._fallback is not None:
+            return self._fallback.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        params = [{"name": self.mode_query_param, "required": False, "in": "query",
+                   "description": "cursor = paginación por cursor (sin COUNT/OFFSET).",
+                   "schema": {"type": "string", "enum": ["cursor"]}}]
+        params += super().get_schema_operation_parameters(view)
+        if self.fallback_class is not None:
+            params += self.fallback_class().get_schema_operation_parameters(view)
+        return params
+
+
+class KeysetOrPageNumberPagination(OptInKeysetPagination):
+    """Por defecto PageNumberPagination (PAGE_SIZE de settings); cursor a pedido."""
+    fallback_class = PageNumberPagination
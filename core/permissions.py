@@ -2,6 +2,8 @@
 from typing import Iterable
 from rest_framework import permissions
 
+from . import roles
+
 ALLOWED_WRITE_GROUPS = {"Admin", "Asesor"}
 
 def _user_in_any_group(user, groups: Iterable[str]) -> bool:
@@ -9,11 +11,8 @@ def _user_in_any_group(user, groups: Iterable[str]) -> bool:
         return False
     if user.is_superuser or user.is_staff:
         return True
-    try:
-        user_groups = set(user.groups.values_list("name", flat=True))
-    except Exception:
-        return False
-    return bool(user_groups & set(groups))
+    # grupos desde caché (core.roles): sin consulta en el camino caliente
+    return roles.user_in_any_group(user, groups)
 
 class ReadOnlyIfAuthenticated(permissions.BasePermission):
     """Sólo lectura para usuarios autenticados."""
@@ -44,7 +43,7 @@ class HasDjangoPermission(permissions.BasePermission):
             return False
         if not self.perm_codename:
             return True
-        return user.has_perm(self.perm_codename)
+        return roles.user_has_perm(user, self.perm_codename)
 
 class CanSendQuotation(HasDjangoPermission):
     perm_codename = "quotes.send_quotation"
@@ -0,0 +1,88 @@
+# core/query_budget.py
+"""
+Presupuesto de consultas SQL para tests (contra regresiones N+1).
+
+    with query_budget(3, label="GET /api/quotations/"):
+        client.get("/api/quotations/")
+
+    @query_budget(2)
+    def test_algo(): ...
+
+Si se pasa, falla con QueryBudgetExceeded (AssertionError) listando las huellas
+SQL (literales -> ?, listas IN colapsadas) con cuántas veces se repitió cada una;
+un N+1 aparece como "12× SELECT ... WHERE id = ?".
+
+Los ViewSets declaran su presupuesto por acción en `query_budgets`
+(p.ej. {"list": 1, "retrieve": 1}); debe valer sin importar cuántas filas
+devuelva la lista (ver tests/test_query_budgets.py).
+"""
+import re
+from collections import Counter
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+MAX_FINGERPRINTS_REPORTED = 10
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Más consultas de las presupuestadas."""
+
+
+def fingerprint(sql: str) -> str:
+    """SQL normalizado: consultas que solo difieren en literales comparten huella."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def summarize(queries) -> list:
+    """[(veces, huella)] de más a menos repetida."""
+    counts = Counter(fingerprint(q["sql"]) for q in queries)
+    return sorted(((n, fp) for fp, n in counts.items()), key=lambda item: (-item[0], item[1]))
+
+
+def declared_budget(viewset, action: str):
+    """Presupuesto declarado por el ViewSet para `action` (o None)."""
+    return (getattr(viewset, "query_budgets", None) or {}).get(action)
+
+
+class query_budget(ContextDecorator):
+    def __init__(self, max_queries: int, using: str = DEFAULT_DB_ALIAS, label: str = ""):
+        self.max_queries = max_queries
+        self.using = using
+        self.label = label
+        self._capture = None
+
+    def __enter__(self):
+        self._capture = CaptureQueriesContext(connections[self.using])
+        self._capture.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._capture.__exit__(exc_type, exc, tb)
+        if exc_type is None and len(self) > self.max_queries:
+            raise QueryBudgetExceeded(self.report())
+        return False
+
+    def __len__(self):
+        return len(self._capture.captured_queries) if self._capture else 0
+
+    @property
+    def captured_queries(self) -> list:
+        return self._capture.captured_queries if self._capture else []
+
+    def report(self) -> str:
+        title = f" ({self.label})" if self.label else ""
+        lines = [f"Presupuesto de consultas excedido{title}: {len(self)} > {self.max_queries}"]
+        summary = summarize(self.captured_queries)
+        lines += [f"  {n}× {fp}" for n, fp in summary[:MAX_FINGERPRINTS_REPORTED]]
+        if len(summary) > MAX_FINGERPRINTS_REPORTED:
+            lines.append(f"  ... {len(summary) - MAX_FINGERPRINTS_REPORTED} huellas más")
+        return "\n".join(lines)
@@ -0,0 +1,212 @@
+# core/rbac.py
+"""
+Siembra de roles (grupos Admin / Asesor / Mecanico) y sus permisos: único punto.
+
+- ROLE_PERMS declara el estado deseado rol -> permisos ("app_label.codename").
+- sync_roles() lo lleva a la BD con consultas masivas: 1 SELECT de permisos,
+  1 SELECT de grupos, 1 SELECT de la tabla intermedia grupo-permiso y luego
+  solo los INSERT/DELETE de la diferencia.
+- La huella (sha256 de los ids deseados por rol) se guarda en SeedFingerprint;
+  al migrar, si coincide, no se toca nada más.
+- Se ejecuta una vez por `migrate` (post_migrate de la última app) y desde los
+  comandos seed_roles / bootstrap_roles (que fuerzan el diff).
+
+Los usuarios demo (admin_test, asesor_test, mecanico_test) solo se crean si no
+existen; la contraseña se hashea una sola vez, al crearlos. DISABLE_USER_SEED
+(setting o variable de entorno "1") los omite.
+"""
+import hashlib
+import json
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+FINGERPRINT_NAME = "rbac"
+BATCH_SIZE = 500  # filas por INSERT/DELETE (límite de parámetros de SQL Server)
+
+CRUD = ("add", "change", "delete", "view")
+ALL = "__all__"
+
+# Permisos finos que no vienen de Meta.permissions: se crean si faltan
+EXTRA_PERMS = {
+    "quotes.quotation": (
+        ("send_quotation", "Puede enviar cotización"),
+        ("approve_quotation", "Puede aprobar cotización"),
+        ("reject_quotation", "Puede rechazar cotización"),
+        ("convert_quotation_to_workorder", "Puede convertir cotización a orden de trabajo"),
+    ),
+}
+QUOTE_ACTION_PERMS = frozenset(f"quotes.{codename}" for codename, _ in EXTRA_PERMS["quotes.quotation"])
+
+
+def model_perms(*model_labels, actions=CRUD) -> frozenset:
+    """model_perms("catalog.part", actions=("view",)) -> {"catalog.view_part"}"""
+    out = set()
+    for label in model_labels:
+        app_label, model = label.split(".")
+        out.update(f"{app_label}.{action}_{model}" for action in actions)
+    return frozenset(out)
+
+
+ROLE_PERMS = {
+    "Admin": ALL,
+    # Asesor: opera todo el flujo de recepción, catálogo, cotizaciones y OT
+    "Asesor": (
+        model_perms(
+            "customers.customer", "vehicles.vehicle", "catalog.service", "catalog.part",
+            "workorders.workorder", "workorders.workorderservice", "workorders.workorderpart",
+            "workorders.worklog", "quotes.quotationservice", "quotes.quotationpart",
+        )
+        | model_perms("quotes.quotation", actions=("add", "change", "view"))
+        | QUOTE_ACTION_PERMS
+    ),
+    # Mecánico: consulta todo, actualiza la OT (no crea ni borra) y lleva sus bitácoras
+    # (workorders.worklog aún no tiene modelo: se aplica en cuanto exista el permiso)
+    "Mecanico": (
+        model_perms(
+            "customers.customer", "vehicles.vehicle", "catalog.service", "catalog.part",
+            "quotes.quotation", "workorders.workorderservice", "workorders.workorderpart",
+            actions=("view",),
+        )
+        | model_perms("workorders.workorder", actions=("view", "change"))
+        | model_perms("workorders.worklog", actions=("add", "change", "view"))
+    ),
+}
+
+DEMO_USERS = (
+    # username, contraseña, grupo, superusuario
+    ("admin_test", "admin123", "Admin", True),
+    ("asesor_test", "asesor123", "Asesor", False),
+    ("mecanico_test", "mecanico123", "Mecanico", False),
+)
+
+
+def _ensure_extra_perms():
+    for label, perms in EXTRA_PERMS.items():
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        ct = ContentType.objects.get_for_model(model)
+        existing = set(Permission.objects.filter(content_type=ct).values_list("codename", flat=True))
+        missing = [Permission(content_type=ct, codename=c, name=n) for c, n in perms if c not in existing]
+        if missing:
+            Permission.objects.bulk_create(missing)
+
+
+def desired_state():
+    """({rol: {permission_id}}, huella). Permisos aún inexistentes se omiten."""
+    ids_by_key = {
+        f"{app_label}.{codename}": pk
+        for pk, app_label, codename in Permission.objects.values_list("id", "content_type__app_label", "codename")
+    }
+    desired = {}
+    for role, perms in ROLE_PERMS.items():
+        if perms == ALL:
+            desired[role] = set(ids_by_key.values())
+        else:
+            desired[role] = {ids_by_key[p] for p in perms if p in ids_by_key}
+    payload = json.dumps({role: sorted(ids) for role, ids in desired.items()}, sort_keys=True)
+    return desired, hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _group_ids(names) -> dict:
+    ids = dict(Group.objects.filter(name__in=names).values_list("name", "id"))
+    missing = [n for n in names if n not in ids]
+    if missing:
+        Group.objects.bulk_create([Group(name=n) for n in missing])
+        ids = dict(Group.objects.filter(name__in=names).values_list("name", "id"))
+    return ids, missing
+
+
+def sync_roles(force: bool = False) -> dict:
+    """
+    Deja grupos y permisos como ROLE_PERMS. Sin `force`, no hace nada si la huella
+    guardada coincide. Devuelve un resumen (skipped, groups_created, added, removed).
+    """
+    from . import roles
+    from .models import SeedFingerprint
+
+    with transaction.atomic():
+        _ensure_extra_perms()
+        desired, fingerprint = desired_state()
+        stored = SeedFingerprint.objects.filter(name=FINGERPRINT_NAME).values_list("value", flat=True).first()
+        if not force and stored == fingerprint:
+            return {"skipped": True, "groups_created": [], "added": 0, "removed": 0}
+
+        group_ids, created = _group_ids(list(desired))
+        through = Group.permissions.through
+        current = set(
+            through.objects.filter(group_id__in=group_ids.values()).values_list("group_id", "permission_id")
+        )
+        wanted = {(group_ids[role], pid) for role, pids in desired.items() for pid in pids}
+        to_add = sorted(wanted - current)
+        to_remove = {}
+        for gid, pid in current - wanted:
+            to_remove.setdefault(gid, []).append(pid)
+
+        through.objects.bulk_create(
+            [through(group_id=gid, permission_id=pid) for gid, pid in to_add], batch_size=BATCH_SIZE
+        )
+        for gid, pids in to_remove.items():
+            for start in range(0, len(pids), BATCH_SIZE):
+                through.objects.filter(group_id=gid, permission_id__in=pids[start:start + BATCH_SIZE]).delete()
+
+        SeedFingerprint.objects.update_or_create(name=FINGERPRINT_NAME, defaults={"value": fingerprint})
+        removed = sum(len(p) for p in to_remove.values())
+        if created or to_add or removed:
+            # escrituras masivas: sin señales m2m, se invalida la caché de roles a mano
+            roles.bump()
+    return {"skipped": False, "groups_created": created, "added": len(to_add), "removed": removed}
+
+
+def user_seed_disabled() -> bool:
+    return getattr(settings, "DISABLE_USER_SEED", False) or os.environ.get("DISABLE_USER_SEED") == "1"
+
+
+def ensure_demo_users() -> list:
+    """Crea los usuarios demo que falten (y su grupo). Los existentes no se tocan."""
+    if user_seed_disabled():
+        return []
+    User = get_user_model()
+    existing = set(User.objects.filter(username__in=[u[0] for u in DEMO_USERS]).values_list("username", flat=True))
+    missing = [u for u in DEMO_USERS if u[0] not in existing]
+    if not missing:
+        return []
+    group_ids, _ = _group_ids([u[2] for u in missing])
+    created = []
+    for username, password, group, superuser in missing:
+        user = User.objects.create(
+            username=username, password=make_password(password),
+            is_staff=superuser, is_superuser=superuser,
+        )
+        user.groups.add(group_ids[group])
+        created.append(username)
+    return created
+
+
+def _is_last_app(sender) -> bool:
+    # post_migrate se emite una vez por app con modelos; la siembra va en la última,
+    # cuando ya existen todos los ContentType/Permission
+    configs = [c for c in apps.get_app_configs() if c.models_module is not None]
+    return bool(configs) and sender.label == configs[-1].label
+
+
+def seed_on_migrate(sender, verbosity=1, **kwargs):
+    if not _is_last_app(sender):
+        return
+    summary = sync_roles()
+    users = ensure_demo_users()
+    if verbosity >= 1 and not summary["skipped"]:
+        print(
+            f"✔ Roles: {summary['added']} permisos asignados, {summary['removed']} retirados"
+            + (f"; grupos creados: {', '.join(summary['groups_created'])}" if summary["groups_created"] else "")
+        )
+    if verbosity >= 1 and users:
+        print(f"👤 Usuarios demo creados: {', '.join(users)}")
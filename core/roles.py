@@ -0,0 +1,162 @@
+# core/roles.py
+"""
+Resolución de roles (grupos) y permisos por usuario, con caché.
+
+- Por request: el resultado queda en el objeto user (`_roles_cache`).
+- Entre requests: mapa en memoria del proceso user_id -> Roles.
+- Invalidación: cualquier cambio de membresías o permisos (m2m_changed de
+  User.groups, User.user_permissions, Group.permissions; alta/baja/renombre de
+  Group o Permission; cambios de cuenta de un User) incrementa la generación
+  "rbac" (core.generations) y vacía el mapa local. Los demás procesos la consultan a lo sumo cada
+  RBAC_CACHE_CHECK_INTERVAL segundos.
+
+Así, en el camino caliente, autorizar no cuesta consultas.
+is_superuser / is_staff / is_active no se cachean: se leen del user del request.
+"""
+import threading
+import time
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+
+from . import generations
+
+GENERATION = "rbac"
+ATTR = "_roles_cache"
+
+
+class Roles(NamedTuple):
+    groups: frozenset   # nombres de grupo
+    perms: frozenset    # "app_label.codename" (propios + de sus grupos)
+
+
+EMPTY = Roles(frozenset(), frozenset())
+
+
+class RoleCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # user_id -> (username, Roles)
+        self._generation = None
+        self._checked_at = 0.0
+
+    @property
+    def check_interval(self) -> float:
+        return getattr(settings, "RBAC_CACHE_CHECK_INTERVAL", 2.0)
+
+    @property
+    def maxsize(self) -> int:
+        return getattr(settings, "RBAC_CACHE_SIZE", 10000)
+
+    def _check_generation(self):
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.check_interval:
+            return
+        generation = generations.current(GENERATION)
+        with self._lock:
+            self._checked_at = now
+            if generation != self._generation:
+                self._data.clear()
+                self._generation = generation
+
+    def get(self, user) -> Roles:
+        self._check_generation()
+        cached = self._data.get(user.pk)
+        # el username evita servir datos de un id reutilizado
+        if cached is not None and cached[0] == user.get_username():
+            return cached[1]
+        roles = _load(user)
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                self._data.clear()
+            self._data[user.pk] = (user.get_username(), roles)
+        return roles
+
+    @property
+    def generation(self) -> int:
+        self._check_generation()
+        return self._generation
+
+    def invalidate(self):
+        with self._lock:
+            self._data.clear()
+            self._generation = None
+
+
+def _load(user) -> Roles:
+    from django.contrib.auth.models import Permission
+    from django.db.models import Q
+
+    groups = frozenset(user.groups.values_list("name", flat=True))
+    perms = Permission.objects.filter(Q(user=user) | Q(group__user=user)).values_list(
+        "content_type__app_label", "codename"
+    ).distinct()
+    return Roles(groups, frozenset(f"{app}.{codename}" for app, codename in perms))
+
+
+cache = RoleCache()
+
+
+def resolve(user) -> Roles:
+    """Grupos y permisos de `user` (vacío para anónimos)."""
+    if user is None or not user.is_authenticated:
+        return EMPTY
+    roles = getattr(user, ATTR, None)
+    if roles is None:
+        roles = cache.get(user)
+        setattr(user, ATTR, roles)
+    return roles
+
+
+def version() -> int:
+    """Generación actual de roles/permisos (cambia con cualquier reasignación)."""
+    return cache.generation or 0
+
+
+def user_in_any_group(user, groups: Iterable[str]) -> bool:
+    return not resolve(user).groups.isdisjoint(groups)
+
+
+def user_has_perm(user, perm: str) -> bool:
+    if user is None or not user.is_authenticated or not user.is_active:
+        return False
+    return user.is_superuser or perm in resolve(user).perms
+
+
+def bump():
+    """Marca roles/permisos como cambiados para todos los procesos."""
+    generations.bump(GENERATION)
+    cache.invalidate()
+
+
+def on_rbac_changed(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    action = kwargs.get("action")
+    if action is not None and not action.startswith("post_"):
+        return
+    bump()
+
+
+def on_user_changed(sender, created=False, update_fields=None, **kwargs):
+    """Cambios de cuenta (activo, staff, contraseña...) revocan los claims de rol emitidos."""
+    if kwargs.get("raw") or created:
+        return
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    bump()
+
+
+def connect_signals():
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group, Permission
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    User = get_user_model()
+    for through in (User.groups.through, User.user_permissions.through, Group.permissions.through):
+        m2m_changed.connect(on_rbac_changed, sender=through, dispatch_uid=f"rbac-m2m-{through.__name__}")
+    for model in (Group, Permission):
+        post_save.connect(on_rbac_changed, sender=model, dispatch_uid=f"rbac-save-{model.__name__}")
+        post_delete.connect(on_rbac_changed, sender=model, dispatch_uid=f"rbac-delete-{model.__name__}")
+    post_save.connect(on_user_changed, sender=User, dispatch_uid="rbac-save-user")
+    post_delete.connect(on_user_changed, sender=User, dispatch_uid="rbac-delete-user")
@@ -0,0 +1,216 @@
+# core/search.py
+"""
+Índice de búsqueda de mostrador (cotizaciones y órdenes de trabajo).
+
+Índice invertido propio en la tabla `search_token` (ver core.models.SearchToken):
+una fila por (tipo, documento, palabra normalizada). Buscar "abc 12" es
+    token LIKE 'abc%'   OR   token LIKE '12%'
+(`token__startswith`) sobre el índice (kind, token): búsqueda por prefijo anclado,
+nunca LIKE '%...%', igual en SQLite y SQL Server, con ranking por campo
+(número/placa/VIN pesan más que notas).
+
+El índice se mantiene con señales (alta/cambio/baja de documentos, cambio de nombre
+de cliente o de placa/VIN) y se reconstruye con `manage.py rebuild_search_index`.
+"""
+import re
+import unicodedata
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+
+QUOTATION = "Q"
+WORKORDER = "WO"
+
+# peso por campo; los identificadores además se indexan compactos ("ABC-123" -> "abc123")
+ID_WEIGHT, NAME_WEIGHT, TEXT_WEIGHT = 3, 2, 1
+SOURCES = {
+    QUOTATION: ("quotes.Quotation", {
+        "number": ID_WEIGHT, "vehicle__plate": ID_WEIGHT, "vehicle__vin": ID_WEIGHT,
+        "customer__name": NAME_WEIGHT, "notes": TEXT_WEIGHT,
+    }),
+    WORKORDER: ("workorders.WorkOrder", {
+        "number": ID_WEIGHT, "vehicle__plate": ID_WEIGHT, "vehicle__vin": ID_WEIGHT,
+        "customer__name": NAME_WEIGHT, "complaint": TEXT_WEIGHT, "diagnosis": TEXT_WEIGHT,
+    }),
+}
+# campos propios del documento que, si cambian, obligan a reindexar
+_LOCAL_FIELDS = {
+    kind: {path.split("__")[0] for path in fields} for kind, (_, fields) in SOURCES.items()
+}
+
+MIN_TOKEN = 2
+MAX_TOKEN = 40
+MAX_QUERY_TERMS = 8
+_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+# ----------------- normalización -----------------
+
+def normalize(text) -> str:
+    """Minúsculas, sin acentos (José -> jose)."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text) -> set:
+    return {t[:MAX_TOKEN] for t in _SPLIT.split(normalize(text)) if len(t) >= MIN_TOKEN}
+
+
+def _identifier_tokens(text) -> set:
+    tokens = tokenize(text)
+    compact = _SPLIT.sub("", normalize(text))[:MAX_TOKEN]
+    if len(compact) >= MIN_TOKEN:
+        tokens.add(compact)
+    return tokens
+
+
+def source_model(kind):
+    return apps.get_model(SOURCES[kind][0])
+
+
+# ----------------- mantenimiento -----------------
+
+def document_tokens(kind, ids) -> dict:
+    """{id: {token: peso}} leyendo solo las columnas indexadas (1 SELECT)."""
+    _, fields = SOURCES[kind]
+    paths = list(fields)
+    out = {}
+    for row in source_model(kind).objects.filter(pk__in=ids).values_list("pk", *paths):
+        tokens = {}
+        for path, value in zip(paths, row[1:]):
+            weight = fields[path]
+            found = _identifier_tokens(value) if weight == ID_WEIGHT else tokenize(value)
+            for tok in found:
+                tokens[tok] = max(tokens.get(tok, 0), weight)
+        out[row[0]] = tokens
+    return out
+
+
+def reindex(kind, ids, chunk_size: int = 500) -> int:
+    """Reemplaza las filas del índice de esos documentos (DELETE + INSERT masivo por lote)."""
+    from core.models import SearchToken
+
+    ids = list(ids)
+    written = 0
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        docs = document_tokens(kind, chunk)
+        rows = [
+            SearchToken(kind=kind, object_id=pk, token=tok, weight=w)
+            for pk, tokens in docs.items() for tok, w in tokens.items()
+        ]
+        with transaction.atomic():
+            SearchToken.objects.filter(kind=kind, object_id__in=chunk).delete()
+            SearchToken.objects.bulk_create(rows, batch_size=1000)
+        written += len(rows)
+    return written
+
+
+def unindex(kind, ids):
+    from core.models import SearchToken
+    SearchToken.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+# ----------------- consulta -----------------
+
+def _prefix(token) -> Q:
+    """
+    token LIKE 'abc%'; SQL Server lo resuelve con un seek sobre el índice. No se arma el
+    rango [abc, abd) a mano: el "siguiente carácter" depende de la collation.
+    """
+    return Q(token__startswith=token)
+
+
+def search(kind, query, limit: int = 200) -> list:
+    """
+    [(id, score)] ordenado por relevancia. Todas las palabras de la búsqueda deben
+    aparecer (como prefijo) en el documento; coincidencia exacta puntúa doble.
+    """
+    from core.models import SearchToken
+
+    terms = sorted(tokenize(query), key=len, reverse=True)[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    matches = [_prefix(t) for t in terms]
+    per_term = {
+        f"m{i}": Max(Case(
+            When(token=t, then=F("weight") * 2),
+            When(cond, then=F("weight")),
+            default=Value(0), output_field=IntegerField(),
+        ))
+        for i, (t, cond) in enumerate(zip(terms, matches))
+    }
+    qs = (
+        SearchToken.objects.filter(kind=kind).filter(reduce(or_, matches))
+        .values("object_id")
+        .annotate(**per_term)
+        .filter(**{f"{name}__gt": 0 for name in per_term})
+        .annotate(score=sum((F(name) for name in per_term), Value(0)))
+        .order_by("-score", "-object_id")
+        .values_list("object_id", "score")
+    )
+    return list(qs[:limit])
+
+
+# ----------------- señales -----------------
+
+def _kind_of(sender):
+    for kind, (label, _) in SOURCES.items():
+        if sender._meta.label == label:
+            return kind
+    return None
+
+
+def _on_document_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    kind = _kind_of(sender)
+    if raw or kind is None:
+        return
+    if update_fields is not None and not (set(update_fields) & _LOCAL_FIELDS[kind]):
+        return  # p.ej. store_totals(): no toca nada indexado
+    reindex(kind, [instance.pk])
+
+
+def _on_document_deleted(sender, instance, **kwargs):
+    kind = _kind_of(sender)
+    if kind is not None:
+        unindex(kind, [instance.pk])
+
+
+# cambios en tablas relacionadas que aparecen en los documentos
+_RELATED = {
+    "customers.Customer": ("customer", ("name",)),
+    "vehicles.Vehicle": ("vehicle", ("plate", "vin")),
+}
+
+
+def _remember_related(sender, instance, raw=False, **kwargs):
+    _, watched = _RELATED[sender._meta.label]
+    instance._search_before = None
+    if not raw and instance.pk:
+        instance._search_before = sender.objects.filter(pk=instance.pk).values_list(*watched).first()
+
+
+def _on_related_saved(sender, instance, created, raw=False, **kwargs):
+    fk, watched = _RELATED[sender._meta.label]
+    before = getattr(instance, "_search_before", None)
+    if raw or created or before is None or before == tuple(getattr(instance, f) for f in watched):
+        return
+    for kind in SOURCES:
+        ids = list(source_model(kind).objects.filter(**{f"{fk}_id": instance.pk}).values_list("pk", flat=True))
+        if ids:
+            reindex(kind, ids)
+
+
+def connect_signals():
+    for label, _ in SOURCES.values():
+        model = apps.get_model(label)
+        post_save.connect(_on_document_saved, sender=model, dispatch_uid=f"search-save-{label}")
+        post_delete.connect(_on_document_deleted, sender=model, dispatch_uid=f"search-delete-{label}")
+    for label in _RELATED:
+        model = apps.get_model(label)
+        pre_save.connect(_remember_related, sender=model, dispatch_uid=f"search-pre-{label}")
+        post_save.connect(_on_related_saved, sender=model, dispatch_uid=f"search-related-{label}")
@@ -0,0 +1,91 @@
+# core/sequences.py
+"""
+Numeración de documentos (cotizaciones, órdenes de trabajo) sin escanear tablas.
+
+Cada serie (prefijo, año) tiene una fila en DocumentSequence. Reservar n números es
+un UPDATE atómico (last_value = last_value + n) que bloquea solo esa fila hasta el
+commit, así dos altas concurrentes nunca obtienen el mismo número.
+
+Con DOCUMENT_SEQUENCE_BLOCK_SIZE > 1 cada proceso reserva bloques y los reparte en
+memoria: menos escrituras al contador a cambio de huecos si el proceso termina y de
+números no estrictamente ordenados entre procesos.
+"""
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DocumentSequence
+
+_pools: dict[tuple[str, int], list[int]] = {}  # (prefijo, año) -> [siguiente, último]
+_pools_lock = threading.Lock()
+
+
+def current_year() -> int:
+    return timezone.now().date().year
+
+
+def reserve(prefix: str, year: int, count: int = 1) -> tuple[int, int]:
+    """Reserva `count` valores consecutivos de la serie y devuelve (primero, último)."""
+    if count < 1:
+        raise ValueError("count debe ser >= 1")
+    qs = DocumentSequence.objects.filter(prefix=prefix, year=year)
+    with transaction.atomic():
+        if not qs.update(last_value=F("last_value") + count):
+            try:
+                with transaction.atomic():
+                    DocumentSequence.objects.create(prefix=prefix, year=year, last_value=count)
+            except IntegrityError:
+                # otro proceso creó la serie entre el UPDATE y el INSERT
+                qs.update(last_value=F("last_value") + count)
+        last = qs.values_list("last_value", flat=True).get()
+    return last - count + 1, last
+
+
+def next_value(prefix: str, year: int | None = None, block_size: int | None = None) -> int:
+    """Siguiente valor de la serie, tomando del bloque en memoria si hay uno."""
+    year = year or current_year()
+    key = (prefix, year)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool and pool[0] <= pool[1]:
+            value = pool[0]
+            pool[0] += 1
+            return value
+
+    size = block_size or getattr(settings, "DOCUMENT_SEQUENCE_BLOCK_SIZE", 1)
+    first, last = reserve(prefix, year, size)
+    if last > first:
+        # el resto del bloque solo es válido si la reserva llega a commit
+        def _keep():
+            with _pools_lock:
+                _pools[key] = [first + 1, last]
+        transaction.on_commit(_keep)
+    return first
+
+
+def format_number(prefix: str, year: int, value: int, width: int = 4) -> str:
+    return f"{prefix}-{year}-{value:0{width}d}"
+
+
+def next_number(prefix: str, width: int = 4, year: int | None = None) -> str:
+    """Ej.: next_number("Q") -> "Q-2025-0042"."""
+    year = year or current_year()
+    return format_number(prefix, year, next_value(prefix, year), width)
+
+
+def allocate_numbers(prefix: str, count: int, width: int = 4, year: int | None = None) -> list[str]:
+    """Preasigna `count` números consecutivos con una sola reserva (altas masivas)."""
+    if count <= 0:
+        return []
+    year = year or current_year()
+    first, last = reserve(prefix, year, count)
+    return [format_number(prefix, year, v, width) for v in range(first, last + 1)]
+
+
+def reset_pools():
+    """Descarta los bloques en memoria (tests / tras restaurar un backup)."""
+    with _pools_lock:
+        _pools.clear()
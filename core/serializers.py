@@ -40,3 +40,5 @@ class WorkOrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkOrder
         fields = "__all__"
+        # si no viene, WorkOrder.save() lo toma del contador compartido
+        extra_kwargs = {"number": {"required": False}, "quotation": {"read_only": True}}
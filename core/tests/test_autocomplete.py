@@ -0,0 +1,53 @@
+# core/tests/test_autocomplete.py
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from catalog import autocomplete
+from catalog.cache import cache
+from catalog.models import Part, Service
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.filt = Part.objects.create(sku="FILT-01", name="Filtro de aceite", price=120)
+        cls.filt_air = Part.objects.create(sku="FA-22", name="Filtro de aire", price=150)
+        cls.oil = Part.objects.create(sku="ACE-5W30", name="Aceite sintético 5W30", price=300)
+        Part.objects.create(sku="FILT-OLD", name="Filtro descontinuado", price=1, is_active=False)
+        cls.svc = Service.objects.create(code="ALIN", name="Alineación y balanceo", price=450)
+        cls.user = User.objects.create_user("autocomp", password="secret123")
+
+    def setUp(self):
+        cache.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def ids(self, kind, q, limit=10):
+        return [r["id"] for r in autocomplete.suggest(kind, q, limit)]
+
+    def test_code_matches_rank_before_name_matches(self):
+        # "ace" es SKU de un aceite y palabra intermedia de "Filtro de aceite"
+        self.assertEqual(self.ids("part", "ace"), [self.oil.pk, self.filt.pk])
+        self.assertEqual(self.ids("part", "filt-0"), [self.filt.pk])
+
+    def test_name_prefix_and_mid_name_phrase(self):
+        self.assertEqual(self.ids("part", "filtro de ai"), [self.filt_air.pk])
+        self.assertEqual(self.ids("service", "balan"), [self.svc.pk])
+        self.assertEqual(self.ids("service", "ALINEACIÓN"), [self.svc.pk])
+
+    def test_inactive_excluded_and_limit_respected(self):
+        self.assertNotIn("FILT-OLD", [r["code"] for r in autocomplete.suggest("part", "filt")])
+        self.assertEqual(len(self.ids("part", "f", limit=1)), 1)
+
+    def test_index_follows_catalog_changes(self):
+        self.ids("part", "bal")
+        Part.objects.create(sku="BAL-9", name="Balata delantera", price=600)
+        self.assertEqual(len(self.ids("part", "bal")), 1)
+
+    def test_endpoints(self):
+        res = self.client.get("/api/parts/autocomplete/", {"q": "filtro"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual({r["code"] for r in res.json()}, {"FILT-01", "FA-22"})
+        self.assertEqual(self.client.get("/api/services/autocomplete/", {"q": "al"}).json()[0]["code"], "ALIN")
+        self.assertEqual(self.client.get("/api/services/autocomplete/").json(), [])
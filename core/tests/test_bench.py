@@ -0,0 +1,132 @@
+# core/tests/test_bench.py
+import io
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+
+from core import bench
+from quotes.models import Quotation
+
+
+class BenchStatsTests(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(bench.percentile(values, 50), 50)
+        self.assertEqual(bench.percentile(values, 95), 95)
+        self.assertEqual(bench.percentile(values, 99), 99)
+        self.assertEqual(bench.percentile([7.0], 99), 7.0)
+        self.assertEqual(bench.percentile([], 50), 0.0)
+
+    def test_summarize_counts_errors_and_queries(self):
+        out = bench.summarize([10, 20, 30, 40], [200, 201, 400, 0], elapsed=2.0, queries=[1, 3])
+        self.assertEqual((out["requests"], out["errors"], out["rps"]), (4, 2, 2.0))
+        self.assertEqual(out["latency_ms"]["p50"], 20)
+        self.assertEqual(out["db_queries_per_request"], 2.0)
+        self.assertEqual(out["status"], {"0": 1, "200": 1, "201": 1, "400": 1})
+
+    def test_compare_reports_relative_change(self):
+        def report(p95, rps):
+            lat = {"p50": 1, "p95": p95, "p99": p95}
+            return {"total": {"latency_ms": lat, "rps": rps, "db_queries_per_request": 2.0}, "endpoints": {}}
+
+        rows = {(n, m): c for n, m, _, _, c in bench.compare(report(15, 90), report(10, 100))}
+        self.assertEqual(rows[("total", "p95")], 50.0)
+        self.assertEqual(rows[("total", "rps")], -10.0)
+        self.assertEqual(rows[("total", "db_queries")], 0.0)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Responde 200 a todo; el login devuelve un token. Registra hilo y Authorization."""
+
+    protocol_version = "HTTP/1.1"
+    seen = None
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = b'{"access": "tok"}' if self.path == "/api/auth/jwt/create/" else b"{}"
+        self.server.seen.append((self.path, self.headers.get("Authorization"), threading.get_ident()))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class BenchConcurrencyTests(SimpleTestCase):
+    """La concurrencia se prueba contra un servidor HTTP trivial, no contra el live server en memoria."""
+
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.httpd.seen = []
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(self.httpd.server_close)
+        self.addCleanup(self.httpd.shutdown)
+        host, port = self.httpd.server_address[:2]
+        self.url = f"http://{host}:{port}"
+
+    def test_clients_share_request_budget_and_start_together(self):
+        mix = (
+            bench.Endpoint("ping", 3, "GET", lambda ctx, rng: ("/ping", None), ()),
+            bench.Endpoint("post", 1, "POST", lambda ctx, rng: ("/post", {"x": 1}), ()),
+        )
+        started = []
+
+        def on_start():
+            started.append(len(self.httpd.seen))
+
+        samples, elapsed = bench.run_clients(
+            self.url, None, clients=4, requests=40, warmup=2, mix=mix, on_start=on_start,
+        )
+
+        self.assertEqual(len(samples), 40)
+        self.assertEqual({status for _, status, _ in samples}, {200})
+        self.assertGreater(elapsed, 0)
+        # on_start corre una vez, cuando los 4 clientes ya hicieron login + 2 GETs de calentamiento
+        self.assertEqual(started, [4 * 3])
+        measured = self.httpd.seen[started[0]:]
+        self.assertEqual(len(measured), 40)
+        self.assertEqual({auth for _, auth, _ in measured}, {"Bearer tok"})
+
+
+@override_settings(THROTTLE_ENABLED=False)
+class BenchRunTests(LiveServerTestCase):
+    def test_runs_mix_against_server_and_writes_json(self):
+        # un solo cliente: el live server sobre SQLite en memoria comparte una conexión
+        # entre hilos y las transacciones de POSTs concurrentes se mezclarían
+        out = Path(tempfile.mkdtemp()) / "bench.json"
+        stdout = io.StringIO()
+        call_command(
+            "bench", size=12, clients=1, requests=60, warmup=1, url=self.live_server_url,
+            output=str(out), stdout=stdout,
+        )
+        report = json.loads(out.read_text(encoding="utf-8"))
+
+        self.assertEqual(report["total"]["requests"], 60)
+        self.assertEqual(report["total"]["errors"], 0, report["endpoints"])
+        self.assertEqual(report["meta"]["dataset"]["customers"], 12)
+        self.assertTrue(set(report["endpoints"]) <= {e.name for e in bench.MIX})
+        self.assertIn("quotation_list", report["endpoints"])
+        # el servidor de pruebas es en proceso: hay consultas por request
+        self.assertGreater(report["endpoints"]["quotation_list"]["db_queries_per_request"], 0)
+        for key in ("p50", "p95", "p99"):
+            self.assertIn(key, report["total"]["latency_ms"])
+        self.assertIn("TOTAL", stdout.getvalue())
+
+    def test_seed_is_idempotent_and_tops_up_approved(self):
+        first = bench.seed_dataset(5)
+        self.assertEqual(bench.seed_dataset(5), first)
+        Quotation.objects.filter(customer__name__startswith=bench.PREFIX).update(status=Quotation.DRAFT)
+        self.assertEqual(bench.top_up_approved(3), 3)
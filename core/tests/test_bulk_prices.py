@@ -0,0 +1,99 @@
+# core/tests/test_bulk_prices.py
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from catalog import bulk_prices
+from catalog.cache import cache
+from catalog.models import Part, Service
+
+
+class BulkPriceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.f1 = Part.objects.create(sku="FIL-001", name="Filtro 1", unit="UNI", price=Decimal("100.00"))
+        cls.f2 = Part.objects.create(sku="FIL-002", name="Filtro 2", unit="UNI", price=Decimal("33.33"))
+        cls.oil = Part.objects.create(sku="ACE-001", name="Aceite", unit="LT", price=Decimal("80.00"))
+        cls.old = Part.objects.create(sku="FIL-999", name="Filtro viejo", unit="UNI", price=Decimal("10.00"),
+                                      is_active=False)
+        cls.svc = Service.objects.create(code="ALIN", name="Alineación", price=Decimal("450.00"))
+        cls.admin = User.objects.create_superuser("precios", "precios@example.com", "secret123")
+
+    def price(self, obj):
+        return type(obj).objects.values_list("price", flat=True).get(pk=obj.pk)
+
+    def test_percent_with_filters_is_set_based(self):
+        with CaptureQueriesContext(connection) as ctx:
+            result = bulk_prices.adjust_prices("part", percent="10", code_prefix="FIL", is_active=True, chunk_size=1)
+        self.assertEqual((result["matched"], result["changed"]), (2, 2))
+        self.assertEqual(self.price(self.f1), Decimal("110.00"))
+        self.assertEqual(self.price(self.f2), Decimal("36.66"))
+        self.assertEqual(self.price(self.old), Decimal("10.00"))
+        self.assertEqual(self.price(self.oil), Decimal("80.00"))
+        # un UPDATE por lote (chunk_size=1 -> 2 lotes), no uno por fila leída
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "catalog_part"')]
+        self.assertEqual(len(updates), 2)
+
+    def test_amount_never_goes_negative_and_dry_run_writes_nothing(self):
+        preview = bulk_prices.adjust_prices("part", amount="-50", unit="LT", dry_run=True)
+        self.assertEqual(preview["changes"], [{"id": self.oil.pk, "code": "ACE-001", "old": "80.00", "new": "30.00"}])
+        self.assertEqual(self.price(self.oil), Decimal("80.00"))
+
+        bulk_prices.adjust_prices("part", amount="-500", unit="LT")
+        self.assertEqual(self.price(self.oil), Decimal("0.00"))
+
+    def test_price_list_reports_unknown_codes_and_refreshes_cache(self):
+        cache.get("service", self.svc.pk)
+        result = bulk_prices.apply_price_list("service", [("ALIN", Decimal("500.00")), ("NOPE", Decimal("1"))])
+        self.assertEqual(result["not_found"], ["NOPE"])
+        self.assertEqual(cache.get("service", self.svc.pk).price, Decimal("500.00"))
+
+    def test_api_csv_upload_and_permission(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        csv_file = SimpleUploadedFile("precios.csv", "sku;precio\nFIL-001;125,50\nACE-001;80\n".encode())
+        res = client.post("/api/parts/bulk-price/", {"file": csv_file}, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual((res.json()["matched"], res.json()["changed"]), (2, 1))
+        self.assertEqual(self.price(self.f1), Decimal("125.50"))
+
+        res = client.post("/api/parts/bulk-price/", {"percent": "5", "prices": []}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+        client.force_authenticate(user=User.objects.create_user("sinpermiso", password="x"))
+        self.assertEqual(client.post("/api/parts/bulk-price/", {"percent": "5"}, format="json").status_code, 403)
+
+    def test_cp1252_list_and_invalid_inputs_are_user_errors(self):
+        # Excel en español exporta cp1252
+        prices = bulk_prices.parse_price_csv("código;precio\nFIL-001;99,90\n".encode("cp1252"))
+        self.assertEqual(prices, [("FIL-001", Decimal("99.90"))])
+        with self.assertRaisesMessage(bulk_prices.PriceListError, "línea 2"):
+            bulk_prices.parse_price_csv(b"sku,precio\nFIL-\x81,1\n")  # 0x81: ni UTF-8 ni cp1252
+        for bad in ("abc", "NaN", "Infinity"):
+            with self.assertRaisesMessage(bulk_prices.PriceListError, "Porcentaje/monto inválido"):
+                bulk_prices.adjust_prices("part", percent=bad)
+        with self.assertRaisesMessage(bulk_prices.PriceListError, "Porcentaje/monto inválido"):
+            bulk_prices.adjust_prices("part", amount="1,5x")
+
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        csv_file = SimpleUploadedFile("precios.csv", "sku;precio\nFIL-002;40\nNOPE;1\xe9\x81\n".encode("latin-1"))
+        res = client.post("/api/parts/bulk-price/", {"file": csv_file}, format="multipart")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.price(self.f2), Decimal("33.33"))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("update_prices", "part", "--percent", "-10", "--prefix", "ACE", stdout=out)
+        self.assertIn("1 de 1 precios cambiados", out.getvalue())
+        self.assertEqual(self.price(self.oil), Decimal("72.00"))
+
+        with self.assertRaisesMessage(CommandError, "Porcentaje/monto inválido"):
+            call_command("update_prices", "part", "--percent", "abc", stdout=StringIO())
@@ -0,0 +1,80 @@
+# core/tests/test_catalog_cache.py
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from catalog.cache import GENERATION, cache
+from catalog.models import Part, Service
+from core import generations
+from customers.models import Customer
+from quotes.models import Quotation
+from quotes.serializers import QuotationPreviewSerializer, QuotationSerializer
+
+
+@override_settings(CATALOG_CACHE_CHECK_INTERVAL=60)
+class CatalogCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.svc = Service.objects.create(code="AFN", name="Afinación", price=Decimal("800.00"))
+        cls.part = Part.objects.create(sku="BUJ-1", name="Bujía", price=Decimal("95.50"))
+        cls.customer = Customer.objects.create(name="Cliente Catálogo")
+
+    def setUp(self):
+        cache.invalidate()
+
+    def test_entries_are_compact_and_warm_reads_are_free(self):
+        self.assertEqual(cache.get("service", self.svc.pk).code, "AFN")
+        with CaptureQueriesContext(connection) as ctx:
+            entry = cache.get("part", self.part.pk)
+        self.assertEqual((entry.code, entry.price, entry.is_active), ("BUJ-1", Decimal("95.50"), True))
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_save_bumps_generation_and_refreshes(self):
+        before = generations.current(GENERATION)
+        cache.get("service", self.svc.pk)
+        self.svc.price = Decimal("850.00")
+        self.svc.save()
+        self.assertEqual(generations.current(GENERATION), before + 1)
+        self.assertEqual(cache.get("service", self.svc.pk).price, Decimal("850.00"))
+
+    def test_other_process_change_is_seen_through_generation(self):
+        cache.get("service", self.svc.pk)
+        Service.objects.filter(pk=self.svc.pk).update(name="Afinación mayor")  # sin señales
+        generations.bump(GENERATION)  # lo que haría el otro proceso
+        with override_settings(CATALOG_CACHE_CHECK_INTERVAL=0):
+            self.assertEqual(cache.get("service", self.svc.pk).name, "Afinación mayor")
+
+    def test_nested_lines_validate_without_per_line_catalog_queries(self):
+        def validate_queries(n):
+            payload = {
+                "customer": self.customer.pk,
+                "services": [{"service": self.svc.pk, "quantity": "1", "unit_price": "800"}] * n,
+                "parts": [{"part": self.part.pk, "quantity": "4", "unit_price": "95.50"}] * n,
+            }
+            with CaptureQueriesContext(connection) as ctx:
+                ser = QuotationSerializer(data=payload)
+                self.assertTrue(ser.is_valid(), ser.errors)
+            return len(ctx.captured_queries)
+
+        validate_queries(1)  # carga la caché
+        self.assertEqual(validate_queries(2), validate_queries(30))
+
+    def test_preview_prices_from_cache_and_reports_unknown_ids(self):
+        ser = QuotationPreviewSerializer(data={"services": [{"service": self.svc.pk}], "parts": [{"part": 999999}]})
+        self.assertFalse(ser.is_valid())
+        self.assertIn("parts", ser.errors)
+
+        ser = QuotationPreviewSerializer(data={"services": [{"service": self.svc.pk, "quantity": "2"}]})
+        self.assertTrue(ser.is_valid(), ser.errors)
+        self.assertEqual(ser.preview()["total"], "1600.00")
+
+    def test_created_quotation_lines_point_to_catalog_rows(self):
+        ser = QuotationSerializer(data={
+            "customer": self.customer.pk,
+            "services": [{"service": self.svc.pk, "quantity": "1", "unit_price": "800"}],
+        })
+        self.assertTrue(ser.is_valid(), ser.errors)
+        q = ser.save()
+        self.assertEqual(Quotation.objects.get(pk=q.pk).services.get().service_id, self.svc.pk)
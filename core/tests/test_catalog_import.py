@@ -0,0 +1,129 @@
+# core/tests/test_catalog_import.py
+import io
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from catalog import importer
+from catalog.models import Part
+
+
+class CatalogImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.same = Part.objects.create(sku="P-1", name="Filtro", unit="UNI", price=Decimal("10.00"))
+        cls.repriced = Part.objects.create(sku="P-2", name="Balata", unit="JGO", price=Decimal("20.00"))
+
+    def _run(self, text, fmt="csv", **kwargs):
+        return importer.import_parts(importer.iter_records(io.BytesIO(text.encode()), fmt), **kwargs)
+
+    def test_csv_diff_writes_only_changes(self):
+        result = self._run(
+            "sku;name;price;is_active\n"
+            "P-1;Filtro;10,00;si\n"
+            "P-2;Balata;22,50;si\n"
+            "P-3;Bujía;35;si\n"
+            ";Sin sku;1;si\n"
+            "P-4;;5;si\n"
+        )
+        self.assertEqual((result["created"], result["updated"], result["unchanged"], result["errors"]), (1, 1, 1, 2))
+        self.assertEqual(Part.objects.get(sku="P-2").price, Decimal("22.50"))
+        self.assertEqual(Part.objects.get(sku="P-3").name, "Bujía")
+
+    def test_values_that_do_not_fit_the_columns_are_line_errors(self):
+        result = self._run(
+            "sku;name;unit;price\n"
+            f"L-1;{'x' * 151};UNI;1\n"
+            "L-2;Filtro;GALONES-XXL;1\n"
+            "L-3;Filtro;UNI;100000000\n"
+            "L-4;Filtro;UNI;NaN\n"
+            f"{'S' * 61};Filtro;UNI;1\n"
+            "L-5;Filtro;UNI;99999999,99\n"
+        )
+        self.assertEqual((result["created"], result["errors"]), (1, 5))
+        self.assertEqual([e["line"] for e in result["error_samples"]], [2, 3, 4, 5, 6])
+        self.assertIn("name excede 150", result["error_samples"][0]["error"])
+        self.assertIn("price fuera de rango", result["error_samples"][2]["error"])
+        self.assertTrue(Part.objects.filter(sku="L-5").exists())
+
+    def test_jsonl_and_dry_run(self):
+        text = "\n".join(json.dumps(r) for r in [{"sku": "P-2", "price": "30"}, {"sku": "P-9", "name": "Nuevo"}])
+        result = self._run(text + "\n{roto\n", fmt="jsonl", dry_run=True)
+        self.assertEqual((result["created"], result["updated"], result["errors"]), (1, 1, 1))
+        self.assertFalse(Part.objects.filter(sku="P-9").exists())
+        self.assertEqual(Part.objects.get(sku="P-2").price, Decimal("20.00"))
+
+    def test_cp1252_file_falls_back_from_utf8(self):
+        raw = "sku;name;price\nP-7;Bujía iridio;35\n".encode("cp1252")
+        self.assertEqual(importer.detect_encoding(io.BytesIO(raw)), "cp1252")
+        result = importer.import_parts(importer.iter_records(io.BytesIO(raw), "csv"))
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(Part.objects.get(sku="P-7").name, "Bujía iridio")
+
+    def test_unreadable_file_reports_line_and_applied_batches(self):
+        # 0x81 no existe ni en UTF-8 ni en cp1252
+        raw = b"sku,name\nE-1,Uno\nE-2,Dos\nE-3,Tres\xe9\x81\n"
+        with self.assertRaises(importer.ImportFormatError) as ctx:
+            importer.import_parts(importer.iter_records(io.BytesIO(raw), "csv"))
+        self.assertEqual(ctx.exception.line, 4)
+
+        # sin seek (no se puede detectar antes): falla a mitad, tras aplicar el primer lote
+        class Pipe(io.BytesIO):
+            def seekable(self):
+                return False
+
+        raw = b"sku,name\n" + b"".join(b"E-%d,Parte\n" % i for i in range(3000)) + b"E-X,Buj\xeda\n"
+        with self.assertRaises(importer.ImportFormatError) as ctx:
+            importer.import_parts(importer.iter_records(Pipe(raw), "csv"), batch_size=1000)
+        # el decodificador lee por bloques: el error aparece antes de las últimas filas
+        applied = ctx.exception.result["batches"]
+        self.assertGreaterEqual(applied, 1)
+        self.assertEqual(Part.objects.filter(sku__startswith="E-").count(), applied * 1000)
+
+    def test_queries_per_batch_not_per_row(self):
+        def queries(n):
+            rows = "".join(f"N-{n}-{i},Parte {i},{i}.00\n" for i in range(n))
+            with CaptureQueriesContext(connection) as ctx:
+                self._run("sku,name,price\n" + rows, batch_size=1000)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries(5), queries(100))
+
+    def test_command_and_upload_endpoint(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as fh:
+            fh.write("sku,name,price\nP-5,Aceite,99.90\n")
+        out = StringIO()
+        call_command("import_catalog", fh.name, "--batch-size", "1", stdout=out)
+        self.assertIn("1 altas", out.getvalue())
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_superuser("imp", "imp@example.com", "secret123"))
+        upload = SimpleUploadedFile("prov.jsonl", b'{"sku": "P-5", "price": "89.90"}\n')
+        res = client.post("/api/parts/import/", {"file": upload}, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(res.json()["updated"], 1)
+        self.assertEqual(Part.objects.get(sku="P-5").price, Decimal("89.90"))
+
+        # Latin-1/cp1252 (Excel en español): se importa en vez de responder 500
+        upload = SimpleUploadedFile("prov.csv", "sku;name\nP-6;Bujía\n".encode("cp1252"))
+        res = client.post("/api/parts/import/", {"file": upload}, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(Part.objects.get(sku="P-6").name, "Bujía")
+
+        # CSV malformado después del primer lote: 400 con la línea y lo ya aplicado
+        rows = "".join(f"M-{i},Parte {i}\n" for i in range(1000))
+        upload = SimpleUploadedFile("prov.csv", f"sku,name\n{rows}M-X,{'x' * 200_000}\n".encode())
+        res = client.post("/api/parts/import/", {"file": upload}, format="multipart")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json()["line"], 1002)
+        self.assertEqual(res.json()["applied"]["batches"], 1)
+        self.assertEqual(Part.objects.filter(sku__startswith="M-").count(), 1000)
@@ -0,0 +1,106 @@
+# core/tests/test_datagen.py
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db.models import Count, F, Sum
+from django.test import SimpleTestCase, TestCase
+
+from core import datagen, search
+from customers.models import Customer
+from quotes.models import Quotation, QuotationPart, QuotationService
+from vehicles.models import Vehicle, normalize_plate
+from workorders.models import WorkOrder, WorkOrderPart, WorkOrderService
+
+
+class GeneratorDeterminismTests(SimpleTestCase):
+    catalog = {
+        "services": [(i, Decimal(100 + i)) for i in range(1, 6)],
+        "parts": [(i, Decimal("12.50") + i) for i in range(1, 11)],
+    }
+
+    def test_same_seed_same_rows_with_any_worker_count(self):
+        tasks = datagen._tasks(7, 30, (1, 100, 40, 1, 2, 365))
+        with datagen._mapper(1, {"catalog": self.catalog}) as imap:
+            inline = list(imap(datagen.gen_quotations, tasks))
+        with datagen._mapper(2, {"catalog": self.catalog}) as imap:
+            pooled = list(imap(datagen.gen_quotations, tasks))
+        self.assertEqual(inline, pooled)
+        with datagen._mapper(1, {"catalog": self.catalog}) as imap:
+            other_seed = list(imap(datagen.gen_quotations, datagen._tasks(8, 30, (1, 100, 40, 1, 2, 365))))
+        self.assertNotEqual(inline, other_seed)
+
+    def test_plates_are_unique_per_id(self):
+        plates = {datagen.plate_for(i) for i in range(1, 50001)}
+        self.assertEqual(len(plates), 50000)
+        self.assertEqual(datagen.plate_for(1), "AAA-0001")
+
+
+class GenerateDataCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "generate_data", customers=40, vehicles_per_customer=2, quotations=120, services=8, parts=25,
+            workers=1, stdout=io.StringIO(),
+        )
+
+    def test_counts_and_references(self):
+        self.assertEqual(Customer.objects.count(), 40)
+        self.assertEqual(Vehicle.objects.count(), 80)
+        self.assertEqual(Quotation.objects.count(), 120)
+        # el vehículo de cada cotización es del mismo cliente
+        self.assertFalse(Quotation.objects.exclude(vehicle__owner_id=F("customer_id")).exists())
+        self.assertEqual(
+            WorkOrder.objects.count(),
+            Quotation.objects.filter(status=Quotation.APPROVED).count(),
+        )
+        self.assertFalse(WorkOrder.objects.exclude(quotation__customer_id=F("customer_id")).exists())
+        self.assertEqual(len(set(Quotation.objects.values_list("number", flat=True))), 120)
+
+    def test_fields_save_would_fill(self):
+        for v in Vehicle.objects.all():
+            self.assertEqual(v.plate_normalized, normalize_plate(v.plate))
+            self.assertEqual(v.vin_normalized, normalize_plate(v.vin) or None)
+        self.assertGreater(Quotation.objects.values("created_at__date").distinct().count(), 1)
+
+    def test_historical_dates_keep_auto_fields_untouched(self):
+        created = Quotation._meta.get_field("created_at")
+        opened = WorkOrder._meta.get_field("opened_at")
+        self.assertEqual((created.auto_now, created.auto_now_add), (False, True))
+        self.assertEqual((opened.auto_now, opened.auto_now_add), (False, True))
+        self.assertFalse(Quotation.objects.exclude(updated_at=F("created_at")).exists())
+        self.assertGreater(WorkOrder.objects.values("opened_at__date").distinct().count(), 1)
+
+    def test_totals_match_lines(self):
+        for q in Quotation.objects.prefetch_related("services", "parts"):
+            services = sum((line.line_total for line in q.services.all()), Decimal("0.00"))
+            parts = sum((line.line_total for line in q.parts.all()), Decimal("0.00"))
+            self.assertEqual((q.subtotal_services, q.subtotal_parts), (services, parts))
+            self.assertEqual(q.grand_total, services + parts)
+
+    def test_workorder_lines_copy_quotation_lines(self):
+        wo = WorkOrder.objects.annotate(n=Count("services")).filter(n__gt=0).first()
+        self.assertEqual(
+            sorted(wo.services.values_list("service_id", "quantity", "unit_price")),
+            sorted(QuotationService.objects.filter(quotation_id=wo.quotation_id)
+                   .values_list("service_id", "quantity", "unit_price")),
+        )
+        self.assertEqual(
+            WorkOrderPart.objects.aggregate(n=Count("id"))["n"],
+            QuotationPart.objects.filter(quotation__workorder__isnull=False).count(),
+        )
+        self.assertEqual(
+            WorkOrderService.objects.aggregate(s=Sum("quantity"))["s"],
+            QuotationService.objects.filter(quotation__workorder__isnull=False).aggregate(s=Sum("quantity"))["s"],
+        )
+
+    def test_search_index_covers_bulk_rows(self):
+        q = Quotation.objects.order_by("id").last()
+        self.assertIn(q.id, [pk for pk, _ in search.search(search.QUOTATION, q.number)])
+        wo = WorkOrder.objects.order_by("id").last()
+        self.assertIn(wo.id, [pk for pk, _ in search.search(search.WORKORDER, wo.vehicle.plate)])
+
+    def test_second_run_appends_after_existing_ids(self):
+        call_command("generate_data", customers=5, quotations=5, services=1, parts=1, workers=1, stdout=io.StringIO())
+        self.assertEqual(Customer.objects.count(), 45)
+        self.assertEqual(Quotation.objects.count(), 125)
@@ -0,0 +1,81 @@
+# core/tests/test_jwt_role_claims.py
+from django.contrib.auth.models import Group, Permission, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.models import Part
+from core import roles
+from core.tokens import PERMS_CLAIM, ROLES_CLAIM, VERSION_CLAIM
+
+
+@override_settings(RBAC_CACHE_CHECK_INTERVAL=60)
+class RoleClaimsJWTTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group, _ = Group.objects.get_or_create(name="Mecanico")
+        cls.asesor, _ = Group.objects.get_or_create(name="Asesor")
+        cls.group.permissions.add(Permission.objects.get(content_type__app_label="catalog", codename="view_part"))
+        Part.objects.create(sku="JWT-1", name="Parte JWT", price="10.00")
+
+    def setUp(self):
+        roles.cache.invalidate()
+        self.user = User.objects.create_user("tablet", password="clave-segura-123")
+        self.user.groups.add(self.group)
+        self.api = APIClient()
+
+    def obtain(self):
+        resp = self.api.post("/api/auth/jwt/create/", {"username": "tablet", "password": "clave-segura-123"}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return resp.json()
+
+    def test_access_token_carries_role_claims(self):
+        token = AccessToken(self.obtain()["access"])
+        self.assertEqual(token[ROLES_CLAIM], ["Mecanico"])
+        self.assertIn("catalog.view_part", token[PERMS_CLAIM])
+        self.assertEqual(token[VERSION_CLAIM], roles.version())
+        self.assertFalse(token["is_superuser"])
+
+    def test_reads_with_current_claims_skip_user_and_group_queries(self):
+        access = self.obtain()["access"]
+        self.api.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.api.get("/api/parts/")  # calienta generación RBAC
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.api.get("/api/parts/")
+        self.assertEqual(resp.status_code, 200)
+        tables = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn("auth_user", tables)
+        self.assertNotIn("auth_group", tables)
+
+    def test_writes_still_load_user_from_db(self):
+        access = self.obtain()["access"]
+        self.api.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        # Mecanico no escribe; con usuario de BD la respuesta sigue siendo 403
+        resp = self.api.post("/api/parts/", {"sku": "X-1", "name": "X", "price": "1.00"}, format="json")
+        self.assertEqual(resp.status_code, 403)
+
+    def test_role_change_revokes_claims_and_refresh_restamps(self):
+        tokens = self.obtain()
+        old = AccessToken(tokens["access"])
+        self.user.groups.add(self.asesor)
+        self.assertNotEqual(old[VERSION_CLAIM], roles.version())
+
+        self.api.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.api.get("/api/parts/").status_code, 200)
+        self.assertIn("auth_user", " ".join(q["sql"] for q in ctx.captured_queries))
+
+        resp = self.api.post("/api/auth/jwt/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.content)
+        fresh = AccessToken(resp.json()["access"])
+        self.assertEqual(sorted(fresh[ROLES_CLAIM]), ["Asesor", "Mecanico"])
+        self.assertEqual(fresh[VERSION_CLAIM], roles.version())
+
+    def test_deactivating_user_revokes_claims(self):
+        access = self.obtain()["access"]
+        self.user.is_active = False
+        self.user.save()
+        self.api.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.api.get("/api/parts/").status_code, 401)
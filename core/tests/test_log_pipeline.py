@@ -0,0 +1,119 @@
+# core/tests/test_log_pipeline.py
+import json
+import logging
+import threading
+import uuid
+
+from django.test import TestCase
+
+from workshop.logging_config import JsonFormatter, LogPipeline, PipelineHandler, RedactFilter, wrap_loggers
+
+
+class CollectingHandler(logging.Handler):
+    """Destino de prueba: guarda (hilo, línea formateada); puede bloquearse para simular disco lento."""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.lines = []
+        self.threads = set()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.setFormatter(JsonFormatter())
+        self.addFilter(RedactFilter())
+
+    def emit(self, record):
+        self.entered.set()
+        self.gate.wait(5)
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(json.loads(self.format(record)))
+
+
+class LogPipelineTests(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(f"test.pipeline.{uuid.uuid4().hex}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.target = CollectingHandler()
+        self.logger.addHandler(self.target)
+        self.pipeline = LogPipeline(maxsize=100)
+        self.addCleanup(self.pipeline.stop)
+        wrap_loggers(self.pipeline, [self.logger])
+
+    def test_hot_path_only_enqueues_work_happens_in_listener(self):
+        self.assertIsInstance(self.logger.handlers[0], PipelineHandler)
+        args = ["a"]
+        self.logger.info("uno %s", args, extra={"password": "s3cret"})
+        args.append("mutado")  # ya interpolado al encolar
+        self.logger.warning("dos")
+        self.pipeline.stop()
+
+        self.assertEqual([line["message"] for line in self.target.lines], ["uno ['a']", "dos"])
+        self.assertEqual(self.target.threads, {"log-pipeline"})
+
+    def test_redaction_and_routing_levels(self):
+        quiet = CollectingHandler(level=logging.ERROR)
+        other = logging.getLogger(f"test.pipeline.{uuid.uuid4().hex}")
+        other.propagate = False
+        other.addHandler(quiet)
+        wrap_loggers(self.pipeline, [other])
+        record_seen = []
+        self.target.addFilter(lambda r: record_seen.append(getattr(r, "token", None)) or True)
+
+        self.logger.info({"user": "x", "password": "p"}, extra={"token": "abc"})
+        other.warning("no pasa el nivel del destino")
+        other.error("sí pasa")
+        self.pipeline.stop()
+
+        self.assertIn("***REDACTED***", self.target.lines[0]["message"])
+        self.assertNotIn("'p'", self.target.lines[0]["message"])
+        self.assertEqual(record_seen, ["***REDACTED***"])
+        self.assertEqual([line["message"] for line in quiet.lines], ["sí pasa"])
+        # cada logger va solo a sus destinos
+        self.assertEqual(len(self.target.lines), 1)
+
+    def test_full_queue_drops_counts_and_reports(self):
+        pipeline = LogPipeline(maxsize=2)
+        self.addCleanup(pipeline.stop)
+        logger = logging.getLogger(f"test.pipeline.{uuid.uuid4().hex}")
+        logger.propagate = False
+        slow = CollectingHandler()
+        slow.gate.clear()  # disco "trabado"
+        logger.addHandler(slow)
+        wrap_loggers(pipeline, [logger])
+
+        logger.error("0")
+        self.assertTrue(slow.entered.wait(5))  # el hilo quedó bloqueado escribiendo "0"
+        for i in range(1, 6):
+            logger.error(str(i))  # caben 2 en la cola, 3 se descartan sin bloquear
+        self.assertEqual(pipeline.dropped, 3)
+        self.assertEqual(pipeline.stats()["queued"], 2)
+
+        slow.gate.set()
+        pipeline.stop()
+        messages = [line["message"] for line in slow.lines]
+        self.assertEqual(messages[:3], ["0", "1", "2"])
+        self.assertIn("3 registros descartados", messages[3])
+        self.assertEqual(slow.lines[3]["level"], "WARNING")
+
+    def test_stop_flushes_and_later_records_are_written_synchronously(self):
+        for i in range(50):
+            self.logger.info("r%d", i)
+        self.pipeline.stop()
+        self.assertEqual(len(self.target.lines), 50)
+
+        self.logger.info("después del apagado")
+        self.assertEqual(self.target.lines[-1]["message"], "después del apagado")
+        self.assertIn("MainThread", self.target.threads)
+
+    def test_restart_after_non_final_stop(self):
+        self.logger.info("antes")
+        self.pipeline.stop(final=False)
+        self.logger.info("después")
+        self.pipeline.stop()
+        self.assertEqual([line["message"] for line in self.target.lines], ["antes", "después"])
+        self.assertEqual(self.target.threads, {"log-pipeline"})
+
+    def test_timestamp_is_event_time(self):
+        record = logging.makeLogRecord({"msg": "x", "levelname": "INFO", "created": 0.0})
+        self.assertEqual(json.loads(JsonFormatter().format(record))["ts"], "1970-01-01T00:00:00Z")
@@ -0,0 +1,80 @@
+# core/tests/test_pagination.py
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from customers.models import Customer
+from quotes.models import Quotation
+
+
+class KeysetPaginationTests(TestCase):
+    URL = "/api/quotations/"
+
+    @classmethod
+    def setUpTestData(cls):
+        customer = Customer.objects.create(name="Cliente Cursor")
+        for _ in range(7):
+            Quotation.objects.create(customer=customer)
+        # mismas fechas para forzar el desempate por id
+        Quotation.objects.update(created_at=timezone.now())
+        cls.expected = list(Quotation.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        cls.admin = User.objects.create_superuser("cursor_admin", "cursor@example.com", "secret123")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _walk(self, url, key):
+        ids, pages = [], 0
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200, res.data)
+            body = res.json()
+            ids += [r["id"] for r in body["results"]]
+            url, pages = body[key], pages + 1
+        return ids, pages, body
+
+    def test_without_opt_in_list_is_unchanged(self):
+        res = self.client.get(self.URL)
+        self.assertIsInstance(res.json(), list)
+
+    def test_forward_pages_are_stable_and_countless(self):
+        ids, pages, first = self._walk(f"{self.URL}?pagination=cursor&page_size=3", "next")
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(pages, 3)
+        self.assertNotIn("count", first)
+
+    def test_previous_links_walk_back(self):
+        res = self.client.get(f"{self.URL}?pagination=cursor&page_size=3").json()
+        last = self.client.get(self.client.get(res["next"]).json()["next"]).json()
+        self.assertIsNone(last["next"])
+        back = self.client.get(last["previous"]).json()
+        self.assertEqual([r["id"] for r in back["results"]], self.expected[3:6])
+
+    def test_deep_page_costs_the_same_and_count_is_optional(self):
+        def queries(url):
+            with CaptureQueriesContext(connection) as ctx:
+                body = self.client.get(url).json()
+            return len(ctx.captured_queries), body
+
+        n_first, first = queries(f"{self.URL}?pagination=cursor&page_size=2&summary=1")
+        n_next, _ = queries(first["next"])
+        self.assertEqual(n_first, n_next)
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in connection.queries[-n_next:]))
+
+        counted = self.client.get(f"{self.URL}?pagination=cursor&with_count=1").json()
+        self.assertEqual(counted["count"], 7)
+
+    def test_invalid_cursor_is_404(self):
+        self.assertEqual(self.client.get(f"{self.URL}?cursor=no-es-un-cursor").status_code, 404)
+
+    def test_ordering_with_cursor_is_400(self):
+        res = self.client.get(f"{self.URL}?pagination=cursor&ordering=number")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("ordering", res.json())
+        # sin cursor, ?ordering= sigue funcionando como siempre
+        res = self.client.get(f"{self.URL}?ordering=number")
+        self.assertEqual([r["id"] for r in res.json()], sorted(self.expected))
@@ -0,0 +1,101 @@
+# core/tests/test_rbac_seed.py
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import rbac, roles
+from core.models import SeedFingerprint
+
+
+class RBACSeedTests(TestCase):
+    def setUp(self):
+        rbac.sync_roles(force=True)
+
+    def perms_of(self, name):
+        return {
+            f"{app}.{code}"
+            for app, code in Group.objects.get(name=name).permissions.values_list("content_type__app_label", "codename")
+        }
+
+    def existing(self, perms):
+        keys = {f"{app}.{code}" for app, code in Permission.objects.values_list("content_type__app_label", "codename")}
+        return set(perms) & keys
+
+    def test_groups_match_declared_map(self):
+        self.assertEqual(self.perms_of("Asesor"), self.existing(rbac.ROLE_PERMS["Asesor"]))
+        self.assertEqual(self.perms_of("Mecanico"), self.existing(rbac.ROLE_PERMS["Mecanico"]))
+        self.assertEqual(Group.objects.get(name="Admin").permissions.count(), Permission.objects.count())
+        self.assertIn("quotes.approve_quotation", self.perms_of("Asesor"))
+
+    def test_matching_fingerprint_skips_with_a_few_reads(self):
+        with CaptureQueriesContext(connection) as ctx:
+            summary = rbac.sync_roles()
+        self.assertTrue(summary["skipped"])
+        writes = [q["sql"] for q in ctx.captured_queries if q["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+        self.assertEqual(writes, [])
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+
+    def test_drift_is_repaired_with_bulk_diff(self):
+        asesor = Group.objects.get(name="Asesor")
+        mecanico = Group.objects.get(name="Mecanico")
+        asesor.permissions.remove(Permission.objects.get(codename="add_customer"))
+        mecanico.permissions.add(Permission.objects.get(codename="delete_vehicle"))
+        before = roles.version()
+
+        with CaptureQueriesContext(connection) as ctx:
+            summary = rbac.sync_roles(force=True)
+        self.assertEqual((summary["added"], summary["removed"]), (1, 1))
+        self.assertLessEqual(len(ctx.captured_queries), 15)
+        self.assertIn("customers.add_customer", self.perms_of("Asesor"))
+        self.assertNotIn("vehicles.delete_vehicle", self.perms_of("Mecanico"))
+        self.assertGreater(roles.version(), before)
+
+    def test_worklog_perms_apply_once_they_exist(self):
+        ct = ContentType.objects.create(app_label="workorders", model="worklog")
+        for action in rbac.CRUD:
+            Permission.objects.create(content_type=ct, codename=f"{action}_worklog", name=f"Can {action} worklog")
+        self.assertFalse(rbac.sync_roles()["skipped"])
+        mecanico = {p for p in self.perms_of("Mecanico") if p.endswith("_worklog")}
+        self.assertEqual(mecanico, {"workorders.add_worklog", "workorders.change_worklog", "workorders.view_worklog"})
+        self.assertIn("workorders.delete_worklog", self.perms_of("Asesor"))
+
+    def test_changed_permission_set_changes_fingerprint(self):
+        stored = SeedFingerprint.objects.get(name=rbac.FINGERPRINT_NAME).value
+        Group.objects.get(name="Mecanico").permissions.clear()
+        # sin cambios en lo deseado la huella coincide: migrate no repara deriva manual
+        self.assertTrue(rbac.sync_roles()["skipped"])
+        Permission.objects.filter(codename="view_part").delete()
+        summary = rbac.sync_roles()
+        self.assertFalse(summary["skipped"])
+        self.assertNotEqual(SeedFingerprint.objects.get(name=rbac.FINGERPRINT_NAME).value, stored)
+
+    def test_runs_only_for_last_migrated_app(self):
+        with mock.patch.object(rbac, "sync_roles") as sync:
+            rbac.seed_on_migrate(apps.get_app_config("core"), verbosity=0)
+            sync.assert_not_called()
+            last = [c for c in apps.get_app_configs() if c.models_module is not None][-1]
+            rbac.seed_on_migrate(last, verbosity=0)
+            sync.assert_called_once()
+
+    @override_settings(DISABLE_USER_SEED=False)
+    def test_demo_users_created_once_without_rehashing(self):
+        User.objects.filter(username__in=[u[0] for u in rbac.DEMO_USERS]).delete()
+        with mock.patch.dict("os.environ", {"DISABLE_USER_SEED": "0"}):
+            self.assertEqual(rbac.ensure_demo_users(), ["admin_test", "asesor_test", "mecanico_test"])
+            with mock.patch.object(rbac, "make_password") as hasher:
+                self.assertEqual(rbac.ensure_demo_users(), [])
+                hasher.assert_not_called()
+        asesor = User.objects.get(username="asesor_test")
+        self.assertTrue(asesor.check_password("asesor123"))
+        self.assertEqual(list(asesor.groups.values_list("name", flat=True)), ["Asesor"])
+
+    def test_commands_delegate_to_rbac(self):
+        Group.objects.get(name="Asesor").permissions.clear()
+        call_command("bootstrap_roles", verbosity=0, stdout=mock.MagicMock())
+        self.assertEqual(self.perms_of("Asesor"), self.existing(rbac.ROLE_PERMS["Asesor"]))
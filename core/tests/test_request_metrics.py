@@ -0,0 +1,66 @@
+# core/tests/test_request_metrics.py
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from catalog.models import Part
+from workshop.logging_config import JsonFormatter
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("metrics", "m@example.com", "x")
+        Part.objects.bulk_create([Part(sku=f"MET-{i}", name=f"Parte {i}", price="1.00") for i in range(3)])
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_logs_structured_metrics_per_request(self):
+        with self.assertLogs("workshop.requests", level="INFO") as logs:
+            resp = self.api.get("/api/parts/")
+        self.assertEqual(resp.status_code, 200)
+        record = logs.records[-1]
+        m = record.metrics
+        self.assertEqual(m["method"], "GET")
+        self.assertEqual(m["view"], "part-list")
+        self.assertEqual(m["route"], "api/parts/")
+        self.assertEqual(m["status"], 200)
+        self.assertGreaterEqual(m["db_queries"], 1)
+        self.assertGreaterEqual(m["db_ms"], 0)
+        self.assertIsNotNone(m["render_ms"])
+        self.assertLessEqual(m["render_ms"], m["duration_ms"])
+        self.assertEqual(m["response_bytes"], len(resp.content))
+        self.assertEqual(record.levelno, logging.INFO)
+
+        line = json.loads(JsonFormatter().format(record))
+        self.assertEqual(line["logger"], "workshop.requests")
+        self.assertEqual(line["view"], "part-list")
+        self.assertEqual(line["db_queries"], m["db_queries"])
+
+    @override_settings(REQUEST_METRICS_SLOW_MS=0)
+    def test_slow_requests_are_warnings(self):
+        api = APIClient()
+        api.force_authenticate(self.user)
+        with self.assertLogs("workshop.requests", level="INFO") as logs:
+            api.get("/api/parts/")
+        self.assertEqual(logs.records[-1].levelno, logging.WARNING)
+
+    def test_unresolved_paths_still_logged(self):
+        with self.assertLogs("workshop.requests", level="INFO") as logs:
+            resp = self.api.get("/api/no-existe/")
+        self.assertEqual(resp.status_code, 404)
+        self.assertIsNone(logs.records[-1].metrics["view"])
+        self.assertEqual(logs.records[-1].metrics["db_queries"], 0)
+        self.assertIsNone(logs.records[-1].metrics["render_ms"])
+
+    def test_serializers_are_left_untouched(self):
+        from rest_framework import serializers
+
+        self.api.get("/api/parts/")
+        for cls in (serializers.Serializer, serializers.ListSerializer):
+            self.assertEqual(cls.data.fget.__module__, "rest_framework.serializers")
@@ -0,0 +1,81 @@
+# core/tests/test_roles.py
+from django.contrib.auth.models import Group, Permission, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core import roles
+from core.permissions import _user_in_any_group
+
+
+@override_settings(RBAC_CACHE_CHECK_INTERVAL=60)
+class RoleResolverTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.asesor_group, _ = Group.objects.get_or_create(name="Asesor")
+        cls.mecanico_group, _ = Group.objects.get_or_create(name="Mecanico")
+        cls.perm = Permission.objects.get(content_type__app_label="catalog", codename="add_part")
+
+    def setUp(self):
+        roles.cache.invalidate()
+        self.user = User.objects.create_user("rol_user", password="x")
+        self.user.groups.add(self.mecanico_group)
+
+    def fresh(self):
+        # simula un request nuevo: otro objeto user, sin caché por request
+        return User.objects.get(pk=self.user.pk)
+
+    def test_warm_path_costs_no_queries(self):
+        roles.resolve(self.fresh())  # calienta la caché del proceso
+        user = self.fresh()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(_user_in_any_group(user, {"Mecanico"}))
+            self.assertFalse(_user_in_any_group(user, {"Admin", "Asesor"}))
+            self.assertFalse(user.has_perm("catalog.add_part"))
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_group_membership_change_invalidates(self):
+        self.assertFalse(roles.user_in_any_group(self.fresh(), {"Asesor"}))
+        self.user.groups.add(self.asesor_group)
+        self.assertTrue(roles.user_in_any_group(self.fresh(), {"Asesor"}))
+        self.user.groups.remove(self.asesor_group)
+        self.assertFalse(roles.user_in_any_group(self.fresh(), {"Asesor"}))
+
+    def test_group_permission_change_invalidates(self):
+        self.assertFalse(self.fresh().has_perm("catalog.add_part"))
+        self.mecanico_group.permissions.add(self.perm)
+        self.assertTrue(self.fresh().has_perm("catalog.add_part"))
+        self.mecanico_group.permissions.remove(self.perm)
+        self.assertFalse(self.fresh().has_perm("catalog.add_part"))
+
+    def test_direct_user_permission_and_generation(self):
+        before = roles.version()
+        self.user.user_permissions.add(self.perm)
+        self.assertGreater(roles.version(), before)
+        self.assertTrue(self.fresh().has_perm("catalog.add_part"))
+
+    def test_other_process_change_seen_after_generation_check(self):
+        roles.resolve(self.fresh())
+        # cambio hecho "en otro proceso": sin señales en este
+        self.user.groups.through.objects.bulk_create([
+            self.user.groups.through(user_id=self.user.pk, group_id=self.asesor_group.pk)
+        ])
+        roles.bump()
+        self.assertTrue(roles.user_in_any_group(self.fresh(), {"Asesor"}))
+
+    def test_inactive_and_anonymous_have_no_perms(self):
+        self.mecanico_group.permissions.add(self.perm)
+        user = self.fresh()
+        user.is_active = False
+        self.assertFalse(user.has_perm("catalog.add_part"))
+        self.assertFalse(roles.user_has_perm(None, "catalog.add_part"))
+
+    def test_api_write_permission_follows_group(self):
+        api = APIClient()
+        api.force_authenticate(self.fresh())
+        payload = {"name": "Cliente Roles"}
+        self.assertEqual(api.post("/api/customers/", payload, format="json").status_code, 403)
+        self.user.groups.add(self.asesor_group)
+        api.force_authenticate(self.fresh())
+        self.assertEqual(api.post("/api/customers/", payload, format="json").status_code, 201)
@@ -0,0 +1,78 @@
+# core/tests/test_search.py
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import search
+from core.models import SearchToken
+from customers.models import Customer
+from quotes.models import Quotation
+from vehicles.models import Vehicle
+from workorders.models import WorkOrder
+
+
+class SearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.jose = Customer.objects.create(name="José Pérez")
+        cls.ana = Customer.objects.create(name="Ana Gómez")
+        cls.versa = Vehicle.objects.create(owner=cls.jose, plate="ABC-123", vin="3N1CN7AD5KL812345",
+                                           brand="Nissan", model="Versa", year=2019)
+        cls.q_jose = Quotation.objects.create(customer=cls.jose, vehicle=cls.versa, notes="Cambio de frenos")
+        cls.q_ana = Quotation.objects.create(customer=cls.ana, notes="Cliente referido por José")
+        cls.wo = WorkOrder.objects.create(customer=cls.jose, vehicle=cls.versa,
+                                          complaint="Ruido al frenar", diagnosis="Balatas gastadas")
+        cls.admin = User.objects.create_superuser("search_admin", "search@example.com", "secret123")
+
+    def ids(self, kind, query):
+        return [pk for pk, _ in search.search(kind, query)]
+
+    def test_accent_and_case_insensitive_prefix_match(self):
+        self.assertEqual(set(self.ids(search.QUOTATION, "jose")), {self.q_jose.pk, self.q_ana.pk})
+        self.assertEqual(self.ids(search.QUOTATION, "PÉR"), [self.q_jose.pk])
+        self.assertEqual(self.ids(search.WORKORDER, "balata"), [self.wo.pk])
+
+    def test_identifier_field_outranks_free_text(self):
+        # "jose" es el cliente de una y solo aparece en las notas de la otra
+        self.assertEqual(self.ids(search.QUOTATION, "jose")[0], self.q_jose.pk)
+
+    def test_plate_matches_with_or_without_separator_and_all_terms_required(self):
+        self.assertEqual(self.ids(search.QUOTATION, "abc123"), [self.q_jose.pk])
+        self.assertEqual(self.ids(search.WORKORDER, "abc-123 ruido"), [self.wo.pk])
+        self.assertEqual(self.ids(search.WORKORDER, "abc-123 motor"), [])
+
+    def test_prefix_ending_in_last_digit_or_letter(self):
+        # un rango manual [token, token+1) fallaba con '9'/'z' fuera de collations binarias
+        vehicle = Vehicle.objects.create(owner=self.ana, plate="QZ-2009", brand="Seat",
+                                         model="Ibiza", year=2009)
+        quotation = Quotation.objects.create(customer=self.ana, vehicle=vehicle)
+        for term in ("qz", "qz2009", "gomez qz"):
+            self.assertEqual(self.ids(search.QUOTATION, term), [quotation.pk], term)
+        self.assertIn("LIKE", str(SearchToken.objects.filter(search._prefix("q9")).query))
+
+    def test_related_rename_reindexes_documents(self):
+        self.versa.plate = "XYZ-987"
+        self.versa.save()
+        self.assertEqual(self.ids(search.QUOTATION, "xyz987"), [self.q_jose.pk])
+        self.assertEqual(self.ids(search.QUOTATION, "abc123"), [])
+
+    def test_delete_removes_tokens(self):
+        pk = self.q_ana.pk
+        self.q_ana.delete()
+        self.assertFalse(SearchToken.objects.filter(kind=search.QUOTATION, object_id=pk).exists())
+
+    def test_api_search_is_ranked(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        res = client.get("/api/quotations/", {"search": "jose", "summary": "1"})
+        self.assertEqual([r["id"] for r in res.json()], [self.q_jose.pk, self.q_ana.pk])
+        res = client.get("/api/workorders/", {"search": "frenar"})
+        self.assertEqual([r["id"] for r in res.json()], [self.wo.pk])
+
+    def test_rebuild_command(self):
+        SearchToken.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.ids(search.WORKORDER, "3n1cn7"), [self.wo.pk])
@@ -0,0 +1,54 @@
+# core/tests/test_sequences.py
+from django.test import TestCase, override_settings
+
+from core import sequences
+from core.models import DocumentSequence
+from customers.models import Customer
+from vehicles.models import Vehicle
+from quotes.models import Quotation
+from workorders.models import WorkOrder
+
+
+class DocumentSequenceTests(TestCase):
+    def setUp(self):
+        sequences.reset_pools()
+
+    def test_series_are_independent_per_prefix_and_year(self):
+        self.assertEqual(sequences.next_number("Q", year=2025), "Q-2025-0001")
+        self.assertEqual(sequences.next_number("Q", year=2025), "Q-2025-0002")
+        self.assertEqual(sequences.next_number("Q", year=2026), "Q-2026-0001")
+        self.assertEqual(sequences.next_number("OT", width=6, year=2025), "OT-2025-000001")
+
+    def test_allocate_numbers_reserves_a_contiguous_range(self):
+        sequences.next_value("OT", year=2025)
+        nums = sequences.allocate_numbers("OT", 3, width=6, year=2025)
+        self.assertEqual(nums, ["OT-2025-000002", "OT-2025-000003", "OT-2025-000004"])
+        self.assertEqual(DocumentSequence.objects.get(prefix="OT", year=2025).last_value, 4)
+
+    @override_settings(DOCUMENT_SEQUENCE_BLOCK_SIZE=10)
+    def test_block_reservation_serves_from_memory_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = sequences.next_value("Q", year=2025)
+        with self.assertNumQueries(0):
+            second = sequences.next_value("Q", year=2025)
+        self.assertEqual((first, second), (1, 2))
+        self.assertEqual(DocumentSequence.objects.get(prefix="Q", year=2025).last_value, 10)
+
+    @override_settings(DOCUMENT_SEQUENCE_BLOCK_SIZE=10)
+    def test_block_is_discarded_if_reservation_never_commits(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            sequences.next_value("Q", year=2025)
+        self.assertEqual(sequences.next_value("Q", year=2025, block_size=1), 11)
+
+    def test_quotation_and_workorder_draw_from_sequence(self):
+        c = Customer.objects.create(name="Cliente")
+        v = Vehicle.objects.create(owner=c, plate="P100-200", brand="Toyota", model="Yaris", year=2019)
+        year = sequences.current_year()
+
+        q1 = Quotation.objects.create(customer=c)
+        q2 = Quotation.objects.create(customer=c)
+        wo = WorkOrder.objects.create(customer=c, vehicle=v)
+
+        self.assertEqual(q1.number, f"Q-{year}-0001")
+        self.assertEqual(q2.number, f"Q-{year}-0002")
+        self.assertEqual(wo.number, f"OT-{year}-000001")
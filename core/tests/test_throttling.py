@@ -0,0 +1,159 @@
+# core/tests/test_throttling.py
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalog.models import Part
+from core.throttling import (
+    AnonTokenBucketThrottle,
+    ScopedTokenBucketThrottle,
+    TokenBucketStore,
+    UserTokenBucketThrottle,
+    get_store,
+)
+from core.views import PartViewSet
+from workshop.drf_config import REST_FRAMEWORK as PROD_DRF
+
+
+# worker independiente: 15 intentos contra un bucket de 20 compartido
+WORKER = (
+    "import sys, django; django.setup();"
+    "from core.throttling import TokenBucketStore;"
+    "store = TokenBucketStore(sys.argv[1], timeout=10);"
+    "print(sum(store.take('shared', 20, 0.0001)[0] for _ in range(15)))"
+)
+
+
+class TokenBucketStoreTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "throttle.sqlite3")
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def test_bucket_allows_burst_then_refills(self):
+        store = TokenBucketStore(self.path)
+        results = [store.take("k", 3, 1.0, now=100.0)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        # 1 token/s: 1.5 s después hay 1 token
+        self.assertTrue(store.take("k", 3, 1.0, now=101.5)[0])
+        self.assertFalse(store.take("k", 3, 1.0, now=101.5)[0])
+        # nunca supera la capacidad
+        allowed, tokens = store.take("k", 3, 1.0, now=10_000.0)
+        self.assertTrue(allowed)
+        self.assertEqual(tokens, 2)
+
+    def test_separate_connections_share_the_same_buckets(self):
+        a, b = TokenBucketStore(self.path), TokenBucketStore(self.path)
+        self.assertTrue(a.take("user_1", 2, 0.001, now=50.0)[0])
+        self.assertTrue(b.take("user_1", 2, 0.001, now=50.0)[0])
+        self.assertFalse(a.take("user_1", 2, 0.001, now=50.0)[0])
+        self.assertTrue(b.take("user_2", 2, 0.001, now=50.0)[0])
+
+    def test_limit_holds_across_processes(self):
+        TokenBucketStore(self.path).take("warmup", 1, 1.0)  # crea tabla/WAL antes de lanzar workers
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "workshop.settings")}
+        procs = [
+            subprocess.Popen([sys.executable, "-c", WORKER, self.path], cwd=settings.BASE_DIR, env=env,
+                             stdout=subprocess.PIPE, text=True)
+            for _ in range(3)
+        ]
+        allowed = sum(int(p.communicate(timeout=120)[0].strip()) for p in procs)
+        self.assertEqual(allowed, 20)
+
+    def test_purge_drops_idle_buckets(self):
+        store = TokenBucketStore(self.path)
+        store.take("old", 5, 1.0, now=0.0)
+        store.take("new", 5, 1.0, now=100_000.0)
+        store.purge(now=100_000.0)
+        keys = [r[0] for r in store._conn().execute("SELECT key FROM throttle_bucket")]
+        self.assertEqual(keys, ["new"])
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        override = override_settings(THROTTLE_STORE_PATH=os.path.join(tmp, "t.sqlite3"))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.factory = APIRequestFactory()
+
+    def request(self, user=None):
+        req = self.factory.get("/api/parts/", REMOTE_ADDR="10.0.0.7")
+        req.user = user or AnonymousUser()
+        return req
+
+    def test_user_throttle_counts_per_user_and_reports_wait(self):
+        class Throttle(UserTokenBucketThrottle):
+            THROTTLE_RATES = {"user": "2/min"}
+
+        user = SimpleNamespace(pk=7, is_authenticated=True)
+        results = [Throttle().allow_request(self.request(user), None) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        throttle = Throttle()
+        throttle.allow_request(self.request(user), None)
+        self.assertAlmostEqual(throttle.wait(), 30, delta=1)
+        other = SimpleNamespace(pk=8, is_authenticated=True)
+        self.assertTrue(Throttle().allow_request(self.request(other), None))
+
+    def test_scoped_throttle_by_action(self):
+        class Throttle(ScopedTokenBucketThrottle):
+            THROTTLE_RATES = {"bulk": "1/min"}
+
+        view = SimpleNamespace(throttle_scope={"bulk_price": "bulk"}, action="bulk_price")
+        self.assertTrue(Throttle().allow_request(self.request(), view))
+        self.assertFalse(Throttle().allow_request(self.request(), view))
+        # otras acciones del mismo ViewSet no tienen scope: sin límite
+        view.action = "list"
+        self.assertTrue(Throttle().allow_request(self.request(), view))
+
+    def test_store_errors_fail_open(self):
+        class Throttle(UserTokenBucketThrottle):
+            THROTTLE_RATES = {"user": "1/min"}
+
+        with override_settings(THROTTLE_STORE_PATH=os.path.join(self.id(), "no", "existe.sqlite3")):
+            self.assertTrue(Throttle().allow_request(self.request(), None))
+            self.assertTrue(Throttle().allow_request(self.request(), None))
+        self.assertIsInstance(get_store(), TokenBucketStore)
+
+
+class ScopedActionsSkipGeneralBucketTests(TestCase):
+    """Con las clases y tasas de producción (workshop.drf_config)."""
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        override = override_settings(THROTTLE_STORE_PATH=os.path.join(tmp, "t.sqlite3"))
+        override.enable()
+        self.addCleanup(override.disable)
+        rates = PROD_DRF["DEFAULT_THROTTLE_RATES"]
+        self.throttles = [
+            type(cls.__name__, (cls,), {"THROTTLE_RATES": rates})
+            for cls in (AnonTokenBucketThrottle, UserTokenBucketThrottle, ScopedTokenBucketThrottle)
+        ]
+        self.user = User.objects.create_user("throttle_user", password="x")
+        Part.objects.create(sku="BUJ-1", name="Bujía", price=10)
+        self.factory = APIRequestFactory()
+
+    def call(self, action, path):
+        view = PartViewSet.as_view({"get": action}, throttle_classes=self.throttles)
+        request = self.factory.get(path)
+        force_authenticate(request, user=self.user)
+        return view(request).status_code
+
+    def test_autocomplete_beyond_user_rate_does_not_drain_user_bucket(self):
+        self.assertEqual(PROD_DRF["DEFAULT_THROTTLE_RATES"]["user"], "120/min")
+        statuses = [self.call("autocomplete", "/api/parts/autocomplete/?q=bu") for _ in range(150)]
+        self.assertEqual(set(statuses), {200})
+        # el bucket general sigue lleno: 120 lecturas normales pasan, la 121 no
+        statuses = [self.call("list", "/api/parts/") for _ in range(121)]
+        self.assertEqual(statuses.count(200), 120)
+        self.assertEqual(statuses[-1], 429)
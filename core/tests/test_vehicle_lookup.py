@@ -0,0 +1,85 @@
+# core/tests/test_vehicle_lookup.py
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core import generations
+from customers.models import Customer
+from vehicles import lookup
+from vehicles.models import Vehicle
+
+
+class PlateLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = Customer.objects.create(name="Dueño Placa")
+        cls.vehicle = Vehicle.objects.create(owner=cls.owner, plate="abc-123", vin="3n1 cn7ad5", brand="Nissan",
+                                             model="Versa", year=2019)
+        cls.user = User.objects.create_user("placas", password="secret123")
+
+    def setUp(self):
+        lookup.cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_normalized_columns_are_persisted(self):
+        self.assertEqual(self.vehicle.plate_normalized, "ABC123")
+        self.assertEqual(self.vehicle.vin_normalized, "3N1CN7AD5")
+
+    def test_lookup_normalizes_input_and_matches_vin(self):
+        for value in ("ABC123", "abc 123", "Abc-1.23"):
+            res = self.client.get(f"/api/vehicles/by-plate/{value}/")
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()["id"], self.vehicle.pk)
+        self.assertEqual(self.client.get("/api/vehicles/by-plate/3N1CN7AD5/").json()["id"], self.vehicle.pk)
+        self.assertEqual(self.client.get("/api/vehicles/by-plate/ZZZ999/").status_code, 404)
+
+    def test_repeat_hits_skip_the_database(self):
+        lookup.lookup("ABC123", lambda v: {"id": v.pk})
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(lookup.lookup("abc-123", lambda v: {"id": v.pk}), {"id": self.vehicle.pk})
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_save_invalidates_including_old_plate(self):
+        lookup.lookup("ABC123", lambda v: {"plate": v.plate})
+        self.vehicle.plate = "XYZ-987"
+        self.vehicle.save()
+        self.assertIsNone(lookup.lookup("ABC123", lambda v: {"plate": v.plate}))
+        self.assertEqual(lookup.lookup("xyz987", lambda v: {"plate": v.plate}), {"plate": "XYZ-987"})
+
+    def test_change_in_another_process_is_seen_via_generation(self):
+        serialize = lambda v: {"plate": v.plate, "owner": v.owner.name}  # noqa: E731
+        self.assertEqual(lookup.lookup("ABC123", serialize)["plate"], "abc-123")
+        # otro worker: cambia la fila (sin señales en este proceso) y sube la generación
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(plate="abc-123 (editada)")
+        generations.bump(lookup.GENERATION)
+        with override_settings(VEHICLE_LOOKUP_CHECK_INTERVAL=0):
+            self.assertEqual(lookup.lookup("ABC123", serialize)["plate"], "abc-123 (editada)")
+            Vehicle.objects.filter(pk=self.vehicle.pk).delete()
+            generations.bump(lookup.GENERATION)
+            self.assertIsNone(lookup.lookup("ABC123", serialize))
+
+    def test_owner_rename_invalidates(self):
+        serialize = lambda v: {"owner": v.owner.name}  # noqa: E731
+        lookup.lookup("ABC123", serialize)
+        self.owner.name = "Dueño Renombrado"
+        self.owner.save()
+        self.assertEqual(lookup.lookup("ABC123", serialize), {"owner": "Dueño Renombrado"})
+
+    def test_duplicate_plates_are_reported_not_picked(self):
+        twin = Vehicle.objects.create(owner=self.owner, plate="ABC 123", brand="Nissan", model="March", year=2018)
+        with self.assertRaises(lookup.DuplicateVehicle) as ctx:
+            lookup.lookup("abc123", lambda v: {"id": v.pk})
+        self.assertEqual(ctx.exception.pks, [self.vehicle.pk, twin.pk])
+        res = self.client.get("/api/vehicles/by-plate/ABC123/")
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res.json()["ids"], [self.vehicle.pk, twin.pk])
+
+    def test_cache_is_bounded(self):
+        small = lookup.LRUCache(maxsize=2, ttl=60)
+        for i in range(3):
+            small.set(f"K{i}", i, {"id": i})
+        self.assertIsNone(small.get("K0"))
+        self.assertEqual(len(small), 2)
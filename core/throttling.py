@@ -0,0 +1,187 @@
+# core/throttling.py
+"""
+Throttling DRF con token bucket compartido entre procesos.
+
+Los throttles de DRF guardan el historial de timestamps en la caché de Django; con
+LocMemCache cada worker cuenta por su lado y cada request lee y reescribe la lista.
+Aquí cada clave es una fila (tokens, ts) en un SQLite local en modo WAL que todos
+los workers del servidor comparten, y se actualiza con un único UPSERT atómico:
+O(1) por request y límites correctos entre procesos.
+
+  rate "120/min" -> capacidad 120, recarga 2 tokens/s (ráfagas hasta la capacidad)
+
+Las acciones con `throttle_scope` propio (p. ej. autocomplete a 600/min) solo
+consumen su bucket de scope: los límites generales "anon"/"user" no las cuentan,
+de lo contrario el tope efectivo sería el menor de los dos y cada tecla gastaría
+el bucket general del usuario.
+
+Settings:
+  THROTTLE_STORE_PATH     archivo SQLite (por defecto en el directorio temporal)
+  THROTTLE_IDLE_SECONDS   filas sin uso se purgan tras este tiempo (1 día)
+  THROTTLE_ENABLED        False desactiva todos los límites (p. ej. `manage.py bench`)
+
+Si el almacén falla (disco, bloqueo prolongado) se deja pasar el request y se
+registra un warning: un limitador caído no debe tumbar la API.
+"""
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+logger = logging.getLogger(__name__)
+
+PURGE_EVERY = 1000  # llamadas por proceso entre purgas de filas inactivas
+
+_TAKE_SQL = """
+INSERT INTO throttle_bucket (key, tokens, ts, allowed) VALUES (:key, :capacity - 1, :now, 1)
+ON CONFLICT(key) DO UPDATE SET
+    tokens = MIN(:capacity, tokens + MAX(0, :now - ts) * :rate)
+             - (MIN(:capacity, tokens + MAX(0, :now - ts) * :rate) >= 1),
+    allowed = MIN(:capacity, tokens + MAX(0, :now - ts) * :rate) >= 1,
+    ts = MAX(ts, :now)
+RETURNING allowed, tokens
+"""
+
+
+def default_store_path() -> str:
+    return getattr(settings, "THROTTLE_STORE_PATH", None) or os.path.join(
+        tempfile.gettempdir(), "workshop_throttle.sqlite3"
+    )
+
+
+class TokenBucketStore:
+    """Buckets en un archivo SQLite (WAL); una conexión por hilo y proceso."""
+
+    def __init__(self, path: str, timeout: float = 1.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._calls = 0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            # autocommit: cada UPSERT es su propia transacción
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_bucket ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, ts REAL NOT NULL, allowed INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def take(self, key: str, capacity: int, rate: float, now: float = None):
+        """
+        Consume 1 token de `key` si hay. Devuelve (permitido, tokens restantes).
+        `rate` en tokens por segundo.
+        """
+        now = time.time() if now is None else now
+        conn = self._conn()
+        allowed, tokens = conn.execute(
+            _TAKE_SQL, {"key": key, "capacity": capacity, "rate": rate, "now": now}
+        ).fetchone()
+        self._calls += 1
+        if self._calls % PURGE_EVERY == 0:
+            self.purge(now)
+        return bool(allowed), tokens
+
+    def purge(self, now: float = None):
+        """Borra buckets inactivos (tras THROTTLE_IDLE_SECONDS ya estarían llenos)."""
+        now = time.time() if now is None else now
+        idle = getattr(settings, "THROTTLE_IDLE_SECONDS", 86400)
+        self._conn().execute("DELETE FROM throttle_bucket WHERE ts < ?", (now - idle,))
+
+    def reset(self):
+        self._conn().execute("DELETE FROM throttle_bucket")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store() -> TokenBucketStore:
+    path = default_store_path()
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(path, TokenBucketStore(path))
+    return store
+
+
+def view_scope(view, attr: str = "throttle_scope"):
+    """Scope de la acción actual: `throttle_scope` texto, o dict acción -> scope."""
+    scope = getattr(view, attr, None)
+    if isinstance(scope, dict):
+        scope = scope.get(getattr(view, "action", None))
+    return scope or None
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Base: misma configuración que SimpleRateThrottle (scope/rate, THROTTLE_RATES,
+    get_cache_key), pero con token bucket en TokenBucketStore en vez de historial en caché.
+    Con `defer_to_scope`, no limita las acciones que tienen su propio scope.
+    """
+
+    defer_to_scope = False
+
+    def allow_request(self, request, view):
+        if self.rate is None or not getattr(settings, "THROTTLE_ENABLED", True):
+            return True
+        if self.defer_to_scope and view_scope(view):
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.refill_rate = self.num_requests / float(self.duration)
+        try:
+            allowed, self.tokens = get_store().take(self.key, self.num_requests, self.refill_rate, self.timer())
+        except sqlite3.Error:
+            logger.warning("Throttle: almacén no disponible; se permite el request", exc_info=True)
+            return True
+        return allowed
+
+    def wait(self):
+        """Segundos hasta que haya 1 token."""
+        return max(0.0, (1 - self.tokens) / self.refill_rate)
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle, AnonRateThrottle):
+    """Anónimos por IP (scope "anon"), salvo acciones con scope propio."""
+
+    defer_to_scope = True
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle, UserRateThrottle):
+    """Usuarios por id (scope "user"), salvo acciones con scope propio."""
+
+    defer_to_scope = True
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle, ScopedRateThrottle):
+    """
+    Por endpoint: usa `throttle_scope` de la vista, que puede ser un texto o un
+    dict acción -> scope (p. ej. {"bulk_price": "bulk"}) para limitar solo
+    algunas acciones de un ViewSet. Sin scope, no limita.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = view_scope(view, self.scope_attr)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return TokenBucketThrottle.allow_request(self, request, view)
@@ -0,0 +1,56 @@
+# core/tokens.py
+"""
+JWT con claims de rol (grupos, permisos y versión de RBAC).
+
+El access token lleva:
+  username, is_staff, is_superuser
+  roles  -> nombres de grupo
+  perms  -> "app_label.codename" (vacío para superusuarios: tienen todos)
+  rbac_v -> core.roles.version() al emitirlo
+
+core.authentication.RoleClaimsJWTAuthentication confía en estos claims para
+lecturas mientras rbac_v siga vigente; cualquier cambio de grupos/permisos (o de
+estado de la cuenta) incrementa la versión y el token vuelve al camino con BD.
+Al refrescar, el access nuevo se vuelve a sellar con los roles actuales.
+"""
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import roles
+
+ROLES_CLAIM = "roles"
+PERMS_CLAIM = "perms"
+VERSION_CLAIM = "rbac_v"
+
+
+def add_role_claims(token, user):
+    """Sella `token` con los roles/permisos actuales de `user`."""
+    resolved = roles.resolve(user)
+    token["username"] = user.get_username()
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token[ROLES_CLAIM] = sorted(resolved.groups)
+    token[PERMS_CLAIM] = [] if user.is_superuser else sorted(resolved.perms)
+    token[VERSION_CLAIM] = roles.version()
+    return token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_role_claims(super().get_token(user), user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        if access.get(VERSION_CLAIM) != roles.version():
+            user = get_user_model().objects.filter(
+                **{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}
+            ).first()
+            if user is not None:
+                data["access"] = str(add_role_claims(access, user))
+        return data
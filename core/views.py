@@ -1,5 +1,11 @@
 # core/views.py
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+
+from . import roles, search
+from .filters import IndexedSearchFilter
 
 from .serializers import (
     CustomerSerializer,
@@ -10,7 +16,10 @@ from .serializers import (
 )
 
 from customers.models import Customer
+from vehicles import lookup as vehicle_lookup
 from vehicles.models import Vehicle
+from catalog import autocomplete, bulk_prices, importer
+from catalog.serializers import BulkPriceUpdateSerializer
 from catalog.models import Service, Part
 from workorders.models import WorkOrder
 
@@ -28,35 +37,152 @@ class IsAsesorOrAdminForUnsafe(permissions.BasePermission):
             return True
         return (
             request.user.is_superuser
-            or request.user.groups.filter(name__in=["Admin", "Asesor"]).exists()
+            or roles.user_in_any_group(request.user, ("Admin", "Asesor"))
         )
 
 
+def _autocomplete(request, kind):
+    """Cuerpo común de /api/parts/autocomplete/ y /api/services/autocomplete/."""
+    q = request.query_params.get("q", "")
+    try:
+        limit = int(request.query_params.get("limit", autocomplete.DEFAULT_LIMIT))
+    except ValueError:
+        limit = autocomplete.DEFAULT_LIMIT
+    return Response(autocomplete.suggest(kind, q, limit) if q.strip() else [])
+
+
+def _bulk_price_update(request, kind):
+    """Cuerpo común de /api/parts/bulk-price/ y /api/services/bulk-price/."""
+    model, _ = bulk_prices.KINDS[kind]
+    perm = f"{model._meta.app_label}.change_{model._meta.model_name}"
+    if not request.user.has_perm(perm):
+        return Response({"detail": f"Requiere permiso {perm}."}, status=403)
+
+    ser = BulkPriceUpdateSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    data = ser.validated_data
+    try:
+        if data.get("file") is not None:
+            prices = bulk_prices.parse_price_csv(data["file"].read())
+            result = bulk_prices.apply_price_list(kind, prices, dry_run=data["dry_run"])
+        elif data.get("prices") is not None:
+            prices = [(row["code"], row["price"]) for row in data["prices"]]
+            result = bulk_prices.apply_price_list(kind, prices, dry_run=data["dry_run"])
+        else:
+            result = bulk_prices.adjust_prices(
+                kind,
+                percent=data.get("percent"),
+                amount=data.get("amount"),
+                code_prefix=data.get("code_prefix"),
+                unit=data.get("unit"),
+                is_active=data.get("is_active"),
+                dry_run=data["dry_run"],
+            )
+    except bulk_prices.PriceListError as exc:
+        return Response({"detail": str(exc)}, status=400)
+    return Response(result)
+
+
 class CustomerViewSet(viewsets.ModelViewSet):
     queryset = Customer.objects.all().order_by("id")
     serializer_class = CustomerSerializer
     permission_classes = [IsAsesorOrAdminForUnsafe]
+    query_budgets = {"list": 1, "retrieve": 1}  # core.query_budget
 
 
 class VehicleViewSet(viewsets.ModelViewSet):
     queryset = Vehicle.objects.all().order_by("id")
     serializer_class = VehicleSerializer
     permission_classes = [IsAsesorOrAdminForUnsafe]
+    query_budgets = {"list": 1, "retrieve": 1}  # core.query_budget
+
+    @action(detail=False, methods=["get"], url_path=r"by-plate/(?P<plate>[^/]+)")
+    def by_plate(self, request, plate=None):
+        """
+        Vehículo por placa o VIN, sin importar mayúsculas, espacios o guiones
+        ("abc 123" == "ABC-123"). Aciertos repetidos salen de caché en memoria.
+        409 con los ids si la placa se repite en varios vehículos.
+        """
+        try:
+            data = vehicle_lookup.lookup(plate, lambda v: dict(VehicleSerializer(v).data))
+        except vehicle_lookup.DuplicateVehicle as exc:
+            return Response(
+                {"detail": "La placa/VIN corresponde a varios vehículos.", "ids": exc.pks},
+                status=409,
+            )
+        if data is None:
+            return Response({"detail": "Vehículo no encontrado."}, status=404)
+        return Response(data)
 
 
 class ServiceViewSet(viewsets.ModelViewSet):
     queryset = Service.objects.all().order_by("id")
     serializer_class = ServiceSerializer
     permission_classes = [IsAsesorOrAdminForUnsafe]
+    # límites por endpoint (core.throttling.ScopedTokenBucketThrottle)
+    throttle_scope = {"autocomplete": "autocomplete", "bulk_price": "bulk"}
+    query_budgets = {"list": 1, "retrieve": 1}
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """?q=<texto>&limit=10 -> coincidencias por prefijo de código o palabra del nombre (índice en memoria)."""
+        return _autocomplete(request, "service")
+
+    @action(detail=False, methods=["post"], url_path="bulk-price")
+    def bulk_price(self, request):
+        """Actualización masiva de precios (ajuste % / monto con filtros, o lista/CSV). Ver catalog.bulk_prices."""
+        return _bulk_price_update(request, "service")
 
 
 class PartViewSet(viewsets.ModelViewSet):
     queryset = Part.objects.all().order_by("id")
     serializer_class = PartSerializer
     permission_classes = [IsAsesorOrAdminForUnsafe]
+    throttle_scope = {"autocomplete": "autocomplete", "bulk_price": "bulk", "import_catalog": "bulk"}
+    query_budgets = {"list": 1, "retrieve": 1}
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """?q=<texto>&limit=10 -> coincidencias por prefijo de código o palabra del nombre (índice en memoria)."""
+        return _autocomplete(request, "part")
+
+    @action(detail=False, methods=["post"], url_path="bulk-price")
+    def bulk_price(self, request):
+        """Actualización masiva de precios (ajuste % / monto con filtros, o lista/CSV). Ver catalog.bulk_prices."""
+        return _bulk_price_update(request, "part")
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_catalog(self, request):
+        """
+        Sube un catálogo de proveedor (multipart "file", .csv o .jsonl) y lo aplica por SKU
+        en streaming (ver catalog.importer). ?dry_run=1 solo compara.
+        """
+        for perm in ("catalog.add_part", "catalog.change_part"):
+            if not request.user.has_perm(perm):
+                return Response({"detail": f"Requiere permiso {perm}."}, status=403)
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Falta el archivo (campo 'file')."}, status=400)
+        try:
+            fmt = request.data.get("format") or importer.guess_format(upload.name)
+            records = importer.iter_records(upload.file, fmt)
+            dry_run = str(request.query_params.get("dry_run", "")).lower() in ("1", "true")
+            result = importer.import_parts(records, dry_run=dry_run)
+        except importer.ImportFormatError as exc:
+            body = {"detail": str(exc)}
+            if exc.line:
+                body["line"] = exc.line
+            if exc.result:
+                body["applied"] = exc.result  # lotes previos al error ya quedaron escritos
+            return Response(body, status=400)
+        return Response(result)
 
 
 class WorkOrderViewSet(viewsets.ModelViewSet):
     queryset = WorkOrder.objects.all().order_by("id")
     serializer_class = WorkOrderSerializer
+    keyset_ordering = ("-opened_at", "-id")  # ?pagination=cursor
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter]
+    search_index = search.WORKORDER  # ?search=
+    query_budgets = {"list": 1, "retrieve": 1}
     permission_classes = [IsAsesorOrAdminForUnsafe]
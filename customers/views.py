@@ -2,6 +2,7 @@
 from rest_framework import viewsets, permissions
 from rest_framework.permissions import IsAuthenticated
 
+from core import roles
 from core.models import Customer, Vehicle, WorkLog
 from workorders.models import WorkOrder
 from catalog.models import Service, Part
@@ -29,10 +30,7 @@ class IsAsesorCanCreate(permissions.BasePermission):
             return False
         if request.user.is_superuser:
             return True
-        groups = set(request.user.groups.values_list("name", flat=True))
-        if "Admin" in groups or "Asesor" in groups:
-            return True
-        return False
+        return roles.user_in_any_group(request.user, ("Admin", "Asesor"))
 
 
 class CustomerViewSet(viewsets.ModelViewSet):
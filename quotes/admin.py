@@ -15,4 +15,6 @@ class QuotationAdmin(admin.ModelAdmin):
     list_display = ("number", "status", "customer", "vehicle", "grand_total", "valid_until", "created_at")
     search_fields = ("number", "customer__name", "vehicle__plate", "vehicle__vin")
     list_filter = ("status", "valid_until", "created_at")
+    # vehicle es nullable: el admin no lo une solo en el changelist
+    list_select_related = ("customer", "vehicle")
     inlines = [QuotationServiceInline, QuotationPartInline]
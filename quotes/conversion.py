@@ -0,0 +1,128 @@
+# quotes/conversion.py
+"""
+Conversión de cotizaciones APROBADAS a órdenes de trabajo, por lotes.
+
+Por lote de cotizaciones el costo es fijo (no depende de cuántos renglones traigan):
+  1 SELECT FOR UPDATE + 1 SELECT de cotizaciones + reserva de números OT + 1 INSERT
+  de órdenes + 1 SELECT y 1 INSERT por tipo de renglón (servicios / partes).
+"""
+from django.db import IntegrityError, transaction
+
+from core import search
+from core.sequences import allocate_numbers
+
+from .models import Quotation, QuotationService, QuotationPart
+
+# resultados por cotización
+OK = "ok"
+NOT_FOUND = "not_found"
+NOT_APPROVED = "not_approved"
+ALREADY_CONVERTED = "already_converted"
+MISSING_VEHICLE = "missing_vehicle"
+
+
+def convert_to_workorders(ids, batch_size: int = 500) -> list:
+    """
+    Crea una WorkOrder por cada cotización aprobada de `ids` y copia sus renglones 1:1.
+    Todo en una transacción: si algo falla no queda ninguna orden a medias.
+
+    Las cotizaciones se bloquean (select_for_update) antes de revisar si ya tienen
+    orden, así dos conversiones concurrentes de la misma se serializan y la segunda la
+    reporta como already_converted. Si aun así el OneToOne WorkOrder.quotation choca
+    (una orden creada por otro camino), se revierte el lote y se reintenta una vez:
+    la relectura marca esas cotizaciones como already_converted.
+    Devuelve [{"id", "result", "workorder_id", "workorder_number"}] en el orden recibido.
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return []
+    for attempt in (1, 2):
+        outcome = {pk: {"id": pk, "result": NOT_FOUND, "workorder_id": None, "workorder_number": None}
+                   for pk in ids}
+        try:
+            _convert(ids, outcome, batch_size)
+        except IntegrityError:
+            if attempt == 2:
+                raise
+            continue
+        return [outcome[pk] for pk in ids]
+
+
+def _load(ids) -> list:
+    """Estado actual de las cotizaciones (bloqueadas antes por el llamador)."""
+    return list(
+        Quotation.objects.filter(pk__in=ids)
+        .values_list("pk", "number", "status", "customer_id", "vehicle_id", "workorder__id")
+    )
+
+
+def _convert(ids, outcome, batch_size):
+    # Import tardío para evitar ciclos
+    from workorders.models import WorkOrder, WorkOrderService, WorkOrderPart
+
+    with transaction.atomic():
+        # bloqueo aparte: FOR UPDATE con el LEFT JOIN a la orden no es válido en todos los motores
+        list(Quotation.objects.select_for_update().filter(pk__in=ids).order_by("pk").values_list("pk", flat=True))
+        todo = []
+        for pk, number, st, customer_id, vehicle_id, wo_id in _load(ids):
+            if st != Quotation.APPROVED:
+                outcome[pk]["result"] = NOT_APPROVED
+            elif wo_id is not None:
+                outcome[pk].update(result=ALREADY_CONVERTED, workorder_id=wo_id)
+            elif vehicle_id is None:
+                outcome[pk]["result"] = MISSING_VEHICLE
+            else:
+                todo.append((pk, number, customer_id, vehicle_id))
+        if not todo:
+            return
+
+        # números OT-YYYY-NNNNNN reservados de una vez (WorkOrder.save no se llama en bulk_create)
+        numbers = allocate_numbers(WorkOrder.NUMBER_PREFIX, len(todo), width=6)
+        orders = [
+            WorkOrder(
+                number=wo_number,
+                customer_id=customer_id,
+                vehicle_id=vehicle_id,
+                quotation_id=pk,
+                status=WorkOrder.OPEN,
+                notes=f"Generada desde cotización {number}",
+            )
+            for (pk, number, customer_id, vehicle_id), wo_number in zip(todo, numbers)
+        ]
+        WorkOrder.objects.bulk_create(orders, batch_size=batch_size)
+        if any(o.pk is None for o in orders):
+            # backend sin RETURNING en INSERT masivo: recuperar ids por número
+            by_number = dict(WorkOrder.objects.filter(number__in=numbers).values_list("number", "pk"))
+            for o in orders:
+                o.pk = by_number[o.number]
+        wo_by_quotation = {o.quotation_id: o for o in orders}
+
+        _copy_lines(QuotationService, WorkOrderService, "service_id", wo_by_quotation, batch_size)
+        _copy_lines(QuotationPart, WorkOrderPart, "part_id", wo_by_quotation, batch_size)
+        # bulk_create no dispara post_save: indexar aquí las órdenes nuevas
+        search.reindex(search.WORKORDER, [o.pk for o in orders])
+
+    for qid, wo in wo_by_quotation.items():
+        outcome[qid].update(result=OK, workorder_id=wo.pk, workorder_number=wo.number)
+
+
+def _copy_lines(source_model, target_model, item_field, wo_by_quotation, batch_size):
+    """1 SELECT de renglones de todas las cotizaciones + 1 bulk_create en la orden destino."""
+    rows = (
+        source_model.objects.filter(quotation_id__in=list(wo_by_quotation))
+        .order_by("pk")
+        .values_list("quotation_id", item_field, "quantity", "unit_price", "discount")
+    )
+    target_model.objects.bulk_create(
+        [
+            target_model(
+                workorder_id=wo_by_quotation[qid].pk,
+                quantity=quantity,
+                unit_price=unit_price,
+                discount=discount,
+                **{item_field: item_id},
+            )
+            for qid, item_id, quantity, unit_price, discount in rows
+        ],
+        batch_size=batch_size,
+    )
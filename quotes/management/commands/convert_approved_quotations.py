@@ -0,0 +1,50 @@
+# quotes/management/commands/convert_approved_quotations.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from quotes import conversion
+from quotes.models import Quotation
+
+
+class Command(BaseCommand):
+    help = (
+        "Convierte en órdenes de trabajo las cotizaciones APROBADAS que aún no tienen una. "
+        "Cada lote va en su propia transacción, con números OT preasignados y renglones "
+        "insertados con bulk_create (ver quotes.conversion)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", nargs="*", type=int, default=None,
+                            help="Solo estas cotizaciones (por defecto, todas las aprobadas sin OT).")
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="Cotizaciones por lote/transacción.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Solo cuenta las candidatas, sin convertir.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        ids_qs = (
+            Quotation.objects.filter(status=Quotation.APPROVED, workorder__isnull=True)
+            .order_by("pk").values_list("pk", flat=True)
+        )
+        if options["ids"]:
+            ids_qs = ids_qs.filter(pk__in=options["ids"])
+        ids = list(ids_qs)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{len(ids)} cotizaciones aprobadas pendientes de convertir.")
+            return
+
+        counts = {}
+        size = max(options["chunk_size"], 1)
+        for start in range(0, len(ids), size):
+            for res in conversion.convert_to_workorders(ids[start:start + size]):
+                counts[res["result"]] = counts.get(res["result"], 0) + 1
+
+        elapsed = time.monotonic() - started
+        created = counts.pop(conversion.OK, 0)
+        skipped = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {created} órdenes de trabajo creadas ({elapsed:.2f}s)." + (f" Omitidas: {skipped}." if skipped else "")
+        ))
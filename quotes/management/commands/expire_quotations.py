@@ -0,0 +1,37 @@
+# quotes/management/commands/expire_quotations.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from quotes.models import Quotation
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa a EXPIRED las cotizaciones en borrador/enviadas con valid_until vencida. "
+        "Trabaja por lotes de UPDATE (una transacción por lote); pensado para correr "
+        "desde el Programador de tareas (ver scripts/setup_expiry_job.ps1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Cotizaciones por lote (1 SELECT de ids + 1 UPDATE).")
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Corta después de N lotes (el resto queda para la próxima corrida).")
+        parser.add_argument("--today", default=None,
+                            help="Fecha de corte YYYY-MM-DD (por defecto, hoy).")
+
+    def handle(self, *args, **options):
+        today = None
+        if options["today"]:
+            today = parse_date(options["today"])
+            if today is None:
+                raise CommandError(f"Fecha inválida: {options['today']!r} (use YYYY-MM-DD).")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser >= 1.")
+
+        stats = Quotation.expire_due(
+            today=today, chunk_size=options["chunk_size"], max_batches=options["max_batches"]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {stats['expired']} cotizaciones vencidas en {stats['batches']} lotes ({stats['elapsed']:.2f}s)."
+        ))
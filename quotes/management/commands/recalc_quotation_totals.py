@@ -0,0 +1,58 @@
+# quotes/management/commands/recalc_quotation_totals.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from quotes.models import Quotation, QuotationService, QuotationPart
+from quotes.pricing import cents_to_decimal, subtotals_by_quotation
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde cero los totales persistidos de las cotizaciones. "
+        "Operación de reparación: el día a día se mantiene por delta al guardar renglones. "
+        "Trabaja por lotes de ids con el motor de precios vectorizado (quotes.pricing)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", nargs="*", type=int, default=None,
+                            help="Solo estas cotizaciones (por defecto, todas).")
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Cotizaciones por lote (1 SELECT por tipo de renglón + 1 UPDATE).")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        ids_qs = Quotation.objects.order_by("pk").values_list("pk", flat=True)
+        if options["ids"]:
+            ids_qs = ids_qs.filter(pk__in=options["ids"])
+
+        chunk, count = [], 0
+        for pk in ids_qs.iterator(chunk_size=options["chunk_size"]):
+            chunk.append(pk)
+            if len(chunk) >= options["chunk_size"]:
+                count += self._repair(chunk)
+                chunk = []
+        if chunk:
+            count += self._repair(chunk)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"✔ Totales recalculados en {count} cotizaciones ({elapsed:.2f}s)."))
+
+    def _repair(self, pks) -> int:
+        # rango de ids en vez de IN (...) para no topar el límite de parámetros de SQL Server
+        lo, hi = pks[0], pks[-1]
+        services = subtotals_by_quotation(QuotationService.objects.filter(quotation_id__gte=lo, quotation_id__lte=hi))
+        parts = subtotals_by_quotation(QuotationPart.objects.filter(quotation_id__gte=lo, quotation_id__lte=hi))
+
+        now = timezone.now()
+        wanted = set(pks)
+        quotations = [
+            q for q in Quotation.objects.filter(pk__gte=lo, pk__lte=hi).only("pk", "discount_total", "tax_total")
+            if q.pk in wanted
+        ]
+        for q in quotations:
+            q.set_totals(cents_to_decimal(services.get(q.pk, 0)), cents_to_decimal(parts.get(q.pk, 0)))
+            q.updated_at = now
+        Quotation.objects.bulk_update(quotations, Quotation.TOTAL_FIELDS, batch_size=500)
+        return len(quotations)
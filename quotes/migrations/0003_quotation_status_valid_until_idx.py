@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_alter_customer_options_and_more'),
+        ('quotes', '0002_quotation_q_subtot_services_gte_0_and_more'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quotation',
+            index=models.Index(fields=['status', 'valid_until'], name='quot_status_valid_until_idx'),
+        ),
+    ]
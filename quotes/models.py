@@ -1,7 +1,12 @@
-from django.db import models
+import time
+
+from django.db import models, transaction, IntegrityError
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models import Q, F, CheckConstraint
+from django.db.models import Q, F, Case, When, Value, CheckConstraint
+from django.db.models.lookups import GreaterThan
+from core.sequences import next_number
+from .pricing import sum_line_totals
 from decimal import Decimal, ROUND_HALF_UP
 
 # ----------------- Util redondeo -----------------
@@ -15,6 +20,14 @@ def q2(x) -> Decimal:
     return d.quantize(TWOPL, rounding=ROUND_HALF_UP)
 
 
+def quantize_line(line):
+    """Cuantiza cantidad/precio/descuento de un renglón (lo mismo que hace save())."""
+    line.quantity = q2(line.quantity or 0)
+    line.unit_price = q2(line.unit_price or 0)
+    line.discount = q2(line.discount or 0)
+    return line
+
+
 class Quotation(models.Model):
     DRAFT = "DRAFT"
     SENT = "SENT"
@@ -29,6 +42,8 @@ class Quotation(models.Model):
         (EXPIRED, "Vencida"),
     ]
 
+    NUMBER_PREFIX = "Q"
+
     number = models.CharField("Número", max_length=20, unique=True)
     status = models.CharField("Estado", max_length=10, choices=STATUS_CHOICES, default=DRAFT)
 
@@ -52,7 +67,14 @@ class Quotation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=["number"]), models.Index(fields=["status"])]
+        indexes = [
+            models.Index(fields=["number"]),
+            models.Index(fields=["status"]),
+            # barrido de vencimiento: WHERE status IN (...) AND valid_until < hoy
+            models.Index(fields=["status", "valid_until"], name="quot_status_valid_until_idx"),
+            # paginación por cursor (-created_at, -id)
+            models.Index(fields=["created_at", "id"], name="quot_created_id_idx"),
+        ]
         constraints = [
             CheckConstraint(check=Q(subtotal_services__gte=0), name="q_subtot_services_gte_0"),
             CheckConstraint(check=Q(subtotal_parts__gte=0),   name="q_subtot_parts_gte_0"),
@@ -73,8 +95,8 @@ class Quotation(models.Model):
     def allowed_transitions(cls):
         choices = set(cls.status_values())
         default = {
-            cls.DRAFT: {cls.SENT, cls.REJECTED},
-            cls.SENT: {cls.APPROVED, cls.REJECTED},
+            cls.DRAFT: {cls.SENT, cls.REJECTED, cls.EXPIRED},
+            cls.SENT: {cls.APPROVED, cls.REJECTED, cls.EXPIRED},
             cls.APPROVED: set(),
             cls.REJECTED: set(),
             cls.EXPIRED: set(),
@@ -90,14 +112,85 @@ class Quotation(models.Model):
             return True
         return to_status in table[cur]
 
+    @classmethod
+    def bulk_transition(cls, ids, to_status: str, chunk_size: int = 1000) -> list:
+        """
+        Cambia de estado muchas cotizaciones con la tabla de transiciones en memoria:
+        1 SELECT (id, status) + 1 UPDATE por estado de origen y por lote de ids.
+        El UPDATE filtra también por el estado de origen, así un cambio concurrente
+        no se pisa (queda como "conflict").
+        Devuelve [{"id", "result", "from"}] en el orden recibido, con result en
+        ok | invalid_transition | not_found | conflict.
+        """
+        ids = list(dict.fromkeys(ids))  # sin duplicados, conserva orden
+        table = cls.allowed_transitions()
+        valid_target = to_status in cls.status_values()
+        now = timezone.now()
+
+        current, outcome = {}, {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            current.update(cls.objects.filter(pk__in=chunk).values_list("pk", "status"))
+
+            by_source = {}
+            for pk in chunk:
+                src = current.get(pk)
+                if src is None:
+                    outcome[pk] = "not_found"
+                elif not valid_target or (src in table and to_status not in table[src]):
+                    outcome[pk] = "invalid_transition"
+                else:
+                    by_source.setdefault(src, []).append(pk)
+
+            for src, pks in by_source.items():
+                updated = cls.objects.filter(pk__in=pks, status=src).update(status=to_status, updated_at=now)
+                if updated == len(pks):
+                    outcome.update(dict.fromkeys(pks, "ok"))
+                    continue
+                # alguien los movió entre el SELECT y el UPDATE: ver cuáles sí quedaron
+                moved = set(cls.objects.filter(pk__in=pks, status=to_status, updated_at=now).values_list("pk", flat=True))
+                outcome.update({pk: ("ok" if pk in moved else "conflict") for pk in pks})
+
+        return [{"id": pk, "result": outcome[pk], "from": current.get(pk)} for pk in ids]
+
+    # estados que el barrido de vencimiento mueve a EXPIRED
+    EXPIRABLE_STATUSES = (DRAFT, SENT)
+
+    @classmethod
+    def expire_due(cls, today=None, chunk_size: int = 1000, max_batches=None) -> dict:
+        """
+        Pasa a EXPIRED las cotizaciones abiertas con valid_until < hoy, por lotes:
+        1 SELECT de ids (vía índice status+valid_until) + 1 UPDATE por lote, cada lote
+        en su propia transacción para acotar bloqueos y tamaño del log.
+        Avanza por pk (keyset), así no vuelve a leer filas ya vistas.
+        Devuelve {"expired", "batches", "elapsed"}.
+        """
+        started = time.monotonic()
+        today = today or timezone.localdate()
+        due = cls.objects.filter(status__in=cls.EXPIRABLE_STATUSES, valid_until__lt=today)
+
+        last_pk, expired, batches = 0, 0, 0
+        while max_batches is None or batches < max_batches:
+            pks = list(due.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                # se repite el filtro: si alguien la aprobó entre el SELECT y el UPDATE, no se toca
+                expired += due.filter(pk__in=pks).update(status=cls.EXPIRED, updated_at=timezone.now())
+            batches += 1
+            last_pk = pks[-1]
+            if len(pks) < chunk_size:
+                break
+
+        return {"expired": expired, "batches": batches, "elapsed": time.monotonic() - started}
+
     # ---------- Validación negocio ----------
     def clean(self):
         if self.customer_id and self.vehicle_id:
             from vehicles.models import Vehicle
             veh_cust_id = (
-                Vehicle.objects.only("customer_id")
-                .filter(pk=self.vehicle_id)
-                .values_list("customer_id", flat=True)
+                Vehicle.objects.filter(pk=self.vehicle_id)
+                .values_list("owner_id", flat=True)
                 .first()
             )
             if veh_cust_id and veh_cust_id != self.customer_id:
@@ -106,15 +199,8 @@ class Quotation(models.Model):
     # ---------- Persistencia / numeración ----------
     def save(self, *args, **kwargs):
         if not self.number:
-            today = timezone.now().date()
-            year = today.year
-            prefix = f"Q-{year}-"
-            last = Quotation.objects.filter(number__startswith=prefix).order_by("number").last()
-            if last and last.number.split("-")[-1].isdigit():
-                seq = int(last.number.split("-")[-1]) + 1
-            else:
-                seq = 1
-            self.number = f"{prefix}{seq:04d}"
+            # Q-YYYY-NNNN desde el contador compartido (sin escanear la tabla)
+            self.number = next_number(self.NUMBER_PREFIX, width=4)
 
         # cuantiza totales “manuales” por si alguien los setea directo (admin/api)
         self.discount_total = q2(self.discount_total or 0)
@@ -122,16 +208,20 @@ class Quotation(models.Model):
         super().save(*args, **kwargs)
 
     # ---------- Totales ----------
-    def recalc_totals(self):
-        s_sum = Decimal("0.00")
-        p_sum = Decimal("0.00")
-        for i in self.services.all():
-            s_sum += (i.quantity * i.unit_price) - i.discount
-        for i in self.parts.all():
-            p_sum += (i.quantity * i.unit_price) - i.discount
-
-        s_sum = q2(max(s_sum, Decimal("0.00")))
-        p_sum = q2(max(p_sum, Decimal("0.00")))
+    TOTAL_FIELDS = ["subtotal_services", "subtotal_parts", "discount_total", "tax_total", "grand_total", "updated_at"]
+
+    def set_totals(self, subtotal_services=None, subtotal_parts=None):
+        """
+        Calcula en memoria los totales a partir de subtotales ya conocidos (sin guardar).
+        Si no se pasa un subtotal, se conserva el que tiene la instancia.
+        """
+        if subtotal_services is not None:
+            self.subtotal_services = subtotal_services
+        if subtotal_parts is not None:
+            self.subtotal_parts = subtotal_parts
+
+        s_sum = q2(max(self.subtotal_services or 0, Decimal("0.00")))
+        p_sum = q2(max(self.subtotal_parts or 0, Decimal("0.00")))
         d_tot = q2(max(self.discount_total or 0, Decimal("0.00")))
         t_tot = q2(max(self.tax_total or 0, Decimal("0.00")))
 
@@ -143,12 +233,107 @@ class Quotation(models.Model):
         self.tax_total = t_tot
         self.grand_total = g_tot
 
-        super().save(update_fields=[
-            "subtotal_services", "subtotal_parts", "discount_total", "tax_total", "grand_total", "updated_at"
-        ])
+    def store_totals(self, subtotal_services=None, subtotal_parts=None):
+        """Como set_totals(), y persiste solo las columnas de totales (sin releer renglones)."""
+        self.set_totals(subtotal_services, subtotal_parts)
+        super().save(update_fields=self.TOTAL_FIELDS)
+
+    def recalc_totals(self):
+        """
+        Recálculo completo desde los renglones (O(renglones)).
+        El día a día se mantiene por delta (ver apply_line_delta); esto queda como
+        operación de reparación (comando `recalc_quotation_totals`).
+        """
+        self.store_totals(sum_line_totals(self.services.all()), sum_line_totals(self.parts.all()))
+
+    @classmethod
+    def apply_line_delta(cls, quotation_id, field: str, delta: Decimal):
+        """
+        Suma `delta` a `field` (subtotal_services / subtotal_parts) y ajusta grand_total
+        con un único UPDATE atómico basado en F(), sin leer los renglones.
+        Si el UPDATE viola una restricción (totales desfasados), repara con recalc_totals().
+        """
+        if not quotation_id or not delta:
+            return
+        other = "subtotal_parts" if field == "subtotal_services" else "subtotal_services"
+        gross = F(field) + delta + F(other) - F("discount_total") + F("tax_total")
+        try:
+            with transaction.atomic():
+                cls.objects.filter(pk=quotation_id).update(**{
+                    field: F(field) + delta,
+                    "grand_total": Case(
+                        When(GreaterThan(gross, 0), then=gross),
+                        default=Value(Decimal("0.00")),
+                        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+                    ),
+                    "updated_at": timezone.now(),
+                })
+        except IntegrityError:
+            q = cls.objects.filter(pk=quotation_id).first()
+            if q:
+                q.recalc_totals()
 
 
-class QuotationService(models.Model):
+class _LineTotalsMixin:
+    """
+    Mantiene los subtotales de la cotización por delta: al guardar/borrar un renglón
+    se aplica (total nuevo - total anterior) con Quotation.apply_line_delta().
+
+    El total anterior se lee de la BD con select_for_update() dentro de la misma
+    transacción que la escritura: dos requests que editan el mismo renglón se
+    serializan y cada una resta el total que de verdad estaba guardado (con un
+    snapshot en memoria ambas restarían el mismo y los subtotales quedarían desfasados).
+    """
+    SUBTOTAL_FIELD = None
+
+    def _previous_total(self):
+        """(quotation_id, line_total) tal como está en BD (fila bloqueada), o None si es nuevo."""
+        if self._state.adding or self.pk is None:
+            return None
+        row = (
+            type(self).objects.select_for_update().filter(pk=self.pk)
+            .values_list("quotation_id", "quantity", "unit_price", "discount")
+            .first()
+        )
+        if not row:
+            return None
+        qid, qty, price, disc = row
+        return qid, q2((qty * price) - disc)
+
+    def _push_total_delta(self, previous, current):
+        deltas = {}
+        for entry, sign in ((previous, -1), (current, 1)):
+            if entry and entry[0]:
+                deltas[entry[0]] = deltas.get(entry[0], Decimal("0.00")) + sign * entry[1]
+        for qid, delta in deltas.items():
+            Quotation.apply_line_delta(qid, self.SUBTOTAL_FIELD, delta)
+
+        # la instancia cacheada (si la hay) ya no refleja la BD
+        field = type(self).quotation.field
+        if field.is_cached(self):
+            q = field.get_cached_value(self)
+            if q is not None and q.pk in deltas:
+                q.refresh_from_db(fields=Quotation.TOTAL_FIELDS)
+
+    def save(self, *args, **kwargs):
+        # cuantiza antes de guardar
+        quantize_line(self)
+        with transaction.atomic():
+            previous = self._previous_total()
+            super().save(*args, **kwargs)
+            self._push_total_delta(previous, (self.quotation_id, self.line_total))
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = self._previous_total()
+            result = super().delete(*args, **kwargs)
+            self._push_total_delta(previous, None)
+        return result
+
+
+class QuotationService(_LineTotalsMixin, models.Model):
+    SUBTOTAL_FIELD = "subtotal_services"
+
     quotation = models.ForeignKey(Quotation, on_delete=models.CASCADE, related_name="services")
     service = models.ForeignKey("catalog.Service", on_delete=models.PROTECT)
     quantity = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("1.00"))
@@ -180,29 +365,10 @@ class QuotationService(models.Model):
         if self.discount > (self.quantity * self.unit_price):
             raise ValidationError({"discount": "No puede exceder el subtotal (cantidad × precio)."})
 
-    def save(self, *args, **kwargs):
-        # cuantiza antes de guardar
-        self.quantity = q2(self.quantity or 0)
-        self.unit_price = q2(self.unit_price or 0)
-        self.discount = q2(self.discount or 0)
-        super().save(*args, **kwargs)
-        try:
-            if self.quotation_id:
-                self.quotation.recalc_totals()
-        except Exception:
-            pass
 
-    def delete(self, *args, **kwargs):
-        q = self.quotation
-        super().delete(*args, **kwargs)
-        try:
-            if q:
-                q.recalc_totals()
-        except Exception:
-            pass
+class QuotationPart(_LineTotalsMixin, models.Model):
+    SUBTOTAL_FIELD = "subtotal_parts"
 
-
-class QuotationPart(models.Model):
     quotation = models.ForeignKey(Quotation, on_delete=models.CASCADE, related_name="parts")
     part = models.ForeignKey("catalog.Part", on_delete=models.PROTECT)
     quantity = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("1.00"))
@@ -233,23 +399,3 @@ class QuotationPart(models.Model):
             raise ValidationError({"discount": "Debe ser ≥ 0"})
         if self.discount > (self.quantity * self.unit_price):
             raise ValidationError({"discount": "No puede exceder el subtotal (cantidad × precio)."})
-
-    def save(self, *args, **kwargs):
-        self.quantity = q2(self.quantity or 0)
-        self.unit_price = q2(self.unit_price or 0)
-        self.discount = q2(self.discount or 0)
-        super().save(*args, **kwargs)
-        try:
-            if self.quotation_id:
-                self.quotation.recalc_totals()
-        except Exception:
-            pass
-
-    def delete(self, *args, **kwargs):
-        q = self.quotation
-        super().delete(*args, **kwargs)
-        try:
-            if q:
-                q.recalc_totals()
-        except Exception:
-            pass
@@ -0,0 +1,181 @@
+# quotes/pricing.py
+"""
+Motor de precios por lotes para renglones de cotización.
+
+Todo se calcula en centavos enteros, así el resultado es idéntico al de
+Decimal.quantize(ROUND_HALF_UP) renglón por renglón:
+  - persistido (modelo):  q2(cantidad × precio − descuento)
+  - UI (serializer):      descuento híbrido de compute_line_total (hybrid=True)
+
+Con NumPy instalado los lotes grandes van en arreglos int64; sin NumPy (o si los
+montos pueden desbordar int64) se usan enteros de Python, con el mismo resultado.
+"""
+from decimal import Decimal
+from typing import Iterable
+
+from django.db.models import BigIntegerField, Case, F, Value, When
+from django.db.models.functions import Cast, Round
+from django.db.models.lookups import LessThan
+
+try:  # opcional: acelera lotes grandes (reparaciones, reportes)
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# Por debajo de este tamaño los enteros de Python ganan al arranque de NumPy
+NUMPY_MIN_BATCH = 256
+# Cota segura para productos intermedios en int64
+_INT64_SAFE = 2 ** 62
+
+
+def to_cents(value) -> int:
+    """Decimal/str/int con hasta 2 decimales -> centavos. ValueError si trae más precisión."""
+    d = value if isinstance(value, Decimal) else Decimal(str(value or 0))
+    cents = d.scaleb(2)
+    if cents != cents.to_integral_value():
+        raise ValueError(f"{value!r} tiene más de 2 decimales")
+    return int(cents)
+
+
+def cents_to_decimal(cents) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def cents_sql(field: str):
+    """Expresión SQL que trae un DecimalField(…, 2) como centavos enteros."""
+    return Cast(Round(F(field) * 100), output_field=BigIntegerField())
+
+
+def _clamp0_sql(expr):
+    return Case(When(LessThan(expr, 0), then=Value(0)), default=expr, output_field=BigIntegerField())
+
+
+def line_cents_sql(hybrid: bool = False):
+    """
+    Gemelo SQL de _line_cents: total del renglón en centavos, solo con enteros
+    (división entera sobre valores ≥ 0 = ROUND_HALF_UP), igual en SQLite y SQL Server.
+    """
+    q, p, d = cents_sql("quantity"), cents_sql("unit_price"), cents_sql("discount")
+    big = BigIntegerField()
+    if not hybrid:
+        n = q * p - d * Value(100)
+        # n puede ser negativo solo con datos inválidos (CHECK discount <= subtotal)
+        return _div_half_up_sql(n, 100)
+    pct = _div_half_up_sql(q * _clamp0_sql(p * (Value(100) - d)), 10_000)
+    per_unit = _div_half_up_sql(q * _clamp0_sql(p - d), 100)
+    return Case(When(LessThan(d, 101), then=pct), default=per_unit, output_field=big)
+
+
+def _div_half_up_sql(n, div: int):
+    return Cast((n + Value(div // 2)) / Value(div), output_field=BigIntegerField())
+
+
+# ----------------- núcleo en centavos -----------------
+
+def _div_half_up(n, div):
+    """n / div redondeado ROUND_HALF_UP (lejos de cero), en enteros o arreglos."""
+    if np is not None and isinstance(n, np.ndarray):
+        return np.sign(n) * ((np.abs(n) + div // 2) // div)
+    sign = -1 if n < 0 else 1
+    return sign * ((abs(n) + div // 2) // div)
+
+
+def _line_cents(q: int, p: int, d: int, hybrid: bool) -> int:
+    if not hybrid:
+        return _div_half_up(q * p - d * 100, 100)
+    if d <= 100:  # porcentaje (0.10 = 10 %)
+        return _div_half_up(q * max(p * (100 - d), 0), 10_000)
+    return _div_half_up(q * max(p - d, 0), 100)  # monto por unidad
+
+
+def _numpy_ok(q, p, d) -> bool:
+    if np is None or len(q) < NUMPY_MIN_BATCH:
+        return False
+    top = max(max(map(abs, q)), 1) * max(max(map(abs, p)), max(map(abs, d)), 1) * 10_000
+    return top < _INT64_SAFE
+
+
+def line_totals_cents(quantities, unit_prices, discounts, hybrid: bool = False):
+    """
+    Total por renglón en centavos para listas paralelas de centavos.
+    Devuelve un arreglo int64 (NumPy) o una lista de int.
+    """
+    q, p, d = list(quantities), list(unit_prices), list(discounts)
+    if not _numpy_ok(q, p, d):
+        return [_line_cents(qi, pi, di, hybrid) for qi, pi, di in zip(q, p, d)]
+
+    q = np.asarray(q, dtype=np.int64)
+    p = np.asarray(p, dtype=np.int64)
+    d = np.asarray(d, dtype=np.int64)
+    if not hybrid:
+        return _div_half_up(q * p - d * 100, 100)
+    pct = _div_half_up(q * np.maximum(p * (100 - d), 0), 10_000)
+    per_unit = _div_half_up(q * np.maximum(p - d, 0), 100)
+    return np.where(d <= 100, pct, per_unit)
+
+
+def grouped_cents(keys, quantities, unit_prices, discounts, hybrid: bool = False) -> dict:
+    """Suma de totales por renglón agrupada por clave (p.ej. quotation_id) -> {clave: centavos}."""
+    keys = list(keys)
+    totals = line_totals_cents(quantities, unit_prices, discounts, hybrid)
+    if np is not None and isinstance(totals, np.ndarray):
+        uniq, inverse = np.unique(np.asarray(keys), return_inverse=True)
+        sums = np.zeros(len(uniq), dtype=np.int64)
+        np.add.at(sums, inverse, totals)
+        return {k.item(): int(s) for k, s in zip(uniq, sums)}
+    out = {}
+    for k, t in zip(keys, totals):
+        out[k] = out.get(k, 0) + t
+    return out
+
+
+def grand_total_cents(services: int, parts: int, discount: int, tax: int) -> int:
+    """Mismo criterio que Quotation.store_totals: max(s + p − descuento + impuesto, 0)."""
+    return max(services + parts - max(discount, 0) + max(tax, 0), 0)
+
+
+# ----------------- API sobre renglones -----------------
+
+def sum_line_totals(lines: Iterable, hybrid: bool = False) -> Decimal:
+    """
+    Suma de totales por renglón (objetos con quantity/unit_price/discount), redondeando
+    cada renglón a 2 decimales como line_total / compute_line_total.
+    """
+    lines = list(lines)
+    q, p, d = [], [], []
+    try:
+        for line in lines:
+            q.append(to_cents(line.quantity or 0))
+            p.append(to_cents(line.unit_price or 0))
+            d.append(to_cents(line.discount or 0))
+    except ValueError:
+        # montos sin cuantizar (p.ej. instancias aún no guardadas): ruta Decimal clásica
+        from .serializers import compute_line_total
+        from .models import q2
+        total = Decimal("0.00")
+        for line in lines:
+            if hybrid:
+                total += compute_line_total(line.quantity, line.unit_price, line.discount)
+            else:
+                total += q2((line.quantity * line.unit_price) - line.discount)
+        return q2(total)
+    return cents_to_decimal(sum(int(t) for t in line_totals_cents(q, p, d, hybrid)))
+
+
+def subtotals_by_quotation(line_qs, hybrid: bool = False) -> dict:
+    """
+    {quotation_id: centavos} para un queryset de QuotationService/QuotationPart.
+    Los montos llegan ya en centavos desde SQL (sin crear instancias ni Decimals).
+    """
+    rows = line_qs.order_by().values_list(
+        "quotation_id", cents_sql("quantity"), cents_sql("unit_price"), cents_sql("discount")
+    )
+    keys, q, p, d = [], [], [], []
+    for qid, qc, pc, dc in rows.iterator(chunk_size=5000):
+        keys.append(qid)
+        q.append(qc)
+        p.append(pc)
+        d.append(dc)
+    if not keys:
+        return {}
+    return grouped_cents(keys, q, p, d, hybrid)
@@ -2,9 +2,17 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Iterable, Tuple
 
 from django.db import transaction
+from django.db.models import BigIntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
-from .models import Quotation, QuotationService, QuotationPart
+from catalog.cache import cache as catalog_cache
+from catalog.serializers import CatalogRelatedField
+from customers.models import Customer
+from vehicles.models import Vehicle
+
+from .models import Quotation, QuotationService, QuotationPart, quantize_line
+from .pricing import cents_to_decimal, line_cents_sql, line_totals_cents, sum_line_totals, to_cents
 
 
 # -------- utilidades de decimales / totales --------
@@ -34,9 +42,59 @@ def compute_line_total(quantity: Decimal, unit_price: Decimal, discount: Decimal
     return q2(quantity * effective)
 
 
+def annotate_line_subtotals(qs):
+    """
+    Anota ui_subtotal_services_cents / ui_subtotal_parts_cents por cotización con un
+    SUM en subconsulta (una por tipo de renglón, sin multiplicar filas por join).
+    Se suma en centavos enteros (pricing.line_cents_sql, descuento híbrido), así lista y
+    ?summary=1 dan lo mismo que detalle, preview y totales guardados en cualquier motor.
+    QuotationSerializer los usa en vez de sumar renglones en Python.
+    """
+    def _subtotal(model):
+        lines = (
+            model.objects.filter(quotation=OuterRef("pk"))
+            .order_by()
+            .values("quotation")
+            .annotate(total=Sum(line_cents_sql(hybrid=True)))
+            .values("total")
+        )
+        return Coalesce(Subquery(lines, output_field=BigIntegerField()), Value(0), output_field=BigIntegerField())
+
+    return qs.annotate(
+        ui_subtotal_services_cents=_subtotal(QuotationService),
+        ui_subtotal_parts_cents=_subtotal(QuotationPart),
+    )
+
+
 # -------- serializers de renglones --------
 
+def validate_line_amounts(data: dict) -> dict:
+    """
+    Reglas de cantidad/precio/descuento de un renglón (las mismas que clean() del modelo
+    y sus CheckConstraint). Las comparten el alta/edición y la vista previa.
+    """
+    quantity = data.get("quantity")
+    if quantity is not None and quantity <= 0:
+        raise serializers.ValidationError({"quantity": "Debe ser > 0"})
+    if (data.get("unit_price", 0) or 0) < 0:
+        raise serializers.ValidationError({"unit_price": "Debe ser >= 0"})
+    if (data.get("discount", 0) or 0) < 0:
+        raise serializers.ValidationError({"discount": "Debe ser >= 0"})
+    return data
+
+
+def validate_vehicle_owner(customer, vehicle) -> None:
+    """El vehículo (si viene) debe pertenecer al cliente."""
+    # el vehículo ya viene cargado: su owner_id no requiere otra consulta
+    if customer and vehicle and vehicle.owner_id != customer.pk:
+        raise serializers.ValidationError(
+            {"vehicle": "El vehículo no pertenece al cliente seleccionado."}
+        )
+
 class QuotationServiceSerializer(serializers.ModelSerializer):
+    # writable para que el upsert anidado pueda actualizar renglones por id
+    id = serializers.IntegerField(required=False)
+    service = CatalogRelatedField("service")  # sin consulta por renglón (catalog.cache)
     line_total = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -44,13 +102,7 @@ class QuotationServiceSerializer(serializers.ModelSerializer):
         fields = ["id", "service", "quantity", "unit_price", "discount", "line_total"]
 
     def validate(self, data):
-        if (data.get("quantity", 0) or 0) < 0:
-            raise serializers.ValidationError({"quantity": "Debe ser >= 0"})
-        if (data.get("unit_price", 0) or 0) < 0:
-            raise serializers.ValidationError({"unit_price": "Debe ser >= 0"})
-        if (data.get("discount", 0) or 0) < 0:
-            raise serializers.ValidationError({"discount": "Debe ser >= 0"})
-        return data
+        return validate_line_amounts(data)
 
     # ← Type hint para Spectacular
     def get_line_total(self, obj) -> str:
@@ -58,6 +110,8 @@ class QuotationServiceSerializer(serializers.ModelSerializer):
 
 
 class QuotationPartSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    part = CatalogRelatedField("part")
     line_total = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -65,13 +119,7 @@ class QuotationPartSerializer(serializers.ModelSerializer):
         fields = ["id", "part", "quantity", "unit_price", "discount", "line_total"]
 
     def validate(self, data):
-        if (data.get("quantity", 0) or 0) < 0:
-            raise serializers.ValidationError({"quantity": "Debe ser >= 0"})
-        if (data.get("unit_price", 0) or 0) < 0:
-            raise serializers.ValidationError({"unit_price": "Debe ser >= 0"})
-        if (data.get("discount", 0) or 0) < 0:
-            raise serializers.ValidationError({"discount": "Debe ser >= 0"})
-        return data
+        return validate_line_amounts(data)
 
     # ← Type hint para Spectacular
     def get_line_total(self, obj) -> str:
@@ -94,6 +142,8 @@ class QuotationSerializer(serializers.ModelSerializer):
         model = Quotation
         fields = "__all__"  # incluye campos del modelo + los de arriba
         read_only_fields = ["created_at", "updated_at"]
+        # si no viene, Quotation.save() lo toma del contador compartido
+        extra_kwargs = {"number": {"required": False}}
 
     # -------- validaciones de cabecera --------
     def validate(self, data):
@@ -103,22 +153,7 @@ class QuotationSerializer(serializers.ModelSerializer):
         """
         customer = data.get("customer") or getattr(self.instance, "customer", None)
         vehicle = data.get("vehicle") or getattr(self.instance, "vehicle", None)
-        if customer and vehicle:
-            try:
-                from vehicles.models import Vehicle
-                veh_cust_id = (
-                    Vehicle.objects.only("customer_id")
-                    .filter(pk=vehicle.pk)
-                    .values_list("customer_id", flat=True)
-                    .first()
-                )
-                if veh_cust_id and veh_cust_id != customer.pk:
-                    raise serializers.ValidationError(
-                        {"vehicle": "El vehículo no pertenece al cliente seleccionado."}
-                    )
-            except Exception:
-                # Cualquier error de import/consulta lo dejamos pasar para que lo capture la validación del modelo
-                pass
+        validate_vehicle_owner(customer, vehicle)
         return data
 
     # -------- helpers internos --------
@@ -126,54 +161,64 @@ class QuotationSerializer(serializers.ModelSerializer):
         """Separa items con id (actualizar) y sin id (crear)."""
         to_update, to_create = [], []
         for item in items or []:
-            (to_update if item.get("id") else to_create).append(item)
+            if item.get("id"):
+                to_update.append(item)
+            else:
+                to_create.append(self._strip_id(item))
         return to_update, to_create
 
-    def _upsert_children(self, instance: Quotation, services, parts):
-        # SERVICES
+    @staticmethod
+    def _strip_id(item: dict) -> dict:
+        return {k: v for k, v in item.items() if k != "id"}
+
+    def _sync_lines(self, instance: Quotation, model, fk_field: str, items) -> Decimal:
+        """
+        Sincroniza los renglones de un tipo (servicios o partes) en bloque:
+          - 1 SELECT de los renglones existentes,
+          - 1 bulk_update para los que vienen con id,
+          - 1 bulk_create para los nuevos,
+          - 1 DELETE para los que ya no vienen.
+        No pasa por save()/delete() del renglón (no hay delta por línea): devuelve el
+        nuevo subtotal, que sale de los renglones que quedan (actualizados + nuevos).
+        """
+        fields = [fk_field, "quantity", "unit_price", "discount"]
+        to_update, to_create = self._split_items(items)
+        existing = {obj.pk: obj for obj in model.objects.filter(quotation=instance)}
+
+        changed = []
+        for data in to_update:
+            obj = existing.get(data["id"])
+            if not obj:
+                continue
+            for f in fields:
+                if f in data:
+                    setattr(obj, f, data[f])
+            changed.append(quantize_line(obj))
+
+        new_objs = [quantize_line(model(quotation=instance, **data)) for data in to_create]
+
+        if changed:
+            model.objects.bulk_update(changed, fields)
+        # eliminar los que ya no vienen
+        keep_ids = {obj.pk for obj in changed}
+        stale_ids = [pk for pk in existing if pk not in keep_ids]
+        if stale_ids:
+            model.objects.filter(pk__in=stale_ids).delete()
+        if new_objs:
+            model.objects.bulk_create(new_objs)
+        return sum_line_totals(changed + new_objs)
+
+    def _upsert_children(self, instance: Quotation, services, parts) -> dict:
+        """Devuelve los subtotales que cambiaron, listos para Quotation.store_totals()."""
+        subtotals = {}
         if services is not None:
-            to_update, to_create = self._split_items(services)
-            keep_ids = set()
-
-            # actualizar existentes por id
-            for data in to_update:
-                obj = instance.services.filter(pk=data["id"]).first()
-                if not obj:
-                    continue
-                for f in ["service", "quantity", "unit_price", "discount"]:
-                    if f in data:
-                        setattr(obj, f, data[f])
-                obj.save()
-                keep_ids.add(obj.id)
-
-            # crear nuevos
-            for data in to_create:
-                obj = QuotationService.objects.create(quotation=instance, **data)
-                keep_ids.add(obj.id)
-
-            # eliminar los que ya no vienen
-            instance.services.exclude(pk__in=keep_ids).delete()
-
-        # PARTS
+            subtotals["subtotal_services"] = self._sync_lines(instance, QuotationService, "service", services)
         if parts is not None:
-            to_update, to_create = self._split_items(parts)
-            keep_ids = set()
-
-            for data in to_update:
-                obj = instance.parts.filter(pk=data["id"]).first()
-                if not obj:
-                    continue
-                for f in ["part", "quantity", "unit_price", "discount"]:
-                    if f in data:
-                        setattr(obj, f, data[f])
-                obj.save()
-                keep_ids.add(obj.id)
-
-            for data in to_create:
-                obj = QuotationPart.objects.create(quotation=instance, **data)
-                keep_ids.add(obj.id)
-
-            instance.parts.exclude(pk__in=keep_ids).delete()
+            subtotals["subtotal_parts"] = self._sync_lines(instance, QuotationPart, "part", parts)
+        # el prefetch de la vista ya no refleja los renglones
+        getattr(instance, "_prefetched_objects_cache", {}).pop("services", None)
+        getattr(instance, "_prefetched_objects_cache", {}).pop("parts", None)
+        return subtotals
 
     # -------- create/update --------
     @transaction.atomic
@@ -183,22 +228,23 @@ class QuotationSerializer(serializers.ModelSerializer):
 
         # Crear cabecera
         quotation = Quotation(**validated_data)
-        # Ejecuta validaciones del modelo (clean)
+        # Ejecuta validaciones del modelo (clean); el número se asigna al guardar
         try:
-            quotation.full_clean(exclude=None)
+            quotation.full_clean(exclude=None if quotation.number else ["number"])
         except Exception as e:
             raise serializers.ValidationError(e.message_dict if hasattr(e, "message_dict") else str(e))
         quotation.save()
 
-        # Crear renglones
-        for item in services:
-            QuotationService.objects.create(quotation=quotation, **item)
-        for item in parts:
-            QuotationPart.objects.create(quotation=quotation, **item)
+        # Crear renglones (en bloque; sin delta por línea)
+        service_lines = QuotationService.objects.bulk_create(
+            [quantize_line(QuotationService(quotation=quotation, **self._strip_id(item))) for item in services]
+        )
+        part_lines = QuotationPart.objects.bulk_create(
+            [quantize_line(QuotationPart(quotation=quotation, **self._strip_id(item))) for item in parts]
+        )
 
-        # Recalcular totales (persistidos en el modelo)
-        if hasattr(quotation, "recalc_totals"):
-            quotation.recalc_totals()
+        # Totales persistidos: salen de los renglones recién creados, sin releerlos
+        quotation.store_totals(sum_line_totals(service_lines), sum_line_totals(part_lines))
         return quotation
 
     @transaction.atomic
@@ -219,35 +265,157 @@ class QuotationSerializer(serializers.ModelSerializer):
         instance.save()
 
         # Upsert renglones (solo si vienen en el payload)
-        self._upsert_children(instance, services, parts)
+        subtotals = self._upsert_children(instance, services, parts)
 
-        # Totales
-        if hasattr(instance, "recalc_totals"):
-            instance.recalc_totals()
+        # Totales (descuento/impuesto de cabecera pueden haber cambiado aunque no haya renglones)
+        instance.store_totals(**subtotals)
         return instance
 
     # -------- totales para frontend (strings) --------
     def _sum_queryset(self, qs) -> Decimal:
-        total = Decimal("0")
-        for obj in qs:
-            total += compute_line_total(obj.quantity, obj.unit_price, obj.discount)
-        return q2(total)
+        # mismo resultado que sumar compute_line_total renglón por renglón
+        return sum_line_totals(qs, hybrid=True)
+
+    def _ui_subtotals(self, obj) -> Tuple[Decimal, Decimal]:
+        """
+        (servicios, partes) para UI, calculados una sola vez por objeto.
+        En modo lista la vista anota ui_subtotal_*_cents en SQL (annotate_line_subtotals)
+        y aquí solo se leen; en detalle se suman los renglones prefetcheados.
+        """
+        cached = self._subtotals_cache.get(id(obj))
+        if cached is None:
+            s = getattr(obj, "ui_subtotal_services_cents", None)
+            p = getattr(obj, "ui_subtotal_parts_cents", None)
+            cached = (
+                cents_to_decimal(s) if s is not None else self._sum_queryset(obj.services.all()),
+                cents_to_decimal(p) if p is not None else self._sum_queryset(obj.parts.all()),
+            )
+            self._subtotals_cache[id(obj)] = cached
+        return cached
+
+    def to_representation(self, instance):
+        self._subtotals_cache = {}
+        return super().to_representation(instance)
 
     # ← Type hints para Spectacular
     def get_subtotal_services(self, obj) -> str:
-        # usa related_name 'services'
-        return str(self._sum_queryset(obj.services.all()))
+        return str(self._ui_subtotals(obj)[0])
 
     def get_subtotal_parts(self, obj) -> str:
-        return str(self._sum_queryset(obj.parts.all()))
+        return str(self._ui_subtotals(obj)[1])
 
     def get_total(self, obj) -> str:
         """
         Total para UI = subtotal_services + subtotal_parts - discount_total + tax_total
         (Mantenemos en sync con el cálculo del modelo.)
         """
-        s = Decimal(self.get_subtotal_services(obj))
-        p = Decimal(self.get_subtotal_parts(obj))
+        s, p = self._ui_subtotals(obj)
         disc = Decimal(obj.discount_total or 0)
         tax = Decimal(obj.tax_total or 0)
         return str(q2(s + p - disc + tax))
+
+
+class QuotationSummarySerializer(QuotationSerializer):
+    """Lista compacta (?summary=1): cabecera + totales anotados, sin renglones anidados."""
+    services = None
+    parts = None
+
+
+# -------- vista previa de precios (sin escribir en BD) --------
+
+class _PreviewLineSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)  # se acepta (mismo payload), se ignora
+    quantity = serializers.DecimalField(max_digits=10, decimal_places=2, default=Decimal("1.00"))
+    unit_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, required=False, allow_null=True,
+        help_text="Si no viene, se usa el precio vigente del catálogo.",
+    )
+    discount = serializers.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+
+    def validate(self, data):
+        return validate_line_amounts(data)
+
+
+class PreviewServiceLineSerializer(_PreviewLineSerializer):
+    service = serializers.IntegerField()
+
+
+class PreviewPartLineSerializer(_PreviewLineSerializer):
+    part = serializers.IntegerField()
+
+
+class QuotationPreviewSerializer(serializers.Serializer):
+    """
+    Mismo payload que QuotationSerializer (se ignoran los campos que no afectan precios).
+    Renglones y cliente/vehículo pasan por las mismas reglas que el alta; las referencias
+    al catálogo se validan y se cotizan desde catalog.cache (sin consultas).
+    """
+    customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all(), required=False)
+    vehicle = serializers.PrimaryKeyRelatedField(queryset=Vehicle.objects.all(), required=False, allow_null=True)
+    services = PreviewServiceLineSerializer(many=True, required=False, default=list)
+    parts = PreviewPartLineSerializer(many=True, required=False, default=list)
+    discount_total = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, default=Decimal("0.00"))
+    tax_total = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, default=Decimal("0.00"))
+
+    def _price_lines(self, lines, fk: str, label: str):
+        prices = {}
+        for pk in {line[fk] for line in lines}:
+            entry = catalog_cache.get(fk, pk)
+            if entry is not None:
+                prices[pk] = entry.price
+        missing = sorted({line[fk] for line in lines} - prices.keys())
+        if missing:
+            raise serializers.ValidationError({fk + "s": f"{label} inexistente(s): {missing}"})
+        for line in lines:
+            if line.get("unit_price") is None:
+                line["unit_price"] = q2(prices[line[fk]])
+            line.pop("id", None)
+        return lines
+
+    def validate(self, data):
+        validate_vehicle_owner(data.get("customer"), data.get("vehicle"))
+        self._price_lines(data["services"], "service", "Servicio(s)")
+        self._price_lines(data["parts"], "part", "Parte(s)")
+        return data
+
+    @staticmethod
+    def _with_totals(lines):
+        cents = line_totals_cents(
+            [to_cents(x["quantity"]) for x in lines],
+            [to_cents(x["unit_price"]) for x in lines],
+            [to_cents(x["discount"]) for x in lines],
+            hybrid=True,
+        )
+        out = [
+            {**{k: (str(v) if isinstance(v, Decimal) else v) for k, v in line.items()},
+             "line_total": str(cents_to_decimal(c))}
+            for line, c in zip(lines, cents)
+        ]
+        return out, cents_to_decimal(sum(int(c) for c in cents))
+
+    def preview(self) -> dict:
+        """Renglones con line_total y totales, con las mismas claves que QuotationSerializer."""
+        data = self.validated_data
+        services, s_sum = self._with_totals(data["services"])
+        parts, p_sum = self._with_totals(data["parts"])
+        disc, tax = q2(data["discount_total"]), q2(data["tax_total"])
+        return {
+            "services": services,
+            "parts": parts,
+            "subtotal_services": str(s_sum),
+            "subtotal_parts": str(p_sum),
+            "discount_total": str(disc),
+            "tax_total": str(tax),
+            "total": str(q2(s_sum + p_sum - disc + tax)),
+        }
+
+
+# -------- cambio de estado masivo --------
+
+class BulkTransitionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=10000)
+    status = serializers.ChoiceField(choices=Quotation.STATUS_CHOICES)
+
+
+class BulkConvertSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=5000)
@@ -0,0 +1,60 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from quotes import pricing
+from quotes.models import q2
+from quotes.serializers import compute_line_total
+
+
+class _Line:
+    def __init__(self, quantity, unit_price, discount):
+        self.quantity, self.unit_price, self.discount = quantity, unit_price, discount
+
+
+def _random_lines(n, seed=7):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        qty = Decimal(rnd.randint(1, 50_000)).scaleb(-2)
+        price = Decimal(rnd.randint(0, 2_000_000)).scaleb(-2)
+        # mezcla descuentos porcentuales (<= 1) y por unidad (> 1), incluidos medios centavos
+        disc = Decimal(rnd.choice([0, 5, 10, 25, 50, 100, rnd.randint(101, 500_000)])).scaleb(-2)
+        out.append(_Line(qty, price, min(disc, qty * price)))
+    return out
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("hybrid", [False, True])
+def test_batch_matches_decimal_reference(monkeypatch, use_numpy, hybrid):
+    if not use_numpy:
+        monkeypatch.setattr(pricing, "np", None)
+    elif pricing.np is None:
+        pytest.skip("NumPy no instalado")
+    lines = _random_lines(2000)
+
+    cents = pricing.line_totals_cents(
+        [pricing.to_cents(x.quantity) for x in lines],
+        [pricing.to_cents(x.unit_price) for x in lines],
+        [pricing.to_cents(x.discount) for x in lines],
+        hybrid=hybrid,
+    )
+    for line, c in zip(lines, cents):
+        if hybrid:
+            expected = compute_line_total(line.quantity, line.unit_price, line.discount)
+        else:
+            expected = q2(line.quantity * line.unit_price - line.discount)
+        assert pricing.cents_to_decimal(c) == expected
+
+
+def test_half_cent_rounds_up():
+    # 0.50 × 0.01 = 0.005 -> 0.01 ; 1.50 × 3.33 × 0.90 = 4.4955 -> 4.50
+    assert pricing.sum_line_totals([_Line(Decimal("0.50"), Decimal("0.01"), Decimal("0"))]) == Decimal("0.01")
+    assert pricing.sum_line_totals([_Line(Decimal("1.50"), Decimal("3.33"), Decimal("0.10"))], hybrid=True) == \
+        compute_line_total(Decimal("1.50"), Decimal("3.33"), Decimal("0.10"))
+
+
+def test_grouped_cents_sums_per_key():
+    got = pricing.grouped_cents([1, 2, 1], [100, 200, 100], [1000, 250, 99], [0, 0, 0])
+    assert got == {1: 1099, 2: 500}
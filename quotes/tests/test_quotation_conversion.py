@@ -0,0 +1,127 @@
+import itertools
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Service, Part
+from customers.models import Customer
+from quotes import conversion
+from quotes.models import Quotation, QuotationService, QuotationPart
+from vehicles.models import Vehicle
+from workorders.models import WorkOrder, WorkOrderService, WorkOrderPart
+
+_plates = itertools.count(1)
+
+
+@pytest.fixture
+def admin_api(api, db):
+    u = User.objects.create_superuser("conv_admin", "conv@example.com", "secret123")
+    api.force_authenticate(user=u)
+    return api
+
+
+def _approved(n, lines=2, status=Quotation.APPROVED, with_vehicle=True):
+    customer, _ = Customer.objects.get_or_create(name="Cliente Conversión")
+    svc, _ = Service.objects.get_or_create(code="CONV-S", defaults={"name": "Afinación", "price": 80})
+    part, _ = Part.objects.get_or_create(sku="CONV-P", defaults={"name": "Bujía", "price": 15})
+    out = []
+    for _ in range(n):
+        vehicle = None
+        if with_vehicle:
+            vehicle = Vehicle.objects.create(
+                owner=customer, plate=f"CNV-{next(_plates):04d}", brand="Nissan", model="Versa", year=2020
+            )
+        q = Quotation.objects.create(customer=customer, vehicle=vehicle, status=status)
+        for _ in range(lines):
+            QuotationService.objects.create(quotation=q, service=svc, quantity=1, unit_price=80)
+            QuotationPart.objects.create(quotation=q, part=part, quantity=4, unit_price=15, discount=5)
+        out.append(q.pk)
+    return out
+
+
+@pytest.mark.django_db
+def test_bulk_to_workorder_copies_lines_and_reports_per_id(admin_api):
+    ok = _approved(2)
+    draft = _approved(1, status=Quotation.DRAFT)
+    no_vehicle = _approved(1, with_vehicle=False)
+
+    res = admin_api.post("/api/quotations/bulk-to-workorder/",
+                         {"ids": ok + draft + no_vehicle + [999999]}, format="json")
+    assert res.status_code == 201, res.data
+    results = {r["id"]: r for r in res.json()["results"]}
+    assert res.json()["created"] == 2
+    assert results[draft[0]]["result"] == "not_approved"
+    assert results[no_vehicle[0]]["result"] == "missing_vehicle"
+    assert results[999999]["result"] == "not_found"
+
+    wo = WorkOrder.objects.get(pk=results[ok[0]]["workorder_id"])
+    assert wo.quotation_id == ok[0]
+    assert wo.number.startswith("OT-") and wo.number == results[ok[0]]["workorder_number"]
+    assert WorkOrderService.objects.filter(workorder=wo).count() == 2
+    part_line = WorkOrderPart.objects.filter(workorder=wo).first()
+    assert (part_line.quantity, part_line.unit_price, part_line.discount) == (4, 15, 5)
+
+    # segunda vez: no duplica
+    again = admin_api.post("/api/quotations/bulk-to-workorder/", {"ids": ok}, format="json").json()
+    assert {r["result"] for r in again["results"]} == {"already_converted"}
+    assert WorkOrder.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_to_workorder_query_count_independent_of_size(admin_api):
+    def _run(ids):
+        with CaptureQueriesContext(connection) as ctx:
+            assert admin_api.post("/api/quotations/bulk-to-workorder/", {"ids": ids}, format="json").status_code == 201
+        return len(ctx.captured_queries)
+
+    _run(_approved(1))  # calienta contador OT y caché de permisos
+    assert _run(_approved(1, lines=1)) == _run(_approved(15, lines=4))
+
+
+@pytest.mark.django_db
+def test_single_to_workorder_rejects_second_conversion(admin_api):
+    (qid,) = _approved(1)
+    first = admin_api.post(f"/api/quotations/{qid}/to-workorder/", {})
+    assert first.status_code == 201
+    second = admin_api.post(f"/api/quotations/{qid}/to-workorder/", {})
+    assert second.status_code == 400
+    assert second.json()["workorder_id"] == first.json()["workorder_id"]
+
+
+@pytest.mark.django_db
+def test_convert_approved_quotations_command():
+    _approved(3, lines=1)
+    _approved(1, status=Quotation.SENT)
+    out = StringIO()
+    call_command("convert_approved_quotations", "--chunk-size", "2", stdout=out)
+    assert "3 órdenes de trabajo creadas" in out.getvalue()
+    assert WorkOrder.objects.filter(quotation__isnull=False).count() == 3
+
+
+@pytest.mark.django_db
+def test_racing_duplicate_is_reported_not_500(admin_api):
+    raced, fresh = _approved(2, lines=1)
+    # otra conversión ya creó la orden de `raced`, pero esta la leyó antes (lectura vieja)
+    first = conversion.convert_to_workorders([raced])[0]
+    real_load = conversion._load
+    calls = []
+
+    def stale_load(ids):
+        rows = real_load(ids)
+        calls.append(1)
+        return [(*row[:5], None) for row in rows] if len(calls) == 1 else rows
+
+    with mock.patch("quotes.conversion._load", side_effect=stale_load):
+        res = admin_api.post("/api/quotations/bulk-to-workorder/", {"ids": [raced, fresh]}, format="json")
+
+    assert res.status_code == 201, res.data
+    results = {r["id"]: r for r in res.json()["results"]}
+    assert results[raced]["result"] == "already_converted"
+    assert results[raced]["workorder_id"] == first["workorder_id"]
+    assert results[fresh]["result"] == "ok"
+    assert WorkOrder.objects.filter(quotation_id=fresh).count() == 1
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from customers.models import Customer
+from quotes.models import Quotation
+
+TODAY = date(2026, 3, 10)
+
+
+def _q(status, valid_until):
+    c, _ = Customer.objects.get_or_create(name="Cliente Vencimiento")
+    return Quotation.objects.create(customer=c, status=status, valid_until=valid_until)
+
+
+@pytest.mark.django_db
+def test_expire_due_only_touches_open_and_past_due():
+    past = TODAY - timedelta(days=1)
+    due = [_q(Quotation.DRAFT, past), _q(Quotation.SENT, past), _q(Quotation.SENT, past)]
+    keep = [
+        _q(Quotation.APPROVED, past),
+        _q(Quotation.SENT, TODAY),
+        _q(Quotation.DRAFT, None),
+    ]
+
+    stats = Quotation.expire_due(today=TODAY, chunk_size=2)
+
+    assert stats["expired"] == 3
+    assert stats["batches"] == 2
+    assert set(Quotation.objects.filter(pk__in=[q.pk for q in due]).values_list("status", flat=True)) == {"EXPIRED"}
+    for q in keep:
+        before = q.status
+        q.refresh_from_db()
+        assert q.status == before
+
+
+@pytest.mark.django_db
+def test_expire_quotations_command_respects_max_batches():
+    for _ in range(3):
+        _q(Quotation.DRAFT, TODAY - timedelta(days=5))
+
+    out = StringIO()
+    call_command("expire_quotations", "--today", TODAY.isoformat(), "--chunk-size", "1", "--max-batches", "2", stdout=out)
+    assert "2 cotizaciones vencidas en 2 lotes" in out.getvalue()
+    assert Quotation.objects.filter(status=Quotation.DRAFT).count() == 1
@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from customers.models import Customer
+from catalog.models import Service, Part
+from quotes.models import Quotation
+from vehicles.models import Vehicle
+
+
+@pytest.fixture
+def catalog(db):
+    svc = Service.objects.create(code="ALIN", name="Alineación", price="50.00")
+    part = Part.objects.create(sku="FILT-01", name="Filtro Aceite", price="12.50")
+    return svc, part
+
+
+@pytest.mark.django_db
+def test_preview_prices_lines_without_writing(auth_api, catalog):
+    client, _ = auth_api("Asesor")
+    svc, part = catalog
+    customer = Customer.objects.create(name="Ana López")
+
+    payload = {
+        "customer": customer.id,
+        "services": [
+            {"service": svc.id, "quantity": "2"},                           # precio de catálogo
+            {"service": svc.id, "quantity": "1", "unit_price": "40", "discount": "0.10"},
+        ],
+        "parts": [{"part": part.id, "quantity": "3", "discount": "2.25"}],
+        "tax_total": "1.50",
+    }
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.post("/api/quotations/preview/", payload, format="json")
+    assert res.status_code == 200, res.data
+    body = res.json()
+
+    assert [s["line_total"] for s in body["services"]] == ["100.00", "36.00"]
+    assert body["services"][0]["unit_price"] == "50.00"
+    assert body["parts"][0]["line_total"] == "30.75"
+    assert body["total"] == "168.25"
+    assert Quotation.objects.count() == 0
+    writes = [q["sql"] for q in ctx.captured_queries if q["sql"].split()[0].upper() in ("INSERT", "UPDATE", "DELETE")]
+    assert writes == []
+
+
+@pytest.mark.django_db
+def test_preview_rejects_unknown_catalog_ids(auth_api, catalog):
+    client, _ = auth_api("Asesor")
+    res = client.post("/api/quotations/preview/", {"services": [{"service": 999999, "quantity": "1"}]}, format="json")
+    assert res.status_code == 400
+    assert "services" in res.json()
+
+
+@pytest.mark.django_db
+def test_preview_applies_the_same_rules_as_create(auth_api, catalog):
+    client, _ = auth_api("Asesor")
+    svc, _ = catalog
+    juan = Customer.objects.create(name="Juan Pérez")
+    ana = Customer.objects.create(name="Ana Gómez")
+    vehicle = Vehicle.objects.create(owner=juan, plate="PRV-001", brand="Nissan", model="Versa", year=2019)
+
+    zero_qty = {"customer": juan.id, "services": [{"service": svc.id, "quantity": "0", "unit_price": "50"}]}
+    for url in ("/api/quotations/preview/", "/api/quotations/"):
+        res = client.post(url, zero_qty, format="json")
+        assert res.status_code == 400, (url, res.data)
+        assert "quantity" in str(res.json()["services"])
+
+    other_owner = {
+        "customer": ana.id, "vehicle": vehicle.id,
+        "services": [{"service": svc.id, "quantity": "1", "unit_price": "50"}],
+    }
+    for url in ("/api/quotations/preview/", "/api/quotations/"):
+        res = client.post(url, other_owner, format="json")
+        assert res.status_code == 400, (url, res.data)
+        assert "vehicle" in res.json()
+
+    res = client.post("/api/quotations/preview/", {**other_owner, "customer": juan.id}, format="json")
+    assert res.status_code == 200, res.data
+    assert res.json()["total"] == "50.00"
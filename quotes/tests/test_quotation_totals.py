@@ -0,0 +1,108 @@
+import pytest
+from io import StringIO
+from decimal import Decimal
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from customers.models import Customer
+from catalog.models import Service, Part
+from quotes.models import Quotation, QuotationService, QuotationPart, q2
+
+
+@pytest.fixture
+def quotation(db):
+    customer = Customer.objects.create(name="Ana López")
+    return Quotation.objects.create(customer=customer)
+
+
+@pytest.fixture
+def svc(db):
+    return Service.objects.create(code="ALIN", name="Alineación", price=50)
+
+
+@pytest.fixture
+def part(db):
+    return Part.objects.create(sku="FILT-01", name="Filtro Aceite", price=20)
+
+
+def _totals(q):
+    q.refresh_from_db()
+    return q.subtotal_services, q.subtotal_parts, q.grand_total
+
+
+@pytest.mark.django_db
+def test_line_save_and_delete_apply_deltas(quotation, svc, part):
+    s1 = QuotationService.objects.create(quotation=quotation, service=svc, quantity=2, unit_price=50)
+    QuotationPart.objects.create(quotation=quotation, part=part, quantity=1, unit_price="20.00", discount=5)
+    assert _totals(quotation) == (Decimal("100.00"), Decimal("15.00"), Decimal("115.00"))
+
+    s1 = QuotationService.objects.get(pk=s1.pk)
+    s1.quantity = 1
+    s1.save()
+    assert _totals(quotation) == (Decimal("50.00"), Decimal("15.00"), Decimal("65.00"))
+
+    s1.delete()
+    assert _totals(quotation) == (Decimal("0.00"), Decimal("15.00"), Decimal("15.00"))
+
+
+@pytest.mark.django_db
+def test_reading_lines_does_not_price_them(quotation, svc):
+    for qty in (1, 2, 3):
+        QuotationService.objects.create(quotation=quotation, service=svc, quantity=qty, unit_price=10)
+    with mock.patch("quotes.models.q2", wraps=q2) as priced:
+        lines = list(QuotationService.objects.filter(quotation=quotation))
+    assert priced.call_count == 0
+    lines[2].quantity = 1
+    lines[2].save()
+    assert _totals(quotation)[0] == Decimal("40.00")
+
+
+@pytest.mark.django_db
+def test_stale_instances_of_same_line_keep_totals_exact(quotation, svc):
+    line = QuotationService.objects.create(quotation=quotation, service=svc, quantity=1, unit_price=10)
+    first = QuotationService.objects.get(pk=line.pk)
+    second = QuotationService.objects.get(pk=line.pk)  # cargada antes de que first guarde
+
+    first.quantity = 2
+    first.save()
+    second.quantity = 3
+    second.save()
+    # el total anterior de second es el que dejó first (20), no el que second cargó (10)
+    assert _totals(quotation)[0] == Decimal("30.00")
+
+    first.delete()
+    second.delete()  # la fila ya no existe: no resta dos veces
+    assert _totals(quotation) == (Decimal("0.00"), Decimal("0.00"), Decimal("0.00"))
+
+
+@pytest.mark.django_db
+def test_line_save_cost_does_not_grow_with_lines(quotation, svc):
+    def _cost():
+        line = QuotationService(quotation_id=quotation.pk, service=svc, quantity=1, unit_price=10)
+        with CaptureQueriesContext(connection) as ctx:
+            line.save()
+        return len(ctx.captured_queries)
+
+    first = _cost()
+    for _ in range(30):
+        QuotationService.objects.create(quotation=quotation, service=svc, quantity=1, unit_price=10)
+    assert _cost() == first
+    assert _totals(quotation)[0] == Decimal("320.00")
+
+
+@pytest.mark.django_db
+def test_grand_total_never_negative(quotation, svc):
+    Quotation.objects.filter(pk=quotation.pk).update(discount_total=Decimal("30.00"))
+    QuotationService.objects.create(quotation=quotation, service=svc, quantity=1, unit_price=10)
+    assert _totals(quotation)[2] == Decimal("0.00")
+
+
+@pytest.mark.django_db
+def test_recalc_command_repairs_drift(quotation, svc):
+    QuotationService.objects.create(quotation=quotation, service=svc, quantity=3, unit_price=10)
+    Quotation.objects.filter(pk=quotation.pk).update(subtotal_services=Decimal("999.00"), grand_total=Decimal("999.00"))
+
+    call_command("recalc_quotation_totals", ids=[quotation.pk], stdout=StringIO())
+    assert _totals(quotation) == (Decimal("30.00"), Decimal("0.00"), Decimal("30.00"))
@@ -0,0 +1,41 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from customers.models import Customer
+from catalog.models import Service
+from quotes.models import Quotation
+from vehicles.models import Vehicle
+
+
+@pytest.fixture
+def owners(db):
+    juan = Customer.objects.create(name="Juan Pérez")
+    ana = Customer.objects.create(name="Ana Gómez")
+    vehicle = Vehicle.objects.create(owner=juan, plate="OWN-001", brand="Nissan", model="Versa", year=2019)
+    svc = Service.objects.create(code="ALN", name="Alineación", price=50)
+    return juan, ana, vehicle, svc
+
+
+def test_api_rejects_vehicle_of_another_customer(auth_api, owners):
+    client, _ = auth_api("Asesor")
+    juan, ana, vehicle, svc = owners
+    payload = {
+        "vehicle": vehicle.id,
+        "services": [{"service": svc.id, "quantity": 1, "unit_price": "50"}],
+        "parts": [],
+    }
+
+    res = client.post("/api/quotations/", {**payload, "customer": ana.id}, format="json")
+    assert res.status_code == 400
+    assert "vehicle" in res.json()
+
+    res = client.post("/api/quotations/", {**payload, "customer": juan.id}, format="json")
+    assert res.status_code == 201, res.data
+
+
+def test_model_clean_checks_vehicle_owner(owners):
+    juan, ana, vehicle, _ = owners
+    with pytest.raises(ValidationError) as exc:
+        Quotation(customer=ana, vehicle=vehicle).clean()
+    assert "vehicle" in exc.value.message_dict
+    Quotation(customer=juan, vehicle=vehicle).clean()
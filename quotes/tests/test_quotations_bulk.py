@@ -0,0 +1,68 @@
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from customers.models import Customer
+from catalog.models import Service, Part
+from quotes.models import Quotation, QuotationService, QuotationPart
+from quotes.serializers import QuotationSerializer
+
+
+def _seed():
+    customer = Customer.objects.create(name="Ana López")
+    svc = Service.objects.create(code="ALIN", name="Alineación", price=50)
+    part = Part.objects.create(sku="FILT-01", name="Filtro Aceite", price=20)
+    q = Quotation.objects.create(customer=customer)
+    return q, svc, part
+
+
+def _save_queries(instance, payload) -> int:
+    ser = QuotationSerializer(instance, data=payload, partial=True)
+    assert ser.is_valid(), ser.errors
+    with CaptureQueriesContext(connection) as ctx:
+        ser.save()
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_nested_update_query_count_is_constant():
+    q, svc, part = _seed()
+
+    def payload(n):
+        return {
+            "services": [{"service": svc.id, "quantity": "1", "unit_price": "50"} for _ in range(n)],
+            "parts": [{"part": part.id, "quantity": "2", "unit_price": "20"} for _ in range(n)],
+        }
+
+    _save_queries(q, payload(1))  # deja renglones previos para que ambos casos borren/creen
+    few = _save_queries(Quotation.objects.get(pk=q.pk), payload(3))
+    many = _save_queries(Quotation.objects.get(pk=q.pk), payload(40))
+    assert many == few
+    assert q.services.count() == 40 and q.parts.count() == 40
+
+
+@pytest.mark.django_db
+def test_nested_update_upserts_by_id_and_recalcs_once():
+    q, svc, part = _seed()
+    keep = QuotationService.objects.create(quotation=q, service=svc, quantity=1, unit_price=50)
+    QuotationService.objects.create(quotation=q, service=svc, quantity=1, unit_price=10)
+    QuotationPart.objects.create(quotation=q, part=part, quantity=1, unit_price=20)
+
+    _save_queries(q, {
+        "services": [
+            {"id": keep.id, "service": svc.id, "quantity": "3", "unit_price": "50"},
+            {"service": svc.id, "quantity": "1", "unit_price": "5.50"},
+        ],
+        "parts": [],
+    })
+
+    q.refresh_from_db()
+    lines = list(q.services.order_by("id"))
+    assert [s.id for s in lines][0] == keep.id
+    assert lines[0].quantity == Decimal("3.00")
+    assert lines[1].unit_price == Decimal("5.50")
+    assert q.parts.count() == 0
+    assert q.subtotal_services == Decimal("155.50")
+    assert q.subtotal_parts == Decimal("0.00")
+    assert q.grand_total == Decimal("155.50")
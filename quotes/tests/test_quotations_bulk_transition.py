@@ -0,0 +1,54 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from customers.models import Customer
+from quotes.models import Quotation
+
+
+@pytest.fixture
+def admin_api(api, db):
+    u = User.objects.create_superuser("bulk_admin", "bulk@example.com", "secret123")
+    api.force_authenticate(user=u)
+    return api
+
+
+def _quotes(n, status=Quotation.DRAFT):
+    c, _ = Customer.objects.get_or_create(name="Cliente Masivo")
+    return [Quotation.objects.create(customer=c, status=status).pk for _ in range(n)]
+
+
+@pytest.mark.django_db
+def test_bulk_transition_reports_per_id(admin_api):
+    drafts = _quotes(3)
+    approved = _quotes(1, Quotation.APPROVED)
+
+    res = admin_api.post("/api/quotations/bulk-transition/",
+                         {"ids": drafts + approved + [999999], "status": "SENT"}, format="json")
+    assert res.status_code == 200, res.data
+    body = res.json()
+    assert body["updated"] == 3
+    results = {r["id"]: r["result"] for r in body["results"]}
+    assert [results[i] for i in drafts] == ["ok"] * 3
+    assert results[approved[0]] == "invalid_transition"
+    assert results[999999] == "not_found"
+    assert set(Quotation.objects.filter(pk__in=drafts).values_list("status", flat=True)) == {"SENT"}
+
+
+@pytest.mark.django_db
+def test_bulk_transition_query_count_independent_of_size(admin_api):
+    def _run(ids):
+        with CaptureQueriesContext(connection) as ctx:
+            assert admin_api.post("/api/quotations/bulk-transition/",
+                                  {"ids": ids, "status": "SENT"}, format="json").status_code == 200
+        return len(ctx.captured_queries)
+
+    assert _run(_quotes(2)) == _run(_quotes(60))
+
+
+@pytest.mark.django_db
+def test_bulk_transition_requires_target_permission(auth_api):
+    client, _ = auth_api("Mecanico")  # sin quotes.approve_quotation
+    res = client.post("/api/quotations/bulk-transition/", {"ids": _quotes(1), "status": "APPROVED"}, format="json")
+    assert res.status_code == 403
@@ -0,0 +1,72 @@
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from customers.models import Customer
+from catalog.models import Service, Part
+from quotes.models import Quotation, QuotationService, QuotationPart
+
+
+def _seed(n_quotes=3, n_lines=4):
+    customer, _ = Customer.objects.get_or_create(name="Ana López")
+    svc, _ = Service.objects.get_or_create(code="ALIN", defaults={"name": "Alineación", "price": 50})
+    part, _ = Part.objects.get_or_create(sku="FILT-01", defaults={"name": "Filtro Aceite", "price": 20})
+    for _ in range(n_quotes):
+        q = Quotation.objects.create(customer=customer, tax_total=Decimal("1.50"))
+        for i in range(n_lines):
+            # descuento porcentual (<=1) y por unidad (>1), como compute_line_total
+            QuotationService.objects.create(quotation=q, service=svc, quantity=2, unit_price="33.33", discount="0.10")
+            QuotationPart.objects.create(quotation=q, part=part, quantity=3, unit_price="12.50", discount="2.25")
+
+
+@pytest.mark.django_db
+def test_list_totals_match_detail(auth_api):
+    client, _ = auth_api("Asesor")
+    _seed(n_quotes=2)
+
+    listed = client.get("/api/quotations/").json()
+    assert len(listed) == 2
+    for row in listed:
+        detail = client.get(f"/api/quotations/{row['id']}/").json()
+        for key in ("subtotal_services", "subtotal_parts", "total"):
+            assert row[key] == detail[key]
+    assert listed[0]["subtotal_services"] == "239.96"  # 4 × q2(2 × 33.33 × 0.90)
+    assert listed[0]["subtotal_parts"] == "123.00"     # 4 × 3 × (12.50 - 2.25)
+    assert listed[0]["total"] == "364.46"
+
+
+@pytest.mark.django_db
+def test_summary_list_skips_lines(auth_api):
+    client, _ = auth_api("Asesor")
+    _seed(n_quotes=2, n_lines=2)
+
+    with CaptureQueriesContext(connection) as few:
+        res = client.get("/api/quotations/?summary=1")
+    _seed(n_quotes=2, n_lines=20)
+    with CaptureQueriesContext(connection) as many:
+        res = client.get("/api/quotations/?summary=1")
+
+    rows = res.json()
+    assert len(rows) == 4
+    assert "services" not in rows[0] and "parts" not in rows[0]
+    assert len(many.captured_queries) == len(few.captured_queries)
+
+
+@pytest.mark.django_db
+def test_half_cent_line_agrees_in_list_summary_and_detail(auth_api):
+    client, _ = auth_api("Asesor")
+    customer = Customer.objects.create(name="Medio Centavo")
+    svc = Service.objects.create(code="HALF", name="Lavado", price="19.08")
+    q = Quotation.objects.create(customer=customer)
+    # 2.50 × 19.08 × 0.85 = 40.545 -> 40.55 (ROUND_HALF_UP); en REAL (SQLite) queda 40.5449999… -> 40.54
+    QuotationService.objects.create(quotation=q, service=svc, quantity="2.50", unit_price="19.08", discount="0.15")
+    # 1.50 × 3.33 × 0.90 = 4.4955 -> 4.50
+    QuotationService.objects.create(quotation=q, service=svc, quantity="1.50", unit_price="3.33", discount="0.10")
+
+    detail = client.get(f"/api/quotations/{q.pk}/").json()
+    listed = {r["id"]: r for r in client.get("/api/quotations/").json()}[q.pk]
+    summary = {r["id"]: r for r in client.get("/api/quotations/?summary=1").json()}[q.pk]
+    assert sorted(line["line_total"] for line in detail["services"]) == ["4.50", "40.55"]
+    for key in ("subtotal_services", "total"):
+        assert listed[key] == summary[key] == detail[key] == "45.05"
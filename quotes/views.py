@@ -8,8 +8,20 @@ from rest_framework.response import Response
 
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core import search
+from core.filters import IndexedSearchFilter
+
+from . import conversion
+from .conversion import convert_to_workorders
 from .models import Quotation
-from .serializers import QuotationSerializer
+from .serializers import (
+    QuotationSerializer,
+    QuotationSummarySerializer,
+    QuotationPreviewSerializer,
+    BulkTransitionSerializer,
+    BulkConvertSerializer,
+    annotate_line_subtotals,
+)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Permisos: rol general + permisos finos por acción
@@ -53,6 +65,15 @@ def _allowed_statuses_from_choices(model) -> set:
     return set()
 
 
+# Permiso fino que exige cada estado destino en el cambio masivo
+TRANSITION_PERMS = {
+    "SENT": "quotes.send_quotation",
+    "APPROVED": "quotes.approve_quotation",
+    "REJECTED": "quotes.reject_quotation",
+}
+DEFAULT_TRANSITION_PERM = "quotes.change_quotation"
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Vista principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -72,11 +93,49 @@ class QuotationViewSet(ModelViewSet):
     permission_classes = [permissions.IsAuthenticated & WriteRolePerm]
 
     # Filtrado y UX para frontend
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # ?search= va al índice de búsqueda (número, cliente, placa, VIN, notas), con ranking
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     filterset_fields = ["status", "customer", "vehicle", "created_at"]
+    search_index = search.QUOTATION
     search_fields = ["number", "customer__name", "vehicle__plate"]
     ordering_fields = ["created_at", "updated_at", "number", "status"]
     ordering = ["-created_at"]
+    keyset_ordering = ("-created_at", "-id")  # ?pagination=cursor
+    throttle_scope = {"bulk_transition": "bulk", "bulk_to_workorder": "bulk"}  # core.throttling
+    # consulta principal + prefetch de servicios y partes (core.query_budget)
+    query_budgets = {"list": 3, "retrieve": 3}
+
+    # ────────────────────────────────────────────────────────────────────────
+    # Modo lista: subtotales de UI anotados en SQL (y ?summary=1 sin renglones)
+    # ────────────────────────────────────────────────────────────────────────
+    def _summary_mode(self) -> bool:
+        return str(self.request.query_params.get("summary", "")).lower() in ("1", "true", "yes")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == "list":
+            qs = annotate_line_subtotals(qs)
+            if self._summary_mode():
+                qs = qs.prefetch_related(None)
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == "list" and self._summary_mode():
+            return QuotationSummarySerializer
+        return super().get_serializer_class()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # Vista previa de precios (no escribe en BD)
+    # ────────────────────────────────────────────────────────────────────────
+    @action(detail=False, methods=["post"], serializer_class=QuotationPreviewSerializer)
+    def preview(self, request):
+        """
+        Valida el mismo payload que POST /api/quotations/ y devuelve totales por renglón
+        y generales sin guardar nada. Los precios faltantes se toman del catálogo.
+        """
+        ser = QuotationPreviewSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        return Response(ser.preview())
 
     # ────────────────────────────────────────────────────────────────────────
     # Acciones de estado (cada una con su permiso fino específico)
@@ -158,6 +217,30 @@ class QuotationViewSet(ModelViewSet):
         q.save(update_fields=["status"] + (["sent_at"] if hasattr(q, "sent_at") else []))
         return Response({"id": q.id, "number": q.number, "status": q.status})
 
+    @action(
+        detail=False, methods=["post"], url_path="bulk-transition",
+        permission_classes=[permissions.IsAuthenticated, WriteRolePerm],
+        serializer_class=BulkTransitionSerializer,
+    )
+    def bulk_transition(self, request):
+        """
+        Cambia de estado muchas cotizaciones respetando Quotation.allowed_transitions():
+        { "ids": [1, 2, 3], "status": "SENT" }
+        Un UPDATE por estado de origen; la respuesta trae el resultado por id.
+        Requiere el permiso fino del estado destino (send/approve/reject) o change_quotation.
+        """
+        ser = BulkTransitionSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        target = ser.validated_data["status"]
+
+        perm = TRANSITION_PERMS.get(target, DEFAULT_TRANSITION_PERM)
+        if not request.user.has_perm(perm):
+            return Response({"detail": f"Requiere permiso {perm}."}, status=status.HTTP_403_FORBIDDEN)
+
+        results = Quotation.bulk_transition(ser.validated_data["ids"], target)
+        updated = sum(1 for r in results if r["result"] == "ok")
+        return Response({"status": target, "updated": updated, "results": results})
+
     @action(detail=True, methods=["post"])
     def set_status(self, request, pk=None):
         """
@@ -193,7 +276,7 @@ class QuotationViewSet(ModelViewSet):
     def to_workorder(self, request, pk=None):
         """
         Crea una WorkOrder a partir de la cotización APROBADA.
-        Copia líneas y precios 1:1. Requiere apps: workorders, catalog.
+        Copia líneas y precios 1:1 con bulk_create (ver quotes.conversion).
         Requiere permiso: quotes.convert_quotation_to_workorder
         """
         q = self.get_object()
@@ -204,36 +287,38 @@ class QuotationViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Import tardío para evitar ciclos
-        from workorders.models import WorkOrder, WorkOrderService, WorkOrderPart
-
-        wo_status_open = _const(WorkOrder, "OPEN", "OPEN")
-        wo = WorkOrder.objects.create(
-            customer=q.customer,
-            vehicle=q.vehicle,
-            notes=f"Generada desde cotización {q.number}",
-            status=wo_status_open,
-        )
-
-        # Copiar servicios/partes
-        for s in q.services.all():
-            WorkOrderService.objects.create(
-                workorder=wo,
-                service=s.service,
-                quantity=s.quantity,
-                unit_price=s.unit_price,
-                discount=s.discount,
+        (res,) = convert_to_workorders([q.pk])
+        if res["result"] == conversion.ALREADY_CONVERTED:
+            return Response(
+                {"detail": "La cotización ya fue convertida.", "workorder_id": res["workorder_id"]},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        for p in q.parts.all():
-            WorkOrderPart.objects.create(
-                workorder=wo,
-                part=p.part,
-                quantity=p.quantity,
-                unit_price=p.unit_price,
-                discount=p.discount,
+        if res["result"] == conversion.MISSING_VEHICLE:
+            return Response(
+                {"detail": "La cotización no tiene vehículo; la orden de trabajo lo requiere."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if hasattr(wo, "recalc_totals"):
-            wo.recalc_totals()
+        return Response({"workorder_id": res["workorder_id"], "from_quotation": q.number}, status=status.HTTP_201_CREATED)
 
-        return Response({"workorder_id": wo.id, "from_quotation": q.number}, status=status.HTTP_201_CREATED)
+    @action(
+        detail=False, methods=["post"], url_path="bulk-to-workorder",
+        permission_classes=[permissions.IsAuthenticated, WriteRolePerm, CanConvertQuotation],
+        serializer_class=BulkConvertSerializer,
+    )
+    def bulk_to_workorder(self, request):
+        """
+        Convierte muchas cotizaciones APROBADAS en órdenes de trabajo, en una transacción:
+        { "ids": [1, 2, 3] }
+        Números OT preasignados y renglones con bulk_create (consultas fijas por lote).
+        Resultado por id: ok | not_found | not_approved | already_converted | missing_vehicle.
+        Requiere permiso: quotes.convert_quotation_to_workorder
+        """
+        ser = BulkConvertSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        results = convert_to_workorders(ser.validated_data["ids"])
+        created = sum(1 for r in results if r["result"] == conversion.OK)
+        return Response(
+            {"created": created, "results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
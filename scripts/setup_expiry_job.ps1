@@ -0,0 +1,31 @@
+﻿<# setup_expiry_job.ps1
+Crea/actualiza:
+  - Workshop Quotation Expiry (daily) -> 00:20
+Corre `manage.py expire_quotations` con el venv del backend y deja el resumen en logs\quotation_expiry.log
+#>
+
+try { [Console]::OutputEncoding = [System.Text.UTF8Encoding]::new($false) } catch {}
+
+$ErrorActionPreference = 'Stop'
+
+# --- PARÁMETROS BASE ---
+$RepoRoot  = 'C:\Taller\workshop_backend\backend'
+$Python    = Join-Path $RepoRoot '.venv\Scripts\python.exe'
+$LogsDir   = Join-Path $RepoRoot 'logs'
+$Log       = Join-Path $LogsDir 'quotation_expiry.log'
+$ChunkSize = 1000
+$TaskName  = 'Workshop Quotation Expiry (daily)'
+
+New-Item -ItemType Directory -Force -Path $LogsDir | Out-Null
+if (-not (Test-Path $Python)) { throw "No existe $Python" }
+
+$cmd = "Set-Location `"$RepoRoot`"; & `"$Python`" manage.py expire_quotations --chunk-size $ChunkSize *>> `"$Log`""
+$action    = New-ScheduledTaskAction -Execute 'powershell.exe' -Argument "-NoProfile -ExecutionPolicy Bypass -Command `"$cmd`""
+$trigger   = New-ScheduledTaskTrigger -Daily -At 0:20am
+$principal = New-ScheduledTaskPrincipal -UserId 'SYSTEM' -RunLevel Highest
+
+$existing = Get-ScheduledTask -TaskName $TaskName -ErrorAction SilentlyContinue
+if ($existing) { Unregister-ScheduledTask -TaskName $TaskName -Confirm:$false }
+Register-ScheduledTask -TaskName $TaskName -Action $action -Trigger $trigger -Principal $principal | Out-Null
+
+Write-Host "Tarea '$TaskName' registrada (log: $Log)"
@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from catalog.models import Part, Service
+from core.query_budget import QueryBudgetExceeded, declared_budget, fingerprint, query_budget as budget_cm
+from core.urls import router
+from customers.models import Customer
+from quotes.models import Quotation, QuotationPart, QuotationService
+from vehicles.models import Vehicle
+from workorders.models import WorkOrder
+
+_seq = itertools.count(1)
+CHECKED_ACTIONS = ("list", "retrieve")
+
+
+def _populate(n):
+    """n filas de cada recurso del router, con renglones en cotizaciones."""
+    for _ in range(n):
+        i = next(_seq)
+        customer = Customer.objects.create(name=f"Cliente QB {i}")
+        vehicle = Vehicle.objects.create(owner=customer, plate=f"QB-{i:05d}", brand="Toyota", model="Hilux", year=2020)
+        service = Service.objects.create(code=f"QB-S{i}", name=f"Servicio {i}", price="50.00")
+        part = Part.objects.create(sku=f"QB-P{i}", name=f"Parte {i}", price="10.00")
+        WorkOrder.objects.create(customer=customer, vehicle=vehicle, complaint="ruido")
+        quotation = Quotation.objects.create(customer=customer, vehicle=vehicle)
+        for _ in range(2):
+            QuotationService.objects.create(quotation=quotation, service=service, quantity=1, unit_price="50.00")
+            QuotationPart.objects.create(quotation=quotation, part=part, quantity=2, unit_price="10.00")
+
+
+@pytest.fixture
+def admin_api(db):
+    api = APIClient()
+    api.force_authenticate(User.objects.create_superuser("qb_admin", "qb@example.com", "x"))
+    return api
+
+
+def _routes():
+    return [(prefix, viewset) for prefix, viewset, _ in router.registry]
+
+
+@pytest.mark.parametrize("prefix,viewset", _routes(), ids=[p for p, _ in _routes()])
+def test_every_routed_viewset_declares_budgets(prefix, viewset):
+    missing = [a for a in CHECKED_ACTIONS if declared_budget(viewset, a) is None]
+    assert not missing, f"{viewset.__name__} sin query_budgets para {missing}"
+
+
+@pytest.mark.parametrize("prefix,viewset", _routes(), ids=[p for p, _ in _routes()])
+@pytest.mark.parametrize("params", ["", "?pagination=cursor&page_size=2", "?pagination=cursor&page_size=50"])
+def test_list_budget_holds_regardless_of_size(admin_api, query_budget, prefix, viewset, params):
+    limit = declared_budget(viewset, "list")
+    counts = []
+    for n in (1, 12):
+        _populate(n)
+        with query_budget(limit, label=f"GET /api/{prefix}/{params}") as qb:
+            resp = admin_api.get(f"/api/{prefix}/{params}")
+        assert resp.status_code == 200, resp.content
+        counts.append(len(qb))
+    # sin N+1: más filas no agregan consultas
+    assert counts[0] == counts[1], f"{prefix}: {counts[0]} -> {counts[1]} consultas"
+
+
+@pytest.mark.parametrize("prefix,viewset", _routes(), ids=[p for p, _ in _routes()])
+def test_retrieve_budget(admin_api, query_budget, prefix, viewset):
+    _populate(1)
+    pk = viewset.queryset.model.objects.order_by("-pk").values_list("pk", flat=True).first()
+    with query_budget(declared_budget(viewset, "retrieve"), label=f"GET /api/{prefix}/{pk}/"):
+        resp = admin_api.get(f"/api/{prefix}/{pk}/")
+    assert resp.status_code == 200, resp.content
+
+
+@pytest.mark.django_db
+def test_exceeded_budget_reports_fingerprints():
+    _populate(3)
+    with pytest.raises(QueryBudgetExceeded) as exc:
+        with budget_cm(2, label="N+1 a propósito"):
+            for v in Vehicle.objects.all():
+                v.owner.name
+    message = str(exc.value)
+    assert "4 > 2" in message
+    assert '3× SELECT "customers_customer"."id"' in message and '"customers_customer"."id" = ?' in message
+
+
+def test_fingerprint_normalizes_literals():
+    a = fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'x''y'")
+    b = fingerprint("SELECT  *  FROM t WHERE id IN (7) AND name = 'z'")
+    assert a == b == "SELECT * FROM t WHERE id IN (...) AND name = ?"
@@ -5,4 +5,17 @@ from django.utils.translation import gettext_lazy as _
 class VehiclesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vehicles"
-    verbose_name = _("Vehículos")
\ No newline at end of file
+    verbose_name = _("Vehículos")
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from customers.models import Customer
+
+        from . import lookup
+        from .models import Vehicle
+
+        post_save.connect(lookup.invalidate, sender=Vehicle, dispatch_uid="vehicle-lookup-save")
+        post_delete.connect(lookup.invalidate, sender=Vehicle, dispatch_uid="vehicle-lookup-delete")
+        post_save.connect(lookup.invalidate_owner, sender=Customer, dispatch_uid="vehicle-lookup-owner-save")
+        post_delete.connect(lookup.invalidate_owner, sender=Customer, dispatch_uid="vehicle-lookup-owner-delete")
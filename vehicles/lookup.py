@@ -0,0 +1,164 @@
+# vehicles/lookup.py
+"""
+Búsqueda de vehículo por placa/VIN para recepción, con caché LRU en memoria del proceso.
+
+- La entrada se normaliza igual que Vehicle.plate_normalized (mayúsculas, sin espacios/guiones).
+- Aciertos repetidos se responden desde memoria, sin ir a la BD.
+- Guardar/borrar un Vehicle (o su Customer, que va en la respuesta) invalida sus
+  entradas en este proceso al instante e incrementa la generación "vehicles"
+  (core.generations); los demás workers la consultan a lo sumo cada
+  VEHICLE_LOOKUP_CHECK_INTERVAL segundos y vacían su caché si cambió.
+- Placa/VIN no son únicos: si la forma normalizada corresponde a varios vehículos
+  se lanza DuplicateVehicle con sus ids en vez de elegir uno.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core import generations
+
+from .models import Vehicle, normalize_plate
+
+GENERATION = "vehicles"
+MAX_DUPLICATES_REPORTED = 20
+
+
+class DuplicateVehicle(Exception):
+    """La placa/VIN normalizada corresponde a más de un vehículo."""
+
+    def __init__(self, key, pks):
+        super().__init__(f"{key}: {len(pks)} vehículos")
+        self.key = key
+        self.pks = pks
+
+
+class LRUCache:
+    """LRU acotado, seguro entre hilos, con vencimiento por entrada e índice inverso por pk."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # clave -> (vence, pk, payload)
+        self._keys_by_pk = {}        # pk -> {claves}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, pk, payload):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic() + self.ttl, pk, payload)
+            self._keys_by_pk.setdefault(pk, set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._drop(next(iter(self._data)))
+
+    def invalidate_pk(self, pk):
+        with self._lock:
+            for key in self._keys_by_pk.pop(pk, ()):
+                self._data.pop(key, None)
+
+    def invalidate_key(self, key):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys_by_pk.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _drop(self, key):
+        _, pk, _ = self._data.pop(key)
+        keys = self._keys_by_pk.get(pk)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_pk[pk]
+
+
+cache = LRUCache(
+    maxsize=getattr(settings, "VEHICLE_LOOKUP_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "VEHICLE_LOOKUP_CACHE_TTL", 300),
+)
+
+_sync = {"generation": None, "checked_at": float("-inf")}
+_sync_lock = threading.Lock()
+
+
+def _check_generation():
+    """Vacía la caché si otro proceso cambió vehículos (consulta a lo sumo cada intervalo)."""
+    now = time.monotonic()
+    with _sync_lock:
+        if now - _sync["checked_at"] < getattr(settings, "VEHICLE_LOOKUP_CHECK_INTERVAL", 2.0):
+            return
+        _sync["checked_at"] = now
+    generation = generations.current(GENERATION)
+    with _sync_lock:
+        if generation != _sync["generation"]:
+            cache.clear()
+            _sync["generation"] = generation
+
+
+def _match(qs, field, key):
+    found = list(qs.filter(**{field: key}).order_by("pk")[:MAX_DUPLICATES_REPORTED])
+    if len(found) > 1:
+        raise DuplicateVehicle(key, [v.pk for v in found])
+    return found[0] if found else None
+
+
+def lookup(value, serialize):
+    """
+    Vehículo (ya serializado con `serialize(vehicle)`) cuya placa o VIN coincide con
+    `value` normalizado, o None. Primero placa, luego VIN; ambas por índice.
+    DuplicateVehicle si hay más de uno con esa placa (o, sin placa, ese VIN).
+    """
+    key = normalize_plate(value)
+    if not key:
+        return None
+    _check_generation()
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    qs = Vehicle.objects.select_related("owner")
+    vehicle = _match(qs, "plate_normalized", key) or _match(qs, "vin_normalized", key)
+    if vehicle is None:
+        return None
+    payload = serialize(vehicle)
+    cache.set(key, vehicle.pk, payload)
+    return payload
+
+
+def invalidate(sender, instance, **kwargs):
+    """post_save/post_delete de Vehicle: saca sus entradas (también las de la placa anterior)."""
+    cache.invalidate_pk(instance.pk)
+    # una placa nueva puede "tapar" a otro vehículo cacheado con la misma forma normalizada
+    cache.invalidate_key(normalize_plate(instance.plate))
+    if instance.vin:
+        cache.invalidate_key(normalize_plate(instance.vin))
+    generations.bump(GENERATION)
+
+
+def invalidate_owner(sender, instance, **kwargs):
+    """post_save/post_delete de Customer: la respuesta incluye los datos del dueño."""
+    for pk in Vehicle.objects.filter(owner_id=instance.pk).values_list("pk", flat=True):
+        cache.invalidate_pk(pk)
+    generations.bump(GENERATION)
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:14
+
+import re
+
+from django.db import migrations, models
+
+_NOISE = re.compile(r"[\s\-._/]+")
+
+
+def fill_normalized(apps, schema_editor):
+    """Llena plate_normalized / vin_normalized de los vehículos existentes (mismo criterio que normalize_plate)."""
+    Vehicle = apps.get_model("vehicles", "Vehicle")
+    batch = []
+    for v in Vehicle.objects.only("pk", "plate", "vin").iterator(chunk_size=2000):
+        v.plate_normalized = _NOISE.sub("", v.plate or "").upper()
+        v.vin_normalized = _NOISE.sub("", v.vin or "").upper() or None
+        batch.append(v)
+        if len(batch) >= 2000:
+            Vehicle.objects.bulk_update(batch, ["plate_normalized", "vin_normalized"])
+            batch = []
+    if batch:
+        Vehicle.objects.bulk_update(batch, ["plate_normalized", "vin_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_alter_customer_options_and_more'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='plate_normalized',
+            field=models.CharField(default='', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='vin_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=50, null=True),
+        ),
+        migrations.RunPython(fill_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['plate_normalized'], name='vehicle_plate_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['vin_normalized'], name='vehicle_vin_norm_idx'),
+        ),
+    ]
@@ -1,6 +1,16 @@
+import re
+
 from django.db import models
 from customers.models import Customer
 
+_PLATE_NOISE = re.compile(r"[\s\-._/]+")
+
+
+def normalize_plate(value) -> str:
+    """Placa/VIN comparable: mayúsculas, sin espacios, guiones ni puntos ("abc-12 3" -> "ABC123")."""
+    return _PLATE_NOISE.sub("", str(value or "")).upper()
+
+
 class Vehicle(models.Model):
     owner = models.ForeignKey(Customer, on_delete=models.PROTECT, related_name='vehicles')
     plate = models.CharField(max_length=20, unique=True)
@@ -11,6 +21,10 @@ class Vehicle(models.Model):
     color = models.CharField(max_length=30, blank=True, null=True)
     mileage_km = models.PositiveIntegerField(default=0)
 
+    # formas normalizadas para búsqueda exacta por índice (las llena save())
+    plate_normalized = models.CharField(max_length=20, editable=False, default="")
+    vin_normalized = models.CharField(max_length=50, editable=False, blank=True, null=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,7 +33,17 @@ class Vehicle(models.Model):
         indexes = [
             models.Index(fields=['plate']),
             models.Index(fields=['vin']),
+            models.Index(fields=['plate_normalized'], name='vehicle_plate_norm_idx'),
+            models.Index(fields=['vin_normalized'], name='vehicle_vin_norm_idx'),
         ]
 
     def __str__(self):
         return f"{self.plate} - {self.brand} {self.model} {self.year}"
+
+    def save(self, *args, **kwargs):
+        self.plate_normalized = normalize_plate(self.plate)
+        self.vin_normalized = normalize_plate(self.vin) or None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"plate", "vin"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"plate_normalized", "vin_normalized"}
+        super().save(*args, **kwargs)
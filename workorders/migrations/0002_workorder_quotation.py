@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0003_quotation_status_valid_until_idx'),
+        ('workorders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workorder',
+            name='quotation',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='workorder', to='quotes.quotation', verbose_name='Cotización de origen'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_alter_customer_options_and_more'),
+        ('quotes', '0004_quotation_quot_created_id_idx'),
+        ('vehicles', '0001_initial'),
+        ('workorders', '0002_workorder_quotation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workorder',
+            index=models.Index(fields=['opened_at', 'id'], name='wo_opened_id_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from customers.models import Customer
 from vehicles.models import Vehicle
 from catalog.models import Service, Part
+from core.sequences import next_number
 
 class WorkOrder(models.Model):
     OPEN = 'OPEN'
@@ -15,7 +16,9 @@ class WorkOrder(models.Model):
         (CANCELLED, 'Cancelada'),
     ]
 
-    number = models.CharField(max_length=20, unique=True)   # ejemplo: OT-000001
+    NUMBER_PREFIX = 'OT'
+
+    number = models.CharField(max_length=20, unique=True)   # ejemplo: OT-2025-000001
     customer = models.ForeignKey(Customer, on_delete=models.PROTECT, related_name='workorders')
     vehicle = models.ForeignKey(Vehicle, on_delete=models.PROTECT, related_name='workorders')
     status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=OPEN)
@@ -26,13 +29,26 @@ class WorkOrder(models.Model):
     opened_at = models.DateTimeField(auto_now_add=True)
     closed_at = models.DateTimeField(blank=True, null=True)
 
+    # cotización de origen (si se generó desde una); evita convertir dos veces la misma
+    quotation = models.OneToOneField(
+        'quotes.Quotation', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='workorder', verbose_name='Cotización de origen',
+    )
+
     class Meta:
         db_table = 'work_order'
         ordering = ['-opened_at']
+        # paginación por cursor (-opened_at, -id)
+        indexes = [models.Index(fields=['opened_at', 'id'], name='wo_opened_id_idx')]
 
     def __str__(self):
         return self.number
 
+    def save(self, *args, **kwargs):
+        if not self.number:
+            self.number = next_number(self.NUMBER_PREFIX, width=6)
+        super().save(*args, **kwargs)
+
 class WorkOrderService(models.Model):
     workorder = models.ForeignKey(WorkOrder, on_delete=models.CASCADE, related_name='services')
     service = models.ForeignKey(Service, on_delete=models.PROTECT)
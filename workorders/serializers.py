@@ -22,3 +22,5 @@ class WorkOrderSerializer(serializers.ModelSerializer):
             "customer",
             "vehicle",
         ]
+        # si no viene, WorkOrder.save() lo toma del contador compartido
+        extra_kwargs = {"number": {"required": False}}
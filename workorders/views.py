@@ -4,6 +4,9 @@ from rest_framework.permissions import IsAuthenticated, DjangoModelPermissions
 from rest_framework import filters
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core import search
+from core.filters import IndexedSearchFilter
+
 from .models import WorkOrder
 from .serializers import WorkOrderSerializer
 
@@ -13,8 +16,11 @@ class WorkOrderViewSet(ModelViewSet):
     serializer_class = WorkOrderSerializer
     permission_classes = [IsAuthenticated, DjangoModelPermissions]
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # ?search= va al índice de búsqueda (número, cliente, placa, VIN, falla, diagnóstico)
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     filterset_fields = ["id", "status", "vehicle"]
-    search_fields = ["description", "status"]
-    ordering_fields = ["id", "created_at", "status"]
+    search_index = search.WORKORDER
+    search_fields = ["number", "complaint", "diagnosis", "status"]
+    ordering_fields = ["id", "opened_at", "status"]
     ordering = ["id"]
+    keyset_ordering = ("-opened_at", "-id")  # ?pagination=cursor
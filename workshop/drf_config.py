@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 
 REST_FRAMEWORK = {
@@ -6,23 +7,28 @@ REST_FRAMEWORK = {
     "DEFAULT_VERSION": "v1",
     "ALLOWED_VERSIONS": ("v1",),
 
-    # Paginación por defecto (PageNumber)
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Paginación por defecto (PageNumber); ?pagination=cursor la cambia a cursor (sin COUNT/OFFSET)
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetOrPageNumberPagination",
     "PAGE_SIZE": 20,
 
-    # Throttling básico (ajusta límites a tu gusto)
+    # Throttling: token bucket compartido entre workers (core.throttling, SQLite WAL)
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "core.throttling.AnonTokenBucketThrottle",
+        "core.throttling.UserTokenBucketThrottle",
+        "core.throttling.ScopedTokenBucketThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "60/min",
         "user": "120/min",
+        # por endpoint (throttle_scope de la vista)
+        "autocomplete": "600/min",
+        "bulk": "30/min",
     },
 
     # Auth (JWT si ya lo usas)
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # lecturas con claims de rol vigentes: sin consultar usuario/grupos
+        "core.authentication.RoleClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 
@@ -30,12 +36,18 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Archivo SQLite compartido por los workers del host para core.throttling (vacío = directorio temporal)
+THROTTLE_STORE_PATH = os.environ.get("THROTTLE_STORE_PATH") or None
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": True,
+    # claims de rol/permisos + versión RBAC (core.tokens)
+    "TOKEN_OBTAIN_SERIALIZER": "core.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.tokens.RoleTokenRefreshSerializer",
 }
 
 SPECTACULAR_SETTINGS = {
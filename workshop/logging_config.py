@@ -1,6 +1,31 @@
-import os
+"""
+Logging estructurado (dict para LOGGING) con escritura asíncrona.
+
+En el hilo del request solo se encola el registro (QueueHandler, O(1), nunca
+bloquea). Un hilo de fondo (LogPipeline) hace lo caro: RedactFilter, JSON,
+escritura a disco/consola y rotación, con los handlers definidos abajo.
+
+- Memoria acotada: cola de DJANGO_LOG_QUEUE_SIZE registros (10000); si se llena
+  se descarta el registro, se cuenta (LogPipeline.dropped) y el hilo escribe un
+  WARNING con cuántos se perdieron en cuanto se pone al día.
+- Al salir (atexit) se vacía la cola y se hace flush de los handlers.
+- DJANGO_LOG_ASYNC=0 vuelve a la escritura síncrona (depuración).
+
+Se activa con LOGGING_CONFIG = "workshop.logging_config.configure_logging".
+"""
+import atexit
 import json
-from datetime import datetime
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+# atributos propios de LogRecord: lo demás llegó por `extra=`
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
 
 class RedactFilter:
     """Oculta valores de claves sensibles en mensajes/extra."""
@@ -10,10 +35,10 @@ class RedactFilter:
         try:
             if isinstance(record.msg, dict):
                 record.msg = self._redact_dict(record.msg)
-            if hasattr(record, "__dict__"):
-                for k in list(record.__dict__.keys()):
-                    if k.lower() in self.SENSITIVE_KEYS:
-                        record.__dict__[k] = "***REDACTED***"
+            # solo las claves de `extra`, no los ~20 atributos estándar de cada registro
+            for k in record.__dict__.keys() - _RECORD_ATTRS:
+                if k.lower() in self.SENSITIVE_KEYS:
+                    record.__dict__[k] = "***REDACTED***"
         except Exception:
             pass
         return True
@@ -30,16 +55,192 @@ class RedactFilter:
 class JsonFormatter:
     def format(self, record):
         payload = {
-            "ts": datetime.utcnow().isoformat() + "Z",
+            # hora del evento, no de escritura (se formatea en el hilo del LogPipeline)
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
+        # campos estructurados: logger.info(..., extra={"metrics": {...}})
+        metrics = getattr(record, "metrics", None)
+        if isinstance(metrics, dict):
+            for k, v in metrics.items():
+                payload.setdefault(k, v)
         if record.exc_info:
             payload["exc_info"] = True
-        return json.dumps(payload, ensure_ascii=False)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class LogPipeline:
+    """
+    Cola acotada + un hilo que entrega cada registro a sus handlers destino.
+    Un solo hilo para todos los loggers envueltos: cada elemento de la cola es
+    (registro, handlers), así "workshop.requests" sigue yendo solo a json_file.
+    """
+    _STOP = object()
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._reported = 0
+        self._targets = set()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        self.closed = False
+        if hasattr(os, "register_at_fork"):
+            # el hilo no sobrevive a fork() (gunicorn --preload): el hijo arranca el suyo
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def put(self, record, targets) -> bool:
+        """Encola sin bloquear. False si la cola está llena (registro descartado)."""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((record, targets))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "maxsize": self.maxsize, "dropped": self.dropped}
+
+    def stop(self, timeout: float = 5.0, final: bool = True):
+        """
+        Vacía la cola (hasta `timeout` s), hace flush de los destinos y detiene el hilo.
+        final=False permite que el próximo registro lo vuelva a arrancar (reconfiguración);
+        tras el stop final (atexit) los registros se escriben síncronos.
+        """
+        thread = self._thread
+        self.closed = final
+        if thread is not None:
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+            if not thread.is_alive():
+                # lo que entró detrás del marcador de parada (emit concurrente)
+                self._drain()
+        self._thread = None
+        for handler in list(self._targets):
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-pipeline", daemon=True)
+                self._thread.start()
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(self.maxsize)
+        self._thread = None
+
+    def _run(self):
+        q = self._queue
+        while True:
+            try:
+                item = q.get(timeout=1.0)
+            except queue.Empty:
+                self._report_drops()
+                continue
+            if item is self._STOP:
+                break
+            self._deliver(*item)
+            if self.dropped != self._reported and q.empty():
+                self._report_drops()
+
+    def _drain(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not self._STOP:
+                self._deliver(*item)
+
+    def _deliver(self, record, targets):
+        for handler in targets:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)  # filtros (RedactFilter), formato y escritura
+                except Exception:
+                    handler.handleError(record)
+
+    def _report_drops(self):
+        dropped = self.dropped
+        if dropped == self._reported:
+            return
+        lost, self._reported = dropped - self._reported, dropped
+        record = logging.makeLogRecord({
+            "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+            "msg": "logging: %d registros descartados (cola llena, máx. %d)", "args": (lost, self.maxsize),
+        })
+        self._deliver(record, tuple(self._targets))
+
+
+class PipelineHandler(logging.handlers.QueueHandler):
+    """Lado del request: prepara el registro de forma barata y lo encola en el LogPipeline."""
+
+    def __init__(self, pipeline: LogPipeline, targets):
+        super().__init__(pipeline._queue)
+        self.pipeline = pipeline
+        self.targets = tuple(targets)
+        pipeline._targets.update(self.targets)
+        self.setLevel(min((h.level for h in self.targets), default=logging.NOTSET))
+
+    def prepare(self, record):
+        # interpolar ya: los args podrían cambiar antes de que el hilo los formatee.
+        # msg tipo dict sin args se deja intacto para que RedactFilter lo recorra.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def emit(self, record):
+        try:
+            record = self.prepare(record)
+            if self.pipeline.closed:
+                # apagado en curso (después del atexit): escribir directo, no perder el registro
+                self.pipeline._deliver(record, self.targets)
+            else:
+                self.pipeline.put(record, self.targets)
+        except Exception:
+            self.handleError(record)
+
+
+PIPELINE = LogPipeline(int(os.environ.get("DJANGO_LOG_QUEUE_SIZE", "10000")))
+atexit.register(PIPELINE.stop)
+
+
+def wrap_loggers(pipeline: LogPipeline, loggers):
+    """Sustituye los handlers de cada logger por un PipelineHandler que los usa como destino."""
+    for logger in loggers:
+        targets = [h for h in logger.handlers if not isinstance(h, PipelineHandler)]
+        if targets:
+            logger.handlers = [PipelineHandler(pipeline, targets)]
+
+
+def configure_logging(config):
+    """LOGGING_CONFIG: dictConfig normal y, salvo DJANGO_LOG_ASYNC=0, envía root y LOGGING["loggers"] al pipeline."""
+    PIPELINE.stop(final=False)  # lo pendiente se escribe con los handlers actuales antes de reemplazarlos
+    PIPELINE._targets.clear()
+    logging.config.dictConfig(config)
+    if os.environ.get("DJANGO_LOG_ASYNC", "1") == "0":
+        return
+    loggers = [logging.getLogger()] + [logging.getLogger(name) for name in config.get("loggers", {})]
+    wrap_loggers(PIPELINE, loggers)
+
 
 LOG_LEVEL = os.environ.get("DJANGO_LOG_LEVEL", "INFO")
+LOGGING_CONFIG = "workshop.logging_config.configure_logging"
+# handlers de abajo: corren en el hilo del LogPipeline, no en el del request
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -71,4 +272,12 @@ LOGGING = {
         "level": LOG_LEVEL,
         "handlers": ["console", "json_file"],
     },
+    "loggers": {
+        # una línea por request (core.middleware.RequestMetricsMiddleware): solo al JSON
+        "workshop.requests": {
+            "level": os.environ.get("REQUEST_METRICS_LOG_LEVEL", "INFO"),
+            "handlers": ["json_file"],
+            "propagate": False,
+        },
+    },
 }
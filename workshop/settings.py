@@ -35,6 +35,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # primero: mide el request completo (tiempo, consultas, serialización) -> log JSON
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -73,6 +75,9 @@ DATABASES = {
     }
 }
 
+# Permisos desde caché de roles (core.roles); misma semántica que ModelBackend
+AUTHENTICATION_BACKENDS = ["core.backends.CachedModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -98,7 +103,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # lecturas con claims de rol vigentes: sin consultar usuario/grupos
+        "core.authentication.RoleClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -106,6 +112,9 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
     ),
+    # Listas completas como siempre; ?pagination=cursor activa paginación por cursor
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.OptInKeysetPagination",
+    "PAGE_SIZE": 25,
     "DEFAULT_RENDERER_CLASSES": (
         "rest_framework.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
@@ -114,6 +123,9 @@ REST_FRAMEWORK = {
 
 SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # claims de rol/permisos + versión RBAC (core.tokens)
+    "TOKEN_OBTAIN_SERIALIZER": "core.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.tokens.RoleTokenRefreshSerializer",
 }
 
 # Configuración Swagger/Redoc
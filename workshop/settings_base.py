@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # primero: mide el request completo (tiempo, consultas, serialización) -> log JSON
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -88,6 +90,9 @@ DATABASES = {
     }
 }
 
+# Permisos desde caché de roles (core.roles); misma semántica que ModelBackend
+AUTHENTICATION_BACKENDS = ["core.backends.CachedModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -109,8 +114,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # === DRF + JWT + Spectacular centralizados ===
 from .drf_config import *  # noqa: F401,F403
 
-# === Logging estructurado (config por dict) ===
-from .logging_config import LOGGING  # noqa: F401
+# === Logging estructurado (config por dict, escritura en hilo de fondo) ===
+from .logging_config import LOGGING, LOGGING_CONFIG  # noqa: F401
 
 # === CORS/CSRF (listas explícitas) ===
 CORS_ALLOWED_ORIGINS = [o for o in os.environ.get("CORS_ALLOWED_ORIGINS", "").split(",") if o.strip()]
@@ -1,3 +1,3 @@
 # workshop/settings_flags.py
-# Evita que core.apps.seed_roles_and_data cree usuarios en tests (los crea el test).
+# Evita que core.rbac cree usuarios en tests (los crea el test).
 DISABLE_USER_SEED = True